@@ -1,9 +1,14 @@
 from django.contrib import admin
 
-from .models import AnalysisResult
+from .models import AnalysisResult, ModelVersion
 
 
 @admin.register(AnalysisResult)
 class AnalysisResultAdmin(admin.ModelAdmin):
     list_display = ("result_id", "image", "label", "confidence", "model_version", "processed_at")
     list_filter = ("label", "model_version")
+
+
+@admin.register(ModelVersion)
+class ModelVersionAdmin(admin.ModelAdmin):
+    list_display = ("version", "created_at")
@@ -0,0 +1,93 @@
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+
+from analysis.application.use_cases import current_threshold, request_single_report
+from analysis.domain.entities import AnalysisResultEntity
+from analysis.domain.repositories import AnalysisResultRepository
+from analysis.ml.backends import effective_model_version
+
+logger = logging.getLogger(__name__)
+
+HITS = "hits"
+MISSES = "misses"
+STATS_CACHE_ALIAS = "dedup_stats"
+
+
+def _key(name: str) -> str:
+    return f"pixelcheck:dedup:{name}"
+
+
+def _stats_cache():
+    # Contadores de todo el servicio solo con un store compartido (PIXELCHECK_DEDUP_STATS_URL): ni el
+    # cache en proceso de cada worker ni una fila de la base, que serializaría los uploads
+    return caches[STATS_CACHE_ALIAS] if STATS_CACHE_ALIAS in settings.CACHES else None
+
+
+def _incr(name: str) -> None:
+    logger.debug("Deduplicación: %s", name)
+    stats = _stats_cache()
+    if stats is None:
+        return
+    try:
+        stats.add(_key(name), 0, timeout=None)
+        stats.incr(_key(name))
+    except Exception:
+        # Best effort: una métrica caída no debe romper el upload
+        logger.warning("No se pudo actualizar el contador de deduplicación %s", name, exc_info=True)
+
+
+def _read(name: str) -> int:
+    return int(_stats_cache().get(_key(name), 0))
+
+
+class AnalysisDeduplicator:
+    """
+    Reutiliza resultados ya calculados para imágenes idénticas.
+
+    La clave es (sha256, model_version, threshold), con la versión efectiva que incluye el backend
+    de inferencia: si otra imagen con el mismo checksum ya fue analizada con el mismo modelo,
+    backend y umbral, se clona su `AnalysisResult` para la nueva imagen
+    y no hace falta encolar `run_analysis_task`.
+    """
+
+    def __init__(self, repository: AnalysisResultRepository):
+        self.repository = repository
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(getattr(settings, "PIXELCHECK_DEDUP_ENABLED", True))
+
+    def find(self, checksum: str) -> AnalysisResultEntity | None:
+        source = self.repository.find_by_fingerprint(
+            checksum=checksum,
+            model_version=effective_model_version(),
+            threshold=current_threshold(),
+        )
+        _incr(HITS if source is not None else MISSES)
+        return source
+
+    def clone(
+        self, source: AnalysisResultEntity, image_id: str, owner, autogenerate_report: bool = True
+    ) -> AnalysisResultEntity:
+        entity = self.repository.save_result(
+            image_id=image_id,
+            owner=owner,
+            label=source.label,
+            confidence=Decimal(str(source.confidence)),
+            model_version=source.model_version,
+            threshold=current_threshold(),
+            details=source.details,
+        )
+        if autogenerate_report:
+            request_single_report(owner, image_id)
+        return entity
+
+    @staticmethod
+    def stats() -> dict | None:
+        """Aciertos/fallos acumulados, o None si no hay store de contadores configurado."""
+        if _stats_cache() is None:
+            return None
+        return {HITS: _read(HITS), MISSES: _read(MISSES)}
@@ -1,49 +1,155 @@
 from decimal import Decimal
+from typing import List, Optional, Tuple
 
 from django.conf import settings
+from django.db import transaction
 
 from analysis.domain.repositories import AnalysisResultRepository
+from analysis.ml.backends import effective_model_version
+from analysis.ml.client import INFERENCE_MODE_SERVER, InferenceClient
 from analysis.ml.inference import PixelCheckInference
+from ingestion.infrastructure.thumbnails import store_thumbnail
 from ingestion.models import Image
 from results.application.use_cases import CreateReportUseCase
 from results.infrastructure.repositories import DjangoReportRepository, DjangoResultsQueryRepository
+from results.tasks import generate_report_task
 from shared.application.use_case import UseCase, UseCaseResult
-from shared.domain.exceptions import NotFoundError
+from shared.domain.exceptions import NotFoundError, ValidationError
+from shared.infrastructure.notifications import publish_image_status
+from shared.infrastructure.storage import blob_view
+from shared.utils.image import ImagePayload
 from iam.domain.value_objects import ROLE_PROFESSIONAL
 
 
+# Estados finales: una tarea reintentada o reentregada no vuelve a analizar ni a pedir reportes
+RESOLVED_STATUSES = (Image.Status.DONE, Image.Status.REJECTED)
+
+
+def _analysis_queryset():
+    # El binario no viaja en el JOIN: `blob_view` lo lee después, una sola vez y solo si vive en la base
+    return Image.objects.select_related("uploader", "data").defer("data__content")
+
+
 class AnalyzeImageUseCase(UseCase):
     def __init__(self, repository: AnalysisResultRepository):
         self.repository = repository
-        self.inference = PixelCheckInference.instance()
+        self.inference = (
+            InferenceClient.instance()
+            if settings.PIXELCHECK_INFERENCE_MODE == INFERENCE_MODE_SERVER
+            else PixelCheckInference.instance()
+        )
+        self._model_registered = False
 
     def execute(self, image_id: str) -> UseCaseResult:
         try:
-            image = Image.objects.select_related("uploader", "data").get(image_id=image_id)
+            image = _analysis_queryset().get(image_id=image_id)
         except Image.DoesNotExist as exc:
             raise NotFoundError("Imagen no encontrada") from exc
+        if image.status == Image.Status.DONE:
+            return UseCaseResult(success=True, data=self.repository.get_by_image(image_id=image_id))
+        if image.status == Image.Status.REJECTED:
+            return UseCaseResult(success=False, error="Archivo no es una imagen válida")
+
+        # Carga el binario de la imagen y ejecuta inferencia real (una sola decodificación)
+        payload = self._decode_or_reject(image)
+        if payload is None:
+            return UseCaseResult(success=False, error="Archivo no es una imagen válida")
+        prediction = self.inference.predict(payload)
+        entity = self._store(image, payload, prediction)
+        return UseCaseResult(success=True, data=entity)
+
+    def execute_many(self, image_ids: List[str], autogenerate_reports: bool = True) -> UseCaseResult:
+        """
+        Analiza las imágenes pendientes en micro-batches de hasta PIXELCHECK_BATCH_MAX_SIZE,
+        con un único forward del modelo por batch. Las ya resueltas (DONE/REJECTED) se omiten.
+        """
+        pending_ids = list(
+            Image.objects.filter(image_id__in=image_ids)
+            .exclude(status__in=RESOLVED_STATUSES)
+            .values_list("image_id", flat=True)
+        )
+        batch_size = max(1, int(settings.PIXELCHECK_BATCH_MAX_SIZE))
+        entities = []
+        for start in range(0, len(pending_ids), batch_size):
+            images = (
+                _analysis_queryset()
+                .prefetch_related("uploader__roles")
+                .filter(image_id__in=pending_ids[start : start + batch_size])
+            )
+            decoded = [(image, self._decode_or_reject(image)) for image in images]
+            decoded = [(image, payload) for image, payload in decoded if payload is not None]
+            predictions = self.inference.predict_many([payload for _, payload in decoded])
+            entities.extend(
+                self._store(image, payload, prediction, autogenerate_report=autogenerate_reports)
+                for (image, payload), prediction in zip(decoded, predictions)
+            )
+        return UseCaseResult(success=True, data=entities)
 
-        # Carga el binario de la imagen y ejecuta inferencia real
-        image_bytes = bytes(image.data.content)
-        label, confidence_float, details = self.inference.predict(image_bytes)
+    def _decode_or_reject(self, image: Image) -> Optional[ImagePayload]:
+        """Verificación completa diferida desde el upload: si no decodifica, la imagen queda REJECTED."""
+        payload = ImagePayload(blob_view(image.data), content_type=image.mime_type)
+        try:
+            payload.image
+        except ValidationError:
+            image.status = Image.Status.REJECTED
+            image.save(update_fields=["status"])
+            _notify_status(image)
+            return None
+        return payload
+
+    def _store(
+        self,
+        image: Image,
+        payload: ImagePayload,
+        prediction: Tuple[str, float, dict],
+        autogenerate_report: bool = True,
+    ):
+        label, confidence_float, details = prediction
         confidence = Decimal(str(confidence_float))
+        if not self._model_registered:
+            # La metadata del modelo vive en `ModelVersion` (una fila por versión, registrada una vez
+            # por tarea); los resultados solo guardan la versión
+            self.repository.register_model_version(effective_model_version(), self.inference.metadata)
+            self._model_registered = True
+        # Miniatura a partir de la imagen ya decodificada (acotada) para inferencia: los reportes y
+        # el preview la reutilizan sin volver a leer ni decodificar el original
+        store_thumbnail(str(image.image_id), payload)
 
         entity = self.repository.save_result(
             image=image,
             owner=image.uploader,
             label=label,
             confidence=confidence,
-            model_version=settings.PIXELCHECK_MODEL_VERSION,
+            model_version=effective_model_version(),
+            threshold=current_threshold(),
             details=details,
         )
         image.status = Image.Status.DONE
         image.save(update_fields=["status"])
+        _notify_status(image)
 
-        if image.uploader.has_role(ROLE_PROFESSIONAL) or image.uploader.is_staff:
-            # Autogenerar reporte PDF para profesionales/staff
-            CreateReportUseCase(DjangoResultsQueryRepository(), DjangoReportRepository()).execute(
-                requester=image.uploader,
-                image_id=str(image.image_id),
-                report_format="PDF",
-            )
-        return UseCaseResult(success=True, data=entity)
+        if autogenerate_report:
+            request_single_report(image.uploader, str(image.image_id))
+        return entity
+
+
+def _notify_status(image: Image) -> None:
+    # Despierta a los long-polls de `results/<id>/wait` una vez que el cambio es visible en la base
+    image_id, status = str(image.image_id), image.status
+    transaction.on_commit(lambda: publish_image_status(image_id, status))
+
+
+def current_threshold() -> Decimal:
+    return Decimal(str(settings.PIXELCHECK_THRESHOLD))
+
+
+def request_single_report(uploader, image_id: str) -> None:
+    if uploader.has_role(ROLE_PROFESSIONAL) or uploader.is_staff:
+        # Autogenerar reporte PDF para profesionales/staff: se reserva aquí (GENERATING) y
+        # se renderiza en la cola `reports`, sin ocupar al worker de inferencia
+        result = CreateReportUseCase(DjangoResultsQueryRepository(), DjangoReportRepository()).execute(
+            requester=uploader,
+            image_id=image_id,
+            report_format="PDF",
+        )
+        generate_report_task.delay(str(result.data["reportId"]), image_id)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from decimal import Decimal
 from typing import Optional
 
 from .entities import AnalysisResultEntity
@@ -10,3 +11,11 @@ class AnalysisResultRepository(ABC):
 
     @abstractmethod
     def get_by_image(self, image_id: str) -> Optional[AnalysisResultEntity]: ...
+
+    @abstractmethod
+    def register_model_version(self, version: str, metadata: dict) -> None: ...
+
+    @abstractmethod
+    def find_by_fingerprint(
+        self, checksum: str, model_version: str, threshold: Decimal
+    ) -> Optional[AnalysisResultEntity]: ...
@@ -1,6 +1,9 @@
+from decimal import Decimal
+
 from analysis.domain.entities import AnalysisResultEntity
 from analysis.domain.repositories import AnalysisResultRepository
-from analysis.models import AnalysisResult
+from analysis.models import AnalysisResult, ModelVersion
+from results.infrastructure.cache import invalidate_result
 
 
 def _to_entity(instance: AnalysisResult) -> AnalysisResultEntity:
@@ -18,13 +21,14 @@ def _to_entity(instance: AnalysisResult) -> AnalysisResultEntity:
 
 class DjangoAnalysisResultRepository(AnalysisResultRepository):
     def save_result(self, **kwargs) -> AnalysisResultEntity:
-        image = kwargs["image"]
         defaults = kwargs.copy()
-        defaults.pop("image", None)
+        image = defaults.pop("image", None)
+        lookup = {"image": image} if image is not None else {"image_id": defaults.pop("image_id")}
         result, _ = AnalysisResult.objects.update_or_create(
-            image=image,
+            **lookup,
             defaults=defaults,
         )
+        invalidate_result(str(result.image_id))
         return _to_entity(result)
 
     def get_by_image(self, image_id: str) -> AnalysisResultEntity | None:
@@ -33,3 +37,18 @@ class DjangoAnalysisResultRepository(AnalysisResultRepository):
         except AnalysisResult.DoesNotExist:
             return None
         return _to_entity(result)
+
+    def register_model_version(self, version: str, metadata: dict) -> None:
+        ModelVersion.objects.get_or_create(version=version, defaults={"metadata": metadata})
+
+    def find_by_fingerprint(
+        self, checksum: str, model_version: str, threshold: Decimal
+    ) -> AnalysisResultEntity | None:
+        result = (
+            AnalysisResult.objects.filter(
+                image__checksum=checksum, model_version=model_version, threshold=threshold
+            )
+            .order_by("-processed_at")
+            .first()
+        )
+        return _to_entity(result) if result else None
@@ -4,7 +4,9 @@ from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from analysis.application.dedup import AnalysisDeduplicator
 from analysis.interface.serializers.health import ModelHealthSerializer
+from analysis.ml.backends import effective_model_version
 
 
 class ModelHealthView(APIView):
@@ -18,7 +20,8 @@ class ModelHealthView(APIView):
     def get(self, request):
         return Response(
             {
-                "modelVersion": settings.PIXELCHECK_MODEL_VERSION,
+                "modelVersion": effective_model_version(),
                 "threshold": settings.PIXELCHECK_THRESHOLD,
+                "dedup": AnalysisDeduplicator.stats(),
             }
         )
@@ -1,6 +1,13 @@
 from rest_framework import serializers
 
 
+class DedupStatsSerializer(serializers.Serializer):
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+
+
 class ModelHealthSerializer(serializers.Serializer):
     modelVersion = serializers.CharField()
     threshold = serializers.FloatField()
+    # None si no hay PIXELCHECK_DEDUP_STATS_URL
+    dedup = DedupStatsSerializer(allow_null=True)
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta el modelo TorchScript a ONNX (y su variante int8) y verifica la paridad de "
+        "probabilidades contra el TorchScript"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model-path", default=settings.PIXELCHECK_MODEL_PATH)
+        parser.add_argument("--opset", type=int, default=None)
+        parser.add_argument("--no-int8", action="store_true", help="No genera la variante cuantizada")
+        parser.add_argument("--fixtures", help="Directorio de imágenes para la paridad (default: set sintético)")
+        parser.add_argument("--tolerance", type=float, default=1e-4, help="Máx. diferencia de probabilidad (fp32)")
+        parser.add_argument(
+            "--int8-tolerance", type=float, default=0.05, help="Máx. diferencia de probabilidad (int8)"
+        )
+
+    def handle(self, *args, **options):
+        from analysis.ml.backends import (
+            BACKEND_ONNX,
+            BACKEND_ONNX_INT8,
+            OnnxRuntimeBackend,
+            TorchScriptBackend,
+            onnx_model_path,
+        )
+        from analysis.ml.export import ONNX_OPSET, export_onnx, fixture_images, parity_check, quantize_onnx
+
+        model_path = Path(options["model_path"])
+        if not model_path.exists():
+            raise CommandError(f"No se encontró el modelo en {model_path}")
+        try:
+            import onnx  # noqa: F401
+        except ImportError as exc:
+            raise CommandError("La exportación requiere el paquete opcional `onnx`") from exc
+
+        fp32_path = export_onnx(model_path, onnx_model_path(model_path), opset=options["opset"] or ONNX_OPSET)
+        targets = [(fp32_path, BACKEND_ONNX, options["tolerance"])]
+        if not options["no_int8"]:
+            int8_path = quantize_onnx(fp32_path, onnx_model_path(model_path, quantized=True))
+            targets.append((int8_path, BACKEND_ONNX_INT8, options["int8_tolerance"]))
+
+        fixtures = Path(options["fixtures"]) if options["fixtures"] else None
+        images = fixture_images(fixtures)
+        if not images:
+            raise CommandError(f"No hay imágenes en {fixtures}")
+        reference = TorchScriptBackend(model_path)
+
+        failed = []
+        for path, name, tolerance in targets:
+            diff = parity_check(reference, OnnxRuntimeBackend(path, name=name), images)
+            size_kb = path.stat().st_size / 1024
+            line = f"{name}: {path} ({size_kb:.0f} KiB) max|Δprob|={diff:.2e} (tolerancia {tolerance:.0e})"
+            if diff > tolerance:
+                failed.append(name)
+                self.stderr.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+        if failed:
+            raise CommandError(f"Paridad fuera de tolerancia: {', '.join(failed)}")
@@ -0,0 +1,57 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Levanta el servidor local de inferencia (modelo cargado una vez, cola acotada y batching)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--socket", help="Escucha en un socket UNIX en lugar de TCP")
+        parser.add_argument("--workers", type=int, default=settings.PIXELCHECK_SERVER_WORKERS)
+        parser.add_argument("--queue-size", type=int, default=settings.PIXELCHECK_SERVER_QUEUE_SIZE)
+        parser.add_argument("--max-batch", type=int, default=settings.PIXELCHECK_BATCH_MAX_SIZE)
+        parser.add_argument("--window-ms", type=float, default=5.0)
+        parser.add_argument(
+            "--torch-threads",
+            type=int,
+            default=settings.PIXELCHECK_TORCH_THREADS,
+            help="Hilos intra-op de torch (0 = default de torch)",
+        )
+
+    def handle(self, *args, **options):
+        import torch
+
+        from analysis.ml.inference import PixelCheckInference
+        from analysis.ml.server import InferenceServer
+
+        # Hilos de torch fijados antes del primer forward: un solo proceso por nodo los reparte
+        if options["torch_threads"] > 0:
+            torch.set_num_threads(options["torch_threads"])
+            torch.set_num_interop_threads(1)
+
+        server = InferenceServer(
+            PixelCheckInference.instance(),
+            address=options["socket"] or (options["host"], options["port"]),
+            workers=options["workers"],
+            queue_size=options["queue_size"],
+            max_batch_size=options["max_batch"],
+            window_ms=options["window_ms"],
+        )
+        # SIGTERM se trata como Ctrl+C para cerrar el socket ordenadamente
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inferencia {server.inference.model_version} escuchando en {server.address} "
+                f"(workers={options['workers']}, cola={options['queue_size']}, torch={torch.get_num_threads()} hilos)"
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
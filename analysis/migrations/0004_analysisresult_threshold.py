@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_threshold(apps, schema_editor):
+    AnalysisResult = apps.get_model("analysis", "AnalysisResult")
+    for result in AnalysisResult.objects.filter(threshold__isnull=True).iterator():
+        threshold = (result.details or {}).get("threshold")
+        if threshold is None:
+            continue
+        result.threshold = Decimal(str(threshold))
+        result.save(update_fields=["threshold"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0003_analysisresult_details"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysisresult",
+            name="threshold",
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=5, null=True),
+        ),
+        migrations.RunPython(backfill_threshold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def _in_batches(queryset):
+    batch = []
+    for result in queryset.only("result_id", "model_version", "details").iterator(chunk_size=BATCH_SIZE):
+        batch.append(result)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def move_metadata_to_model_version(apps, schema_editor):
+    AnalysisResult = apps.get_model("analysis", "AnalysisResult")
+    ModelVersion = apps.get_model("analysis", "ModelVersion")
+
+    registered = set(ModelVersion.objects.values_list("version", flat=True))
+    for batch in _in_batches(AnalysisResult.objects.filter(details__has_key="metadata")):
+        for result in batch:
+            metadata = result.details.pop("metadata") or {}
+            if result.model_version not in registered:
+                ModelVersion.objects.get_or_create(version=result.model_version, defaults={"metadata": metadata})
+                registered.add(result.model_version)
+        AnalysisResult.objects.bulk_update(batch, ["details"])
+
+
+def restore_metadata_in_details(apps, schema_editor):
+    AnalysisResult = apps.get_model("analysis", "AnalysisResult")
+    ModelVersion = apps.get_model("analysis", "ModelVersion")
+
+    metadata = dict(ModelVersion.objects.values_list("version", "metadata"))
+    for batch in _in_batches(AnalysisResult.objects.filter(model_version__in=list(metadata))):
+        for result in batch:
+            result.details = {**(result.details or {}), "metadata": metadata[result.model_version]}
+        AnalysisResult.objects.bulk_update(batch, ["details"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0005_modelversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_metadata_to_model_version, restore_metadata_in_details),
+    ]
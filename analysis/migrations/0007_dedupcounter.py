@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0006_move_model_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DedupCounter',
+            fields=[
+                ('name', models.CharField(max_length=16, primary_key=True, serialize=False)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
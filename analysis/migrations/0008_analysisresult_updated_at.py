@@ -0,0 +1,25 @@
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def backfill_updated_at(apps, schema_editor):
+    AnalysisResult = apps.get_model("analysis", "AnalysisResult")
+    AnalysisResult.objects.update(updated_at=F("processed_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0007_dedupcounter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysisresult",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,13 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0008_analysisresult_updated_at"),
+    ]
+
+    operations = [
+        # Los contadores de deduplicación salen de la base: viven en PIXELCHECK_DEDUP_STATS_URL
+        migrations.DeleteModel(name="DedupCounter"),
+    ]
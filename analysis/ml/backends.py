@@ -0,0 +1,100 @@
+"""
+Backends de ejecución del modelo. Todos reciben el batch ya preprocesado (N, 3, 224, 224) y
+devuelven logits (N, C) como tensor de torch, así `PixelCheckInference` no depende del runtime.
+
+- `torchscript`: el modelo original (`torch.jit.load`), CPU o CUDA.
+- `onnx`: el mismo modelo exportado a ONNX y ejecutado con ONNX Runtime (CPU).
+- `onnx-int8`: variante con cuantización dinámica int8 de pesos (CPU).
+
+Los archivos ONNX se generan con `python manage.py export_onnx` junto al TorchScript
+(`<modelo>.onnx` y `<modelo>.int8.onnx`). `onnxruntime` es una dependencia opcional.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import torch
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+BACKEND_TORCHSCRIPT = "torchscript"
+BACKEND_ONNX = "onnx"
+BACKEND_ONNX_INT8 = "onnx-int8"
+BACKENDS = (BACKEND_TORCHSCRIPT, BACKEND_ONNX, BACKEND_ONNX_INT8)
+
+
+def effective_model_version() -> str:
+    """
+    Versión con la que se registran los resultados: PIXELCHECK_MODEL_VERSION más el backend si no
+    es TorchScript (p. ej. `v1+onnx-int8`). Un export cuantizado no da las mismas probabilidades,
+    así que cambiar de backend separa la deduplicación y su fila en `ModelVersion`.
+    """
+    backend = settings.PIXELCHECK_INFERENCE_BACKEND
+    version = settings.PIXELCHECK_MODEL_VERSION
+    return version if backend == BACKEND_TORCHSCRIPT else f"{version}+{backend}"
+
+
+def onnx_model_path(model_path: Path, quantized: bool = False) -> Path:
+    return Path(model_path).with_suffix(".int8.onnx" if quantized else ".onnx")
+
+
+def import_onnxruntime():
+    try:
+        import onnxruntime
+    except ImportError as exc:
+        raise ImproperlyConfigured(
+            "El backend ONNX requiere el paquete opcional `onnxruntime` (pip install onnxruntime)"
+        ) from exc
+    return onnxruntime
+
+
+class ModelBackend(ABC):
+    name: str
+    device: torch.device
+
+    @abstractmethod
+    def __call__(self, batch: torch.Tensor) -> torch.Tensor: ...
+
+
+class TorchScriptBackend(ModelBackend):
+    name = BACKEND_TORCHSCRIPT
+
+    def __init__(self, path: Path, device: torch.device | None = None):
+        self.device = device or torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = torch.jit.load(path, map_location=self.device).eval()
+
+    def __call__(self, batch: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return self.model(batch.to(self.device))
+
+
+class OnnxRuntimeBackend(ModelBackend):
+    device = torch.device("cpu")
+
+    def __init__(self, path: Path, name: str = BACKEND_ONNX, threads: int = 0):
+        ort = import_onnxruntime()
+        if not path.exists():
+            raise FileNotFoundError(f"No se encontró {path}: genera el modelo con `manage.py export_onnx`")
+        self.name = name
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, batch: torch.Tensor) -> torch.Tensor:
+        (logits,) = self.session.run(None, {self.input_name: batch.cpu().numpy()})
+        return torch.from_numpy(logits)
+
+
+def load_backend(name: str, model_path: Path, threads: int = 0) -> ModelBackend:
+    if name == BACKEND_TORCHSCRIPT:
+        return TorchScriptBackend(model_path)
+    if name in (BACKEND_ONNX, BACKEND_ONNX_INT8):
+        path = onnx_model_path(model_path, quantized=name == BACKEND_ONNX_INT8)
+        return OnnxRuntimeBackend(path, name=name, threads=threads)
+    raise ImproperlyConfigured(f"Backend de inferencia desconocido: {name}")
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, List, Tuple
+
+
+class InferenceBusyError(RuntimeError):
+    """La cola de inferencia está llena: el llamador debe reintentar más tarde."""
+
+
+class BatchingInferenceEngine:
+    """
+    Agrupa predicciones concurrentes en micro-batches.
+
+    Cada llamada a `submit` encola los bytes de una imagen y devuelve un Future. Un hilo
+    dedicado espera como máximo `window_ms` (o hasta juntar `max_batch_size` imágenes),
+    ejecuta un único forward con `predict_many` y reparte (label, confidence, details)
+    a cada llamador.
+
+    Con `max_pending > 0` la cola es acotada y `submit` lanza `InferenceBusyError` al llenarse;
+    `workers` fija cuántos hilos ejecutan batches en paralelo.
+    """
+
+    def __init__(
+        self, inference, max_batch_size: int = 8, window_ms: float = 10.0, max_pending: int = 0, workers: int = 1
+    ):
+        self.inference = inference
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.window = max(0.0, float(window_ms)) / 1000.0
+        self.max_pending = max(0, int(max_pending))
+        self.workers = max(1, int(workers))
+        self._pending: Deque[Tuple[bytes, Future]] = deque()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self.batches = 0
+        self.batched_items = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def submit(self, image_bytes: bytes) -> Future:
+        return self.submit_many([image_bytes])[0]
+
+    def submit_many(self, images: List[bytes]) -> List[Future]:
+        """Encola todas las imágenes o ninguna (si no entran en la cola acotada)."""
+        futures: List[Future] = [Future() for _ in images]
+        with self._cond:
+            if self.max_pending and len(self._pending) + len(images) > self.max_pending:
+                raise InferenceBusyError("Cola de inferencia llena")
+            self._ensure_worker()
+            self._pending.extend(zip(images, futures))
+            self._cond.notify_all()
+        return futures
+
+    def predict(self, image_bytes: bytes) -> Tuple[str, float, dict]:
+        return self.submit(image_bytes).result()
+
+    def predict_many(self, images: List[bytes]) -> List[Tuple[str, float, dict]]:
+        return [future.result() for future in self.submit_many(images)]
+
+    def _ensure_worker(self) -> None:
+        # Tras un fork los hilos del padre no existen en el hijo: se recrean a demanda
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._run, name=f"pixelcheck-batching-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_batch(self) -> List[Tuple[bytes, Future]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            # Ventana de agrupación: espera más peticiones hasta llenar el batch o agotar el tiempo
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            size = min(self.max_batch_size, len(self._pending))
+            return [self._pending.popleft() for _ in range(size)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            batch = [(data, future) for data, future in batch if future.set_running_or_notify_cancel()]
+            if batch:
+                with self._cond:
+                    self.batches += 1
+                    self.batched_items += len(batch)
+                self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[bytes, Future]]) -> None:
+        try:
+            outputs = self.inference.predict_many([data for data, _ in batch])
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            # Una imagen inválida no debe tumbar al resto del batch: reintenta de a una
+            for item in batch:
+                self._dispatch([item])
+            return
+        for (_, future), output in zip(batch, outputs):
+            future.set_result(output)
+
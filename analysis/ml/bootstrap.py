@@ -0,0 +1,99 @@
+"""
+Arranque del modelo en los workers Celery (ver señales en `config/celery.py`).
+
+- `worker_init` (proceso padre, antes del fork): carga los pesos una sola vez y congela el GC
+  para que los hijos del pool prefork los compartan copy-on-write.
+- `worker_process_init` (cada hijo): fija los hilos de torch, hace un forward de calentamiento
+  y marca el worker como listo en `PIXELCHECK_READY_FILE`.
+
+En el padre no se ejecuta ningún forward: los pools de hilos de torch/OpenMP no sobreviven al fork.
+"""
+
+import gc
+import logging
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image
+
+from analysis.ml.client import INFERENCE_MODE_SERVER
+
+logger = logging.getLogger(__name__)
+
+# Se fija en el padre y los hijos lo heredan con el fork
+_warm_up_children = False
+
+
+def on_worker_init(worker) -> None:
+    global _warm_up_children
+    if not settings.PIXELCHECK_PRELOAD_MODEL or not consumes_analysis_queue(worker):
+        return
+    if settings.PIXELCHECK_INFERENCE_MODE == INFERENCE_MODE_SERVER:
+        # El modelo vive en el servidor de inferencia, no en los workers
+        return
+    clear_ready()
+    preload_model()
+    if uses_prefork_pool(worker):
+        _warm_up_children = True
+    else:
+        # solo/threads: no hay procesos hijos, se calienta en este mismo proceso
+        warm_up()
+
+
+def on_worker_process_init() -> None:
+    if _warm_up_children:
+        warm_up()
+
+
+def consumes_analysis_queue(worker) -> bool:
+    """Un worker dedicado a otras colas (p. ej. `-Q reports`) no necesita el modelo."""
+    return worker.app.conf.task_default_queue in worker.app.amqp.queues.consume_from
+
+
+def uses_prefork_pool(worker) -> bool:
+    from celery.concurrency import get_implementation
+
+    return get_implementation(worker.pool_cls).__module__.endswith("prefork")
+
+
+def preload_model() -> None:
+    import torch
+
+    from analysis.ml.inference import PixelCheckInference
+
+    if torch.cuda.is_available():
+        # CUDA no admite fork: cada hijo inicializa su propio contexto y carga el modelo
+        logger.info("CUDA disponible: la carga del modelo queda a cargo de cada proceso hijo")
+        return
+    inference = PixelCheckInference.instance()
+    # Los objetos ya cargados pasan a la generación permanente: el GC de los hijos no los
+    # recorre y sus páginas (incluidos los pesos) siguen compartidas con el padre
+    gc.freeze()
+    logger.info("Modelo %s precargado en el proceso padre", inference.model_version)
+
+
+def warm_up() -> None:
+    import torch
+
+    from analysis.ml.inference import PixelCheckInference
+
+    if settings.PIXELCHECK_TORCH_THREADS > 0:
+        torch.set_num_threads(settings.PIXELCHECK_TORCH_THREADS)
+    inference = PixelCheckInference.instance()
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), "gray").save(buffer, format="PNG")
+    inference.predict_many([buffer.getvalue()])
+    mark_ready()
+
+
+def mark_ready() -> None:
+    if settings.PIXELCHECK_READY_FILE:
+        path = Path(settings.PIXELCHECK_READY_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+
+def clear_ready() -> None:
+    if settings.PIXELCHECK_READY_FILE:
+        Path(settings.PIXELCHECK_READY_FILE).unlink(missing_ok=True)
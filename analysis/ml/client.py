@@ -0,0 +1,109 @@
+import http.client
+import json
+import socket
+import threading
+from functools import cached_property
+from typing import List, Tuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from analysis.ml.batching import InferenceBusyError
+from analysis.ml.server import LENGTHS_HEADER
+from shared.utils.image import ImagePayload
+
+__all__ = ["INFERENCE_MODE_SERVER", "InferenceClient", "InferenceBusyError", "InferenceServerError"]
+
+# Valor de PIXELCHECK_INFERENCE_MODE con el que los workers usan este cliente en lugar del modelo
+INFERENCE_MODE_SERVER = "server"
+
+
+class InferenceServerError(RuntimeError):
+    """El servidor de inferencia no respondió o devolvió un error."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class InferenceClient:
+    """
+    Cliente del servidor local de inferencia (`manage.py inference_server`) con la misma interfaz
+    que `PixelCheckInference` (`predict`, `predict_many`, `metadata`).
+
+    `url` admite `http://127.0.0.1:8765` o `unix:///ruta/al/socket`.
+    """
+
+    _instance: "InferenceClient | None" = None
+
+    @classmethod
+    def instance(cls) -> "InferenceClient":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, url: str | None = None, timeout: float | None = None):
+        self.url = urlparse(url or settings.PIXELCHECK_INFERENCE_URL)
+        self.timeout = timeout if timeout is not None else settings.PIXELCHECK_INFERENCE_TIMEOUT
+        # Una conexión keep-alive por hilo
+        self._local = threading.local()
+
+    @cached_property
+    def metadata(self) -> dict:
+        return self._request("GET", "/health")["metadata"]
+
+    def predict(self, image) -> Tuple[str, float, dict]:
+        return self.predict_many([image])[0]
+
+    def predict_many(self, images: List) -> List[Tuple[str, float, dict]]:
+        if not images:
+            return []
+        chunks = [image.buffer if isinstance(image, ImagePayload) else bytes(image) for image in images]
+        response = self._request(
+            "POST",
+            "/predict",
+            body=b"".join(chunks),
+            headers={
+                "Content-Type": "application/octet-stream",
+                LENGTHS_HEADER: ",".join(str(len(chunk)) for chunk in chunks),
+            },
+        )
+        predictions = []
+        for item in response["predictions"]:
+            if "error" in item:
+                raise InferenceServerError(f"Error de inferencia: {item['error']}")
+            predictions.append((item["label"], item["confidence"], item["details"]))
+        return predictions
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self.url.scheme == "unix":
+                connection = _UnixHTTPConnection(self.url.path, timeout=self.timeout)
+            else:
+                connection = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _request(self, method: str, path: str, body: bytes | None = None, headers: dict | None = None) -> dict:
+        connection = self._connection()
+        try:
+            connection.request(method, path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            connection.close()
+            self._local.connection = None
+            raise InferenceServerError(f"Servidor de inferencia no disponible: {exc}") from exc
+        if response.status == 503:
+            raise InferenceBusyError("Servidor de inferencia saturado")
+        if response.status != 200:
+            raise InferenceServerError(f"Servidor de inferencia respondió {response.status}: {payload[:200]!r}")
+        return json.loads(payload)
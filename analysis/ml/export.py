@@ -0,0 +1,73 @@
+"""
+Exportación del TorchScript a ONNX, cuantización dinámica int8 y chequeo de paridad.
+
+Requiere los paquetes opcionales `onnx` (export) y `onnxruntime` (cuantización y paridad).
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+from typing import Iterable, List
+
+import numpy as np
+import torch
+from PIL import Image
+
+from analysis.ml.backends import ModelBackend, import_onnxruntime
+from analysis.ml.inference import build_transform
+from shared.utils.image import ImagePayload
+
+ONNX_OPSET = 17
+INPUT_NAME = "input"
+OUTPUT_NAME = "logits"
+
+
+def export_onnx(model_path: Path, target: Path, opset: int = ONNX_OPSET) -> Path:
+    """Exporta el TorchScript con el eje de batch dinámico."""
+    model = torch.jit.load(model_path, map_location="cpu").eval()
+    sample = torch.zeros(1, 3, 224, 224)
+    torch.onnx.export(
+        model,
+        sample,
+        str(target),
+        dynamo=False,
+        opset_version=opset,
+        input_names=[INPUT_NAME],
+        output_names=[OUTPUT_NAME],
+        dynamic_axes={INPUT_NAME: {0: "batch"}, OUTPUT_NAME: {0: "batch"}},
+    )
+    return target
+
+
+def quantize_onnx(source: Path, target: Path) -> Path:
+    """Cuantización dinámica: pesos en int8, activaciones cuantizadas en tiempo de ejecución."""
+    import_onnxruntime()
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+    return target
+
+
+def fixture_images(directory: Path | None = None, count: int = 8, seed: int = 0) -> List[bytes]:
+    """Imágenes del directorio indicado o, si no hay, un set sintético determinista."""
+    if directory is not None:
+        return [path.read_bytes() for path in sorted(Path(directory).iterdir()) if path.is_file()]
+    rng = np.random.default_rng(seed)
+    images = []
+    for index in range(count):
+        width, height = 96 + 32 * index, 320 - 24 * index
+        pixels = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        buffer = BytesIO()
+        Image.fromarray(pixels).save(buffer, format="JPEG" if index % 2 else "PNG")
+        images.append(buffer.getvalue())
+    return images
+
+
+def parity_check(reference: ModelBackend, candidate: ModelBackend, images: Iterable[bytes]) -> float:
+    """Máxima diferencia absoluta entre las probabilidades softmax de ambos backends."""
+    transform = build_transform()
+    batch = torch.stack([transform(ImagePayload(image).rgb_image) for image in images])
+    expected = torch.softmax(reference(batch).float().cpu(), dim=1)
+    actual = torch.softmax(candidate(batch).float().cpu(), dim=1)
+    return float((expected - actual).abs().max())
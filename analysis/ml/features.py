@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Espacio de color RGB de 8 bits empaquetado en claves de 24 bits
+_COLOR_SPACE = 1 << 24
+# Por encima de este número de píxeles un bitmap de 16 MB es más barato que ordenar las claves
+_BITMAP_MIN_PIXELS = 1 << 18
+
+
+def pack_rgb(rgb: np.ndarray) -> np.ndarray:
+    """Empaqueta un arreglo uint8 (..., 3) en claves enteras 0xRRGGBB."""
+    flat = rgb.reshape(-1, 3)
+    keys = flat[:, 0].astype(np.uint32) << 16
+    keys |= flat[:, 1].astype(np.uint32) << 8
+    keys |= flat[:, 2]
+    return keys
+
+
+def count_unique_colors(rgb: np.ndarray) -> int:
+    """
+    Cuenta colores RGB distintos sobre datos uint8.
+
+    Equivale a `len(np.unique(arr.reshape(-1, 3), axis=0))` pero evita el ordenamiento
+    lexicográfico por filas: usa claves de 24 bits y, en imágenes grandes, un bitmap.
+    """
+    if rgb.dtype != np.uint8:
+        raise TypeError("count_unique_colors espera datos uint8")
+    keys = pack_rgb(rgb)
+    if keys.size < _BITMAP_MIN_PIXELS:
+        return int(np.unique(keys).size)
+    seen = np.zeros(_COLOR_SPACE, dtype=bool)
+    seen[keys] = True
+    return int(np.count_nonzero(seen))
+
+
+def compute_simple_features(rgb: np.ndarray, alpha: np.ndarray | None = None) -> dict:
+    """Heurísticas rápidas para features amigables a la UI a partir de vistas uint8."""
+    arr = rgb.astype(np.float32) / 255.0
+    h, w, _ = arr.shape
+
+    # Diversidad de color: proporción de colores únicos (acotada a 1.0)
+    uniq_colors = count_unique_colors(rgb)
+    color_score = float(min(1.0, uniq_colors / max(1, (h * w / 10_000))))
+
+    # Transparencia: si hay canal alpha y su promedio es bajo
+    if alpha is not None:
+        alpha_norm = alpha.astype(np.float32) / 255.0
+        transparency_score = float(max(0.0, 1.0 - alpha_norm.mean()))
+    else:
+        transparency_score = 0.0
+
+    # Ruido: desviación estándar en escala de grises (normalizada)
+    gray = np.dot(arr, [0.299, 0.587, 0.114])
+    noise_raw = float(np.std(gray))
+    noise_score = float(min(1.0, noise_raw * 2.5))  # heurística
+
+    # Watermark: contraste en altas frecuencias (muy simple)
+    high_freq = np.abs(np.diff(gray, axis=0)).mean() + np.abs(np.diff(gray, axis=1)).mean()
+    watermark_score = float(min(1.0, high_freq * 2.0))
+
+    # Simetría: compara izquierda/derecha
+    mid = w // 2
+    left = arr[:, :mid, :]
+    right = np.fliplr(arr[:, -mid:, :])
+    sym_diff = float(np.mean(np.abs(left - right)))
+    symmetry_score = float(max(0.0, 1.0 - sym_diff * 2.0))
+
+    return {
+        "color_score": round(color_score, 2),
+        "transparency_score": round(transparency_score, 2),
+        "noise_score": round(noise_score, 2),
+        "watermark_score": round(watermark_score, 2),
+        "symmetry_score": round(symmetry_score, 2),
+    }
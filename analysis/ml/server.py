@@ -0,0 +1,206 @@
+"""
+Servidor local de inferencia: un único proceso por nodo con el modelo cargado, una cola acotada
+con batching dinámico (`BatchingInferenceEngine`) y métricas de cola/latencia.
+
+Protocolo (HTTP/1.1 sobre TCP local o socket UNIX):
+- `POST /predict`: cuerpo con los bytes de una o más imágenes concatenadas; `X-Image-Lengths`
+  indica el tamaño de cada una. Responde `{"predictions": [{label, confidence, details}, ...]}`
+  o 503 (`Retry-After`) si la cola está llena.
+- `GET /health`: versión y metadata del modelo.
+- `GET /metrics`: profundidad de cola, batches y latencias.
+"""
+
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from analysis.ml.batching import BatchingInferenceEngine, InferenceBusyError
+
+logger = logging.getLogger(__name__)
+
+LENGTHS_HEADER = "X-Image-Lengths"
+
+
+class ServerMetrics:
+    def __init__(self, window: int = 2048):
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.images = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def observe(self, latency: float, images: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.images += images
+            self._latencies.append(latency)
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self, engine: BatchingInferenceEngine) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counters = {
+                "requests": self.requests,
+                "images": self.images,
+                "rejected": self.rejected,
+                "errors": self.errors,
+            }
+
+        def percentile(q: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2)
+
+        return {
+            **counters,
+            "queueDepth": engine.queue_depth,
+            "queueCapacity": engine.max_pending,
+            "workers": engine.workers,
+            "batches": engine.batches,
+            "avgBatchSize": round(engine.batched_items / engine.batches, 2) if engine.batches else None,
+            "latencyMs": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)},
+        }
+
+
+class _InferenceRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "PixelCheckInference"
+
+    @property
+    def app(self) -> "InferenceServer":
+        return self.server.app
+
+    def do_GET(self):
+        if self.path == "/health":
+            inference = self.app.inference
+            self._send_json(
+                HTTPStatus.OK,
+                {"status": "ok", "modelVersion": inference.model_version, "metadata": inference.metadata},
+            )
+        elif self.path == "/metrics":
+            self._send_json(HTTPStatus.OK, self.app.metrics.snapshot(self.app.engine))
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"detail": "Ruta no encontrada"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(HTTPStatus.NOT_FOUND, {"detail": "Ruta no encontrada"})
+            return
+        started = time.monotonic()
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            images = _split_body(body, self.headers.get(LENGTHS_HEADER))
+        except ValueError as exc:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"detail": str(exc)})
+            return
+
+        try:
+            futures = self.app.engine.submit_many(images)
+        except InferenceBusyError:
+            self.app.metrics.reject()
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"detail": "Cola de inferencia llena"}, retry_after=1)
+            return
+
+        predictions = []
+        for future in futures:
+            try:
+                label, confidence, details = future.result()
+                predictions.append({"label": label, "confidence": confidence, "details": details})
+            except Exception as exc:
+                self.app.metrics.error()
+                predictions.append({"error": str(exc) or exc.__class__.__name__})
+        self.app.metrics.observe(time.monotonic() - started, len(images))
+        self._send_json(HTTPStatus.OK, {"predictions": predictions})
+
+    def _send_json(self, status: HTTPStatus, payload: dict, retry_after: int | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # En sockets UNIX `client_address` es una cadena vacía
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def _split_body(body: bytes, lengths_header: str | None) -> list[bytes]:
+    if not lengths_header:
+        if not body:
+            raise ValueError("Cuerpo vacío")
+        return [body]
+    try:
+        lengths = [int(value) for value in lengths_header.split(",")]
+    except ValueError as exc:
+        raise ValueError(f"{LENGTHS_HEADER} inválido") from exc
+    if sum(lengths) != len(body) or any(length <= 0 for length in lengths):
+        raise ValueError(f"{LENGTHS_HEADER} no coincide con el cuerpo")
+    images, offset = [], 0
+    for length in lengths:
+        images.append(body[offset : offset + length])
+        offset += length
+    return images
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+class InferenceServer:
+    """Envuelve un `PixelCheckInference` con cola acotada, batching dinámico y métricas."""
+
+    def __init__(
+        self,
+        inference,
+        address: tuple[str, int] | str,
+        workers: int = 1,
+        queue_size: int = 64,
+        max_batch_size: int = 16,
+        window_ms: float = 5.0,
+    ):
+        self.inference = inference
+        self.engine = BatchingInferenceEngine(
+            inference, max_batch_size=max_batch_size, window_ms=window_ms, max_pending=queue_size, workers=workers
+        )
+        self.metrics = ServerMetrics()
+        server_cls = _UnixHTTPServer if isinstance(address, str) else ThreadingHTTPServer
+        self.httpd = server_cls(address, _InferenceRequestHandler)
+        self.httpd.app = self
+
+    @property
+    def address(self) -> tuple[str, int] | str:
+        return self.httpd.server_address
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
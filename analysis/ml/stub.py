@@ -0,0 +1,47 @@
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import torch
+from PIL import Image
+
+
+class TinyModel(torch.nn.Module):
+    """Modelo mínimo (pool + lineal) que reemplaza al TorchScript real en pruebas y benchmarks."""
+
+    def __init__(self):
+        super().__init__()
+        self.pool = torch.nn.AdaptiveAvgPool2d(1)
+        self.fc = torch.nn.Linear(3, 2)
+
+    def forward(self, x):
+        return self.fc(self.pool(x).flatten(1))
+
+
+def write_tiny_model(directory: str) -> Path:
+    torch.manual_seed(0)
+    path = Path(directory) / "model.pt"
+    torch.jit.script(TinyModel().eval()).save(str(path))
+    return path
+
+
+def photo_like(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """
+    Imagen sintética determinista (uint8 H x W x 3) para pruebas y benchmarks: degradés suaves,
+    manchas y ruido leve, más parecida a una foto que el ruido uniforme (y comprime como una).
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    arr = np.stack([128 + 100 * np.sin(x / (300 + 50 * c)) * np.cos(y / (250 + 40 * c)) for c in range(3)], -1)
+    for _ in range(20):
+        cx, cy, radius = rng.integers(0, width), rng.integers(0, height), rng.integers(50, 400)
+        arr[(x - cx) ** 2 + (y - cy) ** 2 < radius**2] += rng.normal(0, 40, 3)
+    arr += rng.normal(0, 6, arr.shape)
+    return np.clip(arr, 0, 255).astype(np.uint8)
+
+
+def photo_bytes(width: int, height: int, fmt: str = "JPEG", seed: int = 0, **save_options) -> bytes:
+    """`photo_like` codificada en `fmt` (opciones extra van a `Image.save`, p. ej. `quality`)."""
+    buffer = BytesIO()
+    Image.fromarray(photo_like(width, height, seed=seed)).save(buffer, format=fmt, **save_options)
+    return buffer.getvalue()
@@ -4,6 +4,20 @@ from django.conf import settings
 from django.db import models
 
 
+class ModelVersion(models.Model):
+    """Registro de versiones del modelo: `metadata.json` se guarda una vez por versión, no por resultado."""
+
+    version = models.CharField(max_length=64, primary_key=True)
+    metadata = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:
+        return self.version
+
+
 class AnalysisResult(models.Model):
     class Label(models.TextChoices):
         AI = "AI"
@@ -18,9 +32,13 @@ class AnalysisResult(models.Model):
     )
     label = models.CharField(max_length=8, choices=Label.choices)
     confidence = models.DecimalField(max_digits=5, decimal_places=4)
+    # Referencia por versión a `ModelVersion` (metadata del modelo)
     model_version = models.CharField(max_length=64)
+    threshold = models.DecimalField(max_digits=5, decimal_places=4, null=True, blank=True)
     details = models.JSONField(default=dict, blank=True)
     processed_at = models.DateTimeField(auto_now_add=True)
+    # Un re-análisis actualiza la misma fila (`save_result`): ETag y Last-Modified salen de aquí
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("-processed_at",)
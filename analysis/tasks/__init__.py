@@ -1,3 +1,3 @@
-from .worker import run_analysis_task
+from .worker import run_analysis_batch_task, run_analysis_task
 
-__all__ = ["run_analysis_task"]
+__all__ = ["run_analysis_task", "run_analysis_batch_task"]
@@ -1,10 +1,43 @@
 from celery import shared_task
+from django.utils import timezone
 
 from analysis.application.use_cases import AnalyzeImageUseCase
 from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from analysis.ml.batching import InferenceBusyError
+from results.infrastructure.repositories import DjangoReportRepository
+from results.models import Report
+from results.tasks import generate_batch_report_task
 
 
-@shared_task(name="analysis.run_analysis")
+# Servidor de inferencia saturado (503): se reintenta con backoff. execute/execute_many omiten
+# las imágenes ya resueltas, así que reintentar es idempotente.
+RETRY_OPTIONS = {
+    "autoretry_for": (InferenceBusyError,),
+    "retry_backoff": True,
+    "retry_backoff_max": 30,
+    "max_retries": 8,
+}
+
+
+@shared_task(name="analysis.run_analysis", **RETRY_OPTIONS)
 def run_analysis_task(image_id: str) -> None:
     use_case = AnalyzeImageUseCase(DjangoAnalysisResultRepository())
     use_case.execute(image_id=image_id)
+
+
+@shared_task(name="analysis.run_analysis_batch", bind=True, **RETRY_OPTIONS)
+def run_analysis_batch_task(self, image_ids: list[str], report_id: str | None = None) -> None:
+    use_case = AnalyzeImageUseCase(DjangoAnalysisResultRepository())
+    try:
+        # Con reporte BATCH no se generan reportes individuales por imagen
+        use_case.execute_many(image_ids=image_ids, autogenerate_reports=report_id is None)
+    except Exception as exc:
+        will_retry = isinstance(exc, InferenceBusyError) and self.request.retries < self.max_retries
+        if report_id and not will_retry:
+            # Sin reintentos pendientes el reporte reservado no se generará: no queda en REQUESTED
+            DjangoReportRepository().update_report(
+                report_id=report_id, status=Report.Status.FAILED, completed_at=timezone.now()
+            )
+        raise
+    if report_id:
+        generate_batch_report_task.delay(report_id, image_ids)
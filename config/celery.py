@@ -1,9 +1,41 @@
 import os
 
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 app = Celery("pixelcheck")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+
+# Imports perezosos: `config.celery` también se importa desde Django (web, manage.py) y ahí
+# no debe cargarse torch ni el modelo. Ver `analysis/ml/bootstrap.py`.
+@worker_init.connect
+def preload_inference_model(sender=None, **kwargs):
+    from analysis.ml import bootstrap
+
+    bootstrap.on_worker_init(sender)
+
+
+@worker_process_init.connect
+def warm_up_inference_model(**kwargs):
+    from analysis.ml import bootstrap
+
+    bootstrap.on_worker_process_init()
+
+
+@worker_shutdown.connect
+def clear_inference_ready(**kwargs):
+    from analysis.ml import bootstrap
+
+    bootstrap.clear_ready()
+
+
+@worker_process_shutdown.connect
+def flush_audit_log(**kwargs):
+    # Los hijos del pool prefork terminan con os._exit: atexit no corre y el buffer se vacía acá
+    from sysmgmt.infrastructure.audit_buffer import flush_audit_buffer
+
+    flush_audit_buffer()
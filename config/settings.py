@@ -9,7 +9,27 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 env = environ.Env(
     DJANGO_DEBUG=(bool, False),
     DATA_UPLOAD_MAX_MEMORY_SIZE=(int, 10 * 1024 * 1024),
+    FILE_UPLOAD_MAX_MEMORY_SIZE=(int, 256 * 1024),
     PIXELCHECK_THRESHOLD=(float, 0.5),
+    PIXELCHECK_BATCH_MAX_SIZE=(int, 16),
+    PIXELCHECK_BATCH_WINDOW_MS=(float, 0.0),
+    PIXELCHECK_DEDUP_ENABLED=(bool, True),
+    BATCH_UPLOAD_MAX_FILES=(int, 100),
+    RESULT_WAIT_MAX_TIMEOUT=(float, 25.0),
+    RESULT_CACHE_ENABLED=(bool, True),
+    RESULT_CACHE_TIMEOUT=(int, 3600),
+    RESULT_CACHE_LOCAL_TIMEOUT=(int, 60),
+    RESULT_CACHE_LOCAL_MAX_ENTRIES=(int, 2048),
+    PIXELCHECK_PRELOAD_MODEL=(bool, True),
+    PIXELCHECK_TORCH_THREADS=(int, 0),
+    PIXELCHECK_INFERENCE_TIMEOUT=(float, 30.0),
+    PIXELCHECK_FEATURE_MAX_SIDE=(int, 1024),
+    PIXELCHECK_SERVER_WORKERS=(int, 1),
+    PIXELCHECK_SERVER_QUEUE_SIZE=(int, 64),
+    IMAGE_THUMBNAIL_SIDE=(int, 512),
+    AUDIT_BUFFER_MAX_BATCH=(int, 200),
+    AUDIT_FLUSH_INTERVAL=(float, 2.0),
+    AUDIT_BUFFER_MAX_PENDING=(int, 10000),
 )
 environ.Env.read_env(BASE_DIR / ".env", overwrite=False)
 
@@ -98,7 +118,7 @@ AUTH_USER_MODEL = "iam.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "iam.infrastructure.authentication.RoleClaimJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -118,6 +138,15 @@ SIMPLE_JWT = {
 }
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = env("DATA_UPLOAD_MAX_MEMORY_SIZE")
+# Uploads por chunks con sha256 incremental; por encima de este umbral se vuelcan a disco
+FILE_UPLOAD_MAX_MEMORY_SIZE = env("FILE_UPLOAD_MAX_MEMORY_SIZE")
+FILE_UPLOAD_HANDLERS = ["ingestion.infrastructure.upload_handlers.HashingUploadHandler"]
+# Máximo de imágenes por upload múltiple (`images/upload/batch`, archivos sueltos o ZIP)
+BATCH_UPLOAD_MAX_FILES = env("BATCH_UPLOAD_MAX_FILES")
+DATA_UPLOAD_MAX_NUMBER_FILES = BATCH_UPLOAD_MAX_FILES
+# "header": el upload solo valida tipo, magic bytes y dimensiones; el worker decodifica y rechaza.
+# "full": verificación completa (PIL verify) en el hilo del request.
+IMAGE_VALIDATION_MODE = env("IMAGE_VALIDATION_MODE", default="header")
 
 REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
 CELERY_BROKER_URL = env("CELERY_BROKER_URL", default=REDIS_URL)
@@ -127,11 +156,82 @@ CELERY_TASK_SOFT_TIME_LIMIT = 45
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+# Los reportes (render PDF/CSV) van a su propia cola para no competir con la inferencia
+REPORTS_QUEUE = env("REPORTS_QUEUE", default="reports")
+CELERY_TASK_ROUTES = {"results.*": {"queue": REPORTS_QUEUE}}
+
+# Avisos de fin de análisis para el long-poll `results/<id>/wait`: "redis" (pub/sub en REDIS_URL)
+# o "local" (en proceso; sirve solo si web y worker comparten proceso, p. ej. tests)
+RESULT_NOTIFICATIONS_BACKEND = env(
+    "RESULT_NOTIFICATIONS_BACKEND", default="local" if "test" in sys.argv else "redis"
+)
+# Tope del `?timeout=` del long-poll, por debajo del timeout típico de proxies (30 s)
+RESULT_WAIT_MAX_TIMEOUT = env("RESULT_WAIT_MAX_TIMEOUT")
+
+# Cache read-through de resultados (results.infrastructure.cache): LRU en proceso acotado y,
+# si se define RESULT_CACHE_URL, un tier Redis compartido entre procesos web y workers
+RESULT_CACHE_ENABLED = env("RESULT_CACHE_ENABLED")
+RESULT_CACHE_TIMEOUT = env("RESULT_CACHE_TIMEOUT")
+RESULT_CACHE_LOCAL_TIMEOUT = env("RESULT_CACHE_LOCAL_TIMEOUT")
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "results_local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "pixelcheck-results",
+        "OPTIONS": {"MAX_ENTRIES": env("RESULT_CACHE_LOCAL_MAX_ENTRIES")},
+    },
+}
+if env("RESULT_CACHE_URL", default=""):
+    CACHES["results"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("RESULT_CACHE_URL"),
+    }
+# Contadores de aciertos/fallos de deduplicación (analysis/model/health). Sin esta URL no se cuentan:
+# un contador en la base sería una fila caliente en cada upload
+if env("PIXELCHECK_DEDUP_STATS_URL", default=""):
+    CACHES["dedup_stats"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("PIXELCHECK_DEDUP_STATS_URL"),
+    }
 
 PIXELCHECK_MODEL_PATH = env("PIXELCHECK_MODEL_PATH", default="models/pixelcheck/v1")
 PIXELCHECK_MODEL_VERSION = env("PIXELCHECK_MODEL_VERSION", default="v1")
 PIXELCHECK_THRESHOLD = env("PIXELCHECK_THRESHOLD")
+# Lado mayor con que se decodifica la imagen para el modelo y las heurísticas (0 = resolución
+# nativa). Los JPEG se decodifican ya escalados (draft), el resto se reduce tras decodificar.
+PIXELCHECK_FEATURE_MAX_SIDE = env("PIXELCHECK_FEATURE_MAX_SIDE")
+# Runtime del modelo: "torchscript", "onnx" u "onnx-int8" (ver `manage.py export_onnx`)
+PIXELCHECK_INFERENCE_BACKEND = env("PIXELCHECK_INFERENCE_BACKEND", default="torchscript")
+# Micro-batching de inferencia (ventana 0 = desactivado; útil con `--pool threads`)
+PIXELCHECK_BATCH_MAX_SIZE = env("PIXELCHECK_BATCH_MAX_SIZE")
+PIXELCHECK_BATCH_WINDOW_MS = env("PIXELCHECK_BATCH_WINDOW_MS")
+# Workers Celery de análisis: modelo precargado en el padre (compartido copy-on-write por el pool
+# prefork) y calentado en cada hijo. PIXELCHECK_TORCH_THREADS=0 deja el default de torch.
+PIXELCHECK_PRELOAD_MODEL = env("PIXELCHECK_PRELOAD_MODEL")
+PIXELCHECK_TORCH_THREADS = env("PIXELCHECK_TORCH_THREADS")
+# Archivo que se crea cuando el worker tiene el modelo listo (readiness probe); vacío = desactivado
+PIXELCHECK_READY_FILE = env("PIXELCHECK_READY_FILE", default="")
+# "inline": cada worker Celery ejecuta el modelo. "server": los workers llaman al servidor local
+# (`manage.py inference_server`) en PIXELCHECK_INFERENCE_URL (http://host:puerto o unix:///ruta)
+PIXELCHECK_INFERENCE_MODE = env("PIXELCHECK_INFERENCE_MODE", default="inline")
+PIXELCHECK_INFERENCE_URL = env("PIXELCHECK_INFERENCE_URL", default="http://127.0.0.1:8765")
+PIXELCHECK_INFERENCE_TIMEOUT = env("PIXELCHECK_INFERENCE_TIMEOUT")
+PIXELCHECK_SERVER_WORKERS = env("PIXELCHECK_SERVER_WORKERS")
+PIXELCHECK_SERVER_QUEUE_SIZE = env("PIXELCHECK_SERVER_QUEUE_SIZE")
+# Reutiliza resultados de uploads repetidos (mismo sha256 + modelo + umbral)
+PIXELCHECK_DEDUP_ENABLED = env("PIXELCHECK_DEDUP_ENABLED")
+# Almacenamiento de binarios: "database" (BinaryField) o "filesystem" (direccionado por sha256)
+IMAGE_STORAGE = env("IMAGE_STORAGE", default="database")
 REPORT_STORAGE = env("REPORT_STORAGE", default="database")
+BLOB_STORAGE_ROOT = env("BLOB_STORAGE_ROOT", default=str(MEDIA_ROOT / "blobs"))
+# Miniatura JPEG generada una vez en el análisis (reportes y preview): lado mayor en píxeles
+IMAGE_THUMBNAIL_SIDE = env("IMAGE_THUMBNAIL_SIDE")
+# Auditoría: "buffered" encola en proceso y escribe con bulk_create cada AUDIT_BUFFER_MAX_BATCH eventos
+# o AUDIT_FLUSH_INTERVAL segundos (y al terminar el proceso); "sync" escribe cada evento en la request
+AUDIT_SINK = env("AUDIT_SINK", default="buffered")
+AUDIT_BUFFER_MAX_BATCH = env("AUDIT_BUFFER_MAX_BATCH")
+AUDIT_FLUSH_INTERVAL = env("AUDIT_FLUSH_INTERVAL")
+AUDIT_BUFFER_MAX_PENDING = env("AUDIT_BUFFER_MAX_PENDING")
 SPECTACULAR_SETTINGS = {
     "TITLE": "PixelCheck API",
     "DESCRIPTION": "MVP basado en DDD + Clean Architecture para análisis de imágenes.",
@@ -5,6 +5,7 @@ from shared.application.use_case import UseCase, UseCaseResult
 from shared.domain.exceptions import ValidationError
 
 from iam.domain.repositories import UserRepository
+from iam.infrastructure.authentication import ROLES_CLAIM
 
 
 class RegisterUserUseCase(UseCase):
@@ -23,13 +24,16 @@ class SignInUseCase(UseCase):
         user = authenticate(username=username, password=password)
         if not user:
             raise ValidationError("Credenciales inválidas")
+        roles = sorted(user.role_names)
         access_token = AccessToken.for_user(user)
+        # Los roles viajan en el token: las vistas autorizan sin consultar la tabla de roles
+        access_token[ROLES_CLAIM] = roles
         payload = {
             "access": str(access_token),
             "user": {
                 "id": str(user.id),
                 "username": user.username,
-                "roles": list(user.roles.values_list("name", flat=True)),
+                "roles": roles,
             },
         }
         return UseCaseResult(success=True, data=payload)
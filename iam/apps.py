@@ -5,3 +5,6 @@ class IamConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "iam"
     verbose_name = "Identity & Access Management"
+
+    def ready(self):
+        from iam import signals  # noqa: F401
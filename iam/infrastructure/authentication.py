@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+ROLES_CLAIM = "roles"
+
+
+class RoleClaimJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que toma los roles del claim `roles` emitido por `SignInUseCase`,
+    de modo que `User.has_role` no consulte la base durante el request.
+    Tokens sin el claim siguen funcionando y resuelven los roles con una consulta.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        roles = validated_token.get(ROLES_CLAIM)
+        if roles is not None:
+            user._role_names = frozenset(roles)
+        return user
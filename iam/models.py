@@ -65,8 +65,31 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self) -> str:
         return self.username
 
+    @property
+    def role_names(self) -> frozenset[str]:
+        """
+        Nombres de rol cacheados en la instancia: salen del claim `roles` del JWT, de un
+        `prefetch_related("roles")` o, en último caso, de una única consulta.
+        """
+        names = getattr(self, "_role_names", None)
+        if names is None:
+            prefetched = getattr(self, "_prefetched_objects_cache", {}).get("roles")
+            if prefetched is not None:
+                names = frozenset(role.name for role in prefetched)
+            else:
+                names = frozenset(self.roles.values_list("name", flat=True))
+            self._role_names = names
+        return names
+
+    def invalidate_role_cache(self) -> None:
+        self.__dict__.pop("_role_names", None)
+
+    def refresh_from_db(self, *args, **kwargs):
+        self.invalidate_role_cache()
+        super().refresh_from_db(*args, **kwargs)
+
     def has_role(self, role_name: str) -> bool:
-        return self.roles.filter(name=role_name).exists()
+        return role_name in self.role_names
 
     @property
     def is_professional(self) -> bool:
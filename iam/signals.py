@@ -0,0 +1,11 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from iam.models import User
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_role_cache(sender, instance, **kwargs):
+    # Solo se invalida la instancia modificada; el resto se refresca al volver a cargarse
+    if isinstance(instance, User) and kwargs["action"].startswith("post_"):
+        instance.invalidate_role_cache()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Image, ImageData
+from .models import Image, ImageData, ImageThumbnail
 
 
 @admin.register(Image)
@@ -13,3 +13,17 @@ class ImageAdmin(admin.ModelAdmin):
 @admin.register(ImageData)
 class ImageDataAdmin(admin.ModelAdmin):
     list_display = ("image", "created_at")
+    list_select_related = ("image",)
+
+    def get_queryset(self, request):
+        # El listado no muestra el binario: no se trae una imagen completa por fila
+        return super().get_queryset(request).defer("content")
+
+
+@admin.register(ImageThumbnail)
+class ImageThumbnailAdmin(admin.ModelAdmin):
+    list_display = ("image", "width", "height", "size_bytes", "created_at")
+    list_select_related = ("image",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("content")
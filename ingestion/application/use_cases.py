@@ -1,30 +1,160 @@
-from analysis.tasks import run_analysis_task
+from django.conf import settings
+from django.db import transaction
+
+from analysis.application.dedup import AnalysisDeduplicator
+from analysis.application.use_cases import request_single_report
+from analysis.tasks import run_analysis_batch_task, run_analysis_task
+from iam.domain.value_objects import ROLE_PROFESSIONAL
 from ingestion.domain.repositories import ImageRepository
+from ingestion.infrastructure.thumbnails import THUMBNAIL_MIME_TYPE, get_thumbnail
 from ingestion.models import Image
+from results.domain.repositories import ReportRepository
+from results.models import Report
 from shared.application.use_case import UseCase, UseCaseResult
-from shared.domain.exceptions import ValidationError
-from shared.utils.image import calculate_checksum, ensure_valid_image
+from shared.domain.exceptions import NotFoundError, ValidationError
+from shared.infrastructure.storage import open_blob
+from shared.utils.http import build_etag
+from shared.utils.image import ensure_valid_upload, upload_checksum
+
+
+def _prepare_upload(uploader, uploaded_file, deduplicator: AnalysisDeduplicator | None):
+    """Valida un archivo subido y arma el payload del repositorio (+ resultado reutilizable, si hay)."""
+    # El upload llega por chunks (HashingUploadHandler): se valida leyendo la cabecera del
+    # stream y el checksum ya viene calculado, sin cargar el archivo completo en memoria.
+    width, height = ensure_valid_upload(uploaded_file)
+    checksum = upload_checksum(uploaded_file)
+    # Imagen ya analizada con el mismo modelo/umbral: se reutiliza el resultado sin encolar
+    reusable = deduplicator.find(checksum) if deduplicator and AnalysisDeduplicator.enabled() else None
+    payload = {
+        "uploader": uploader,
+        "filename": uploaded_file.name,
+        "mime_type": uploaded_file.content_type,
+        "size_bytes": uploaded_file.size,
+        "width": width,
+        "height": height,
+        "checksum": checksum,
+        "status": Image.Status.DONE if reusable else Image.Status.QUEUED,
+        "stream": uploaded_file.file,
+    }
+    return payload, reusable
 
 
 class UploadImageUseCase(UseCase):
-    def __init__(self, repository: ImageRepository):
+    def __init__(self, repository: ImageRepository, deduplicator: AnalysisDeduplicator | None = None):
         self.repository = repository
+        self.deduplicator = deduplicator
 
     def execute(self, uploader, uploaded_file):
-        image = ensure_valid_image(uploaded_file)
-        checksum = calculate_checksum(uploaded_file.file)
-        binary_data = uploaded_file.read()
-        payload = {
-            "uploader": uploader,
-            "filename": uploaded_file.name,
-            "mime_type": uploaded_file.content_type,
-            "size_bytes": uploaded_file.size,
-            "width": image.width,
-            "height": image.height,
-            "checksum": checksum,
-            "status": Image.Status.QUEUED,
-            "binary_data": binary_data,
-        }
-        entity = self.repository.create(**payload)
-        run_analysis_task.delay(str(entity.image_id))
+        payload, reusable = _prepare_upload(uploader, uploaded_file, self.deduplicator)
+        # Imagen DONE y resultado clonado se confirman juntos: nunca una imagen DONE sin resultado
+        with transaction.atomic():
+            entity = self.repository.create(**payload)
+            if reusable:
+                self.deduplicator.clone(
+                    reusable, image_id=entity.image_id, owner=uploader, autogenerate_report=False
+                )
+        if reusable:
+            request_single_report(uploader, str(entity.image_id))
+        else:
+            run_analysis_task.delay(str(entity.image_id))
         return UseCaseResult(success=True, data={"imageId": entity.image_id, "status": entity.status})
+
+
+class UploadImageBatchUseCase(UseCase):
+    """
+    Upload múltiple: inserta todas las imágenes válidas con bulk_create, encola una sola tarea
+    de análisis por lote y reserva el reporte BATCH que esa tarea completa al terminar. Como en
+    `request_single_report`, el reporte es solo para ROLE_PROFESSIONAL o staff: al resto no se
+    le reserva y `reportId` es None.
+    """
+
+    def __init__(
+        self,
+        repository: ImageRepository,
+        report_repository: ReportRepository,
+        deduplicator: AnalysisDeduplicator | None = None,
+    ):
+        self.repository = repository
+        self.report_repository = report_repository
+        self.deduplicator = deduplicator
+
+    def execute(self, uploader, uploaded_files, report_format: str = Report.Format.CSV) -> UseCaseResult:
+        if len(uploaded_files) > settings.BATCH_UPLOAD_MAX_FILES:
+            raise ValidationError(f"El lote supera el máximo de {settings.BATCH_UPLOAD_MAX_FILES} imágenes")
+
+        accepted, rejected = [], []
+        for uploaded_file in uploaded_files:
+            try:
+                accepted.append(_prepare_upload(uploader, uploaded_file, self.deduplicator))
+            except ValidationError as exc:
+                rejected.append({"filename": uploaded_file.name, "detail": str(exc)})
+        if not accepted:
+            raise ValidationError("Ninguna imagen del lote es válida")
+
+        with transaction.atomic():
+            entities = self.repository.create_many([payload for payload, _ in accepted])
+            for entity, (_, reusable) in zip(entities, accepted):
+                if reusable:
+                    self.deduplicator.clone(
+                        reusable, image_id=entity.image_id, owner=uploader, autogenerate_report=False
+                    )
+
+            report = None
+            if uploader.has_role(ROLE_PROFESSIONAL) or uploader.is_staff:
+                report = self.report_repository.create_report(
+                    owner=uploader,
+                    scope=Report.Scope.BATCH,
+                    format=report_format,
+                    status=Report.Status.REQUESTED,
+                    image_ids=[entity.image_id for entity in entities],
+                )
+        report_id = str(report.report_id) if report else None
+        run_analysis_batch_task.delay([str(entity.image_id) for entity in entities], report_id)
+        return UseCaseResult(
+            success=True,
+            data={
+                "reportId": report.report_id if report else None,
+                "images": [
+                    {"imageId": entity.image_id, "filename": entity.filename, "status": entity.status}
+                    for entity in entities
+                ],
+                "rejected": rejected,
+            },
+        )
+
+
+class GetImageThumbnailUseCase(UseCase):
+    """Preview de una imagen: sirve la miniatura guardada, nunca el original."""
+
+    def __init__(self, repository: ImageRepository):
+        self.repository = repository
+
+    def describe(self, requester, image_id: str) -> UseCaseResult:
+        """Miniatura y validadores HTTP, sin cargar su binario."""
+        image = self.repository.get(image_id)
+        can_view_all = requester.has_role(ROLE_PROFESSIONAL) or requester.is_staff
+        if image is None or not (can_view_all or str(image.uploader_id) == str(requester.id)):
+            raise NotFoundError("Imagen no encontrada")
+        thumbnail = get_thumbnail(image_id)
+        if thumbnail is None:
+            raise NotFoundError("La imagen no tiene miniatura disponible")
+        return UseCaseResult(
+            success=True,
+            data={
+                "thumbnail": thumbnail,
+                "etag": build_etag(thumbnail.checksum),
+                "last_modified": thumbnail.created_at,
+            },
+        )
+
+    def execute(self, requester, image_id: str, thumbnail=None) -> UseCaseResult:
+        """Abre la miniatura como stream; `thumbnail` reutiliza lo obtenido por `describe`."""
+        thumbnail = thumbnail or self.describe(requester, image_id).data["thumbnail"]
+        return UseCaseResult(
+            success=True,
+            data={
+                "filename": f"{image_id}.jpg",
+                "stream": open_blob(thumbnail),
+                "content_type": THUMBNAIL_MIME_TYPE,
+            },
+        )
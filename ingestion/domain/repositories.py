@@ -8,6 +8,9 @@ class ImageRepository(ABC):
     @abstractmethod
     def create(self, **kwargs) -> ImageEntity: ...
 
+    @abstractmethod
+    def create_many(self, items: list[dict]) -> list[ImageEntity]: ...
+
     @abstractmethod
     def get(self, image_id: str) -> Optional[ImageEntity]: ...
 
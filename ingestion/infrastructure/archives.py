@@ -0,0 +1,63 @@
+import hashlib
+import mimetypes
+import zipfile
+from pathlib import PurePosixPath
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+
+from ingestion.infrastructure.upload_handlers import HashedUploadedFile
+from shared.domain.exceptions import ValidationError
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def _is_hidden(name: str) -> bool:
+    parts = PurePosixPath(name).parts
+    return any(part.startswith(".") or part == "__MACOSX" for part in parts)
+
+
+def extract_archive(archive, max_files: int) -> list[HashedUploadedFile]:
+    """
+    Expande un ZIP en archivos subidos equivalentes a los de un multipart (sha256 incluido).
+
+    Cada miembro se descomprime por chunks a un SpooledTemporaryFile; lo que excede
+    DATA_UPLOAD_MAX_MEMORY_SIZE se cuenta pero no se guarda (protección ante zip bombs).
+    """
+    try:
+        bundle = zipfile.ZipFile(archive.file)
+    except zipfile.BadZipFile as exc:
+        raise ValidationError("Archivo ZIP inválido") from exc
+
+    limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    members = [info for info in bundle.infolist() if not info.is_dir() and not _is_hidden(info.filename)]
+    if len(members) > max_files:
+        raise ValidationError(f"El lote supera el máximo de {max_files} imágenes")
+
+    files = []
+    for info in members:
+        spool = SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE, dir=settings.FILE_UPLOAD_TEMP_DIR
+        )
+        sha256 = hashlib.sha256()
+        size = 0
+        with bundle.open(info) as member:
+            for chunk in iter(lambda: member.read(_CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > limit:
+                    break
+                sha256.update(chunk)
+                spool.write(chunk)
+        spool.seek(0)
+        name = PurePosixPath(info.filename).name
+        files.append(
+            HashedUploadedFile(
+                file=spool,
+                name=name,
+                content_type=mimetypes.guess_type(name)[0],
+                size=size,
+                charset=None,
+                checksum=sha256.hexdigest(),
+            )
+        )
+    return files
@@ -1,8 +1,12 @@
 from typing import Iterable
 
+from django.conf import settings
+from django.db import transaction
+
 from ingestion.domain.entities import ImageEntity
 from ingestion.domain.repositories import ImageRepository
 from ingestion.models import Image, ImageData
+from shared.infrastructure.storage import store_blob
 
 
 def _to_entity(image: Image) -> ImageEntity:
@@ -21,11 +25,29 @@ def _to_entity(image: Image) -> ImageEntity:
 
 class DjangoImageRepository(ImageRepository):
     def create(self, **kwargs) -> ImageEntity:
-        data = kwargs.pop("binary_data")
+        stream = kwargs.pop("stream")
         image = Image.objects.create(**kwargs)
-        ImageData.objects.create(image=image, content=data)
+        # Backend "filesystem": copia por chunks; "database": el BinaryField exige el contenido completo
+        data = ImageData(image=image)
+        store_blob(data, stream, backend=settings.IMAGE_STORAGE, checksum=image.checksum)
+        data.save()
         return _to_entity(image)
 
+    def create_many(self, items: list[dict]) -> list[ImageEntity]:
+        images, blobs = [], []
+        for item in items:
+            fields = dict(item)
+            stream = fields.pop("stream")
+            image = Image(**fields)
+            data = ImageData(image=image)
+            store_blob(data, stream, backend=settings.IMAGE_STORAGE, checksum=image.checksum)
+            images.append(image)
+            blobs.append(data)
+        with transaction.atomic():
+            Image.objects.bulk_create(images)
+            ImageData.objects.bulk_create(blobs)
+        return [_to_entity(image) for image in images]
+
     def get(self, image_id: str) -> ImageEntity | None:
         try:
             image = Image.objects.get(image_id=image_id)
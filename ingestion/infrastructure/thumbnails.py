@@ -0,0 +1,57 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image as PILImage
+
+from ingestion.models import ImageData, ImageThumbnail
+from shared.infrastructure.storage import blob_view, read_blob, store_blob
+from shared.utils.image import thumbnail_jpeg
+
+THUMBNAIL_MIME_TYPE = "image/jpeg"
+
+
+def store_thumbnail(image_id: str, source) -> ImageThumbnail | None:
+    """
+    Genera la miniatura JPEG de la imagen y la guarda (o reemplaza) en IMAGE_STORAGE. `source` son
+    los bytes originales o el `ImagePayload` ya decodificado por el análisis. None si no decodifica.
+    """
+    data = thumbnail_jpeg(source, settings.IMAGE_THUMBNAIL_SIDE)
+    if data is None:
+        return None
+    width, height = PILImage.open(BytesIO(data)).size
+    holder = ImageThumbnail()
+    checksum = hashlib.sha256(data).hexdigest()
+    store_blob(holder, BytesIO(data), backend=settings.IMAGE_STORAGE, checksum=checksum)
+    # Sin leer el binario de una miniatura anterior: se reemplaza
+    thumbnail, _ = ImageThumbnail.objects.defer("content").update_or_create(
+        image_id=image_id,
+        defaults={
+            "content": holder.content,
+            "storage_backend": holder.storage_backend,
+            "storage_key": holder.storage_key,
+            "width": width,
+            "height": height,
+            "size_bytes": len(data),
+            "checksum": checksum,
+        },
+    )
+    return thumbnail
+
+
+def get_thumbnail(image_id: str) -> ImageThumbnail | None:
+    """
+    Miniatura guardada de la imagen. Las que no la tienen (anteriores a esta función o clonadas
+    por deduplicación) la generan una sola vez a partir del original. None si la imagen no existe.
+    """
+    # El binario (backend "database") se carga solo al leerlo: un 304 del preview no lo necesita
+    thumbnail = ImageThumbnail.objects.filter(image_id=image_id).defer("content").first()
+    if thumbnail is not None:
+        return thumbnail
+    data = ImageData.objects.filter(image_id=image_id).defer("content").first()
+    return store_thumbnail(image_id, blob_view(data)) if data else None
+
+
+def read_thumbnail(image_id: str) -> bytes | None:
+    thumbnail = get_thumbnail(image_id)
+    return read_blob(thumbnail) if thumbnail else None
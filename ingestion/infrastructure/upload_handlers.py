@@ -0,0 +1,56 @@
+import hashlib
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class HashedUploadedFile(UploadedFile):
+    """Archivo subido con su sha256 ya calculado durante la recepción."""
+
+    def __init__(self, file, name, content_type, size, charset, content_type_extra=None, checksum=None):
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.checksum = checksum
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Recibe el upload por chunks: calcula el sha256 de forma incremental y vuelca los datos en
+    un SpooledTemporaryFile (en memoria hasta FILE_UPLOAD_MAX_MEMORY_SIZE, luego a disco).
+
+    Los bytes que exceden DATA_UPLOAD_MAX_MEMORY_SIZE se cuentan pero no se guardan; la
+    validación de tamaño del caso de uso rechaza el archivo con el `size` real.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+        self.limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        self.received = 0
+        self.file = SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE, dir=settings.FILE_UPLOAD_TEMP_DIR
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received <= self.limit:
+            self.sha256.update(raw_data)
+            self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        return HashedUploadedFile(
+            file=self.file,
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+            checksum=self.sha256.hexdigest(),
+        )
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self.file.close()
@@ -1,7 +1,9 @@
 from django.urls import path
 
-from .views import UploadImageView
+from .views import ImageThumbnailView, UploadImageBatchView, UploadImageView
 
 urlpatterns = [
     path("upload", UploadImageView.as_view(), name="upload-image"),
+    path("upload/batch", UploadImageBatchView.as_view(), name="upload-image-batch"),
+    path("<uuid:image_id>/thumbnail", ImageThumbnailView.as_view(), name="image-thumbnail"),
 ]
@@ -1,16 +1,25 @@
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import permissions, serializers, status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from ingestion.application.use_cases import UploadImageUseCase
+from analysis.application.dedup import AnalysisDeduplicator
+from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from ingestion.application.use_cases import GetImageThumbnailUseCase, UploadImageBatchUseCase, UploadImageUseCase
+from ingestion.infrastructure.archives import extract_archive
 from ingestion.infrastructure.repositories import DjangoImageRepository
 from ingestion.interface.serializers.upload import (
+    UploadImageBatchResponseSerializer,
+    UploadImageBatchSerializer,
     UploadImageResponseSerializer,
     UploadImageSerializer,
 )
+from results.infrastructure.repositories import DjangoReportRepository
+from shared.utils.http import IMMUTABLE_CACHE_CONTROL, apply_validators, conditional_response, file_response
 
 
 class UploadImageView(APIView):
@@ -50,6 +59,81 @@ class UploadImageView(APIView):
                 uploader.set_unusable_password()
                 uploader.save(update_fields=["password"])
 
-        use_case = UploadImageUseCase(DjangoImageRepository())
+        use_case = UploadImageUseCase(
+            DjangoImageRepository(), AnalysisDeduplicator(DjangoAnalysisResultRepository())
+        )
         result = use_case.execute(uploader=uploader, uploaded_file=image_file)
         return Response(result.data, status=status.HTTP_202_ACCEPTED)
+
+
+class UploadImageBatchView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadImageBatchSerializer
+    parser_classes = (MultiPartParser, FormParser)
+
+    @extend_schema(
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    "images": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                    "archive": {"type": "string", "format": "binary"},
+                    "reportFormat": {"type": "string", "enum": ["CSV", "PDF"], "default": "CSV"},
+                },
+            }
+        },
+        responses={202: UploadImageBatchResponseSerializer},
+        tags=["images"],
+    )
+    def post(self, request):
+        serializer = UploadImageBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        files = list(serializer.validated_data.get("images", []))
+        archive = serializer.validated_data.get("archive")
+        if archive is not None:
+            files.extend(extract_archive(archive, max_files=settings.BATCH_UPLOAD_MAX_FILES))
+
+        use_case = UploadImageBatchUseCase(
+            DjangoImageRepository(),
+            DjangoReportRepository(),
+            AnalysisDeduplicator(DjangoAnalysisResultRepository()),
+        )
+        result = use_case.execute(
+            uploader=request.user,
+            uploaded_files=files,
+            report_format=serializer.validated_data["reportFormat"],
+        )
+        return Response(result.data, status=status.HTTP_202_ACCEPTED)
+
+
+class ImageThumbnailView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(response=OpenApiTypes.BINARY, description="Miniatura JPEG"),
+            304: OpenApiResponse(description="La miniatura no cambió (If-None-Match / If-Modified-Since)"),
+        },
+        tags=["images"],
+    )
+    def get(self, request, image_id):
+        use_case = GetImageThumbnailUseCase(DjangoImageRepository())
+        described = use_case.describe(requester=request.user, image_id=str(image_id)).data
+        etag, last_modified = described["etag"], described["last_modified"]
+        not_modified = conditional_response(request, etag, last_modified, IMMUTABLE_CACHE_CONTROL)
+        if not_modified is not None:
+            return not_modified
+
+        payload = use_case.execute(
+            requester=request.user, image_id=str(image_id), thumbnail=described["thumbnail"]
+        ).data
+        response = file_response(
+            request,
+            payload["stream"],
+            content_type=payload["content_type"],
+            filename=payload["filename"],
+            etag=etag,
+            last_modified=last_modified,
+            as_attachment=False,
+        )
+        return apply_validators(response, etag, last_modified, IMMUTABLE_CACHE_CONTROL)
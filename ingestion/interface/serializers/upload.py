@@ -1,10 +1,43 @@
 from rest_framework import serializers
 
+from results.models import Report
+
 
 class UploadImageSerializer(serializers.Serializer):
-    image = serializers.ImageField(use_url=False)
+    # FileField (no ImageField) para no decodificar con PIL en el hilo del request;
+    # la validación de imagen vive en `shared.utils.image`.
+    image = serializers.FileField(use_url=False)
 
 
 class UploadImageResponseSerializer(serializers.Serializer):
     imageId = serializers.UUIDField()
     status = serializers.CharField()
+
+
+class UploadImageBatchSerializer(serializers.Serializer):
+    images = serializers.ListField(child=serializers.FileField(use_url=False), required=False)
+    archive = serializers.FileField(use_url=False, required=False)
+    reportFormat = serializers.ChoiceField(choices=Report.Format.choices, default=Report.Format.CSV)
+
+    def validate(self, attrs):
+        if not attrs.get("images") and not attrs.get("archive"):
+            raise serializers.ValidationError("Envía al menos una imagen en `images` o un ZIP en `archive`.")
+        return attrs
+
+
+class UploadedImageSerializer(serializers.Serializer):
+    imageId = serializers.UUIDField()
+    filename = serializers.CharField()
+    status = serializers.CharField()
+
+
+class RejectedImageSerializer(serializers.Serializer):
+    filename = serializers.CharField()
+    detail = serializers.CharField()
+
+
+class UploadImageBatchResponseSerializer(serializers.Serializer):
+    # None si el usuario no es ROLE_PROFESSIONAL ni staff: no se genera reporte BATCH
+    reportId = serializers.UUIDField(allow_null=True)
+    images = UploadedImageSerializer(many=True)
+    rejected = RejectedImageSerializer(many=True)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingestion', '0003_imagedata_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageThumbnail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.BinaryField(blank=True, null=True)),
+                ('storage_backend', models.CharField(default='database', max_length=16)),
+                ('storage_key', models.CharField(blank=True, max_length=64)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('size_bytes', models.PositiveIntegerField()),
+                ('checksum', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('image', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='thumbnail', to='ingestion.image')),
+            ],
+        ),
+    ]
@@ -33,5 +33,22 @@ class Image(models.Model):
 
 class ImageData(models.Model):
     image = models.OneToOneField(Image, on_delete=models.CASCADE, related_name="data")
-    content = models.BinaryField()
+    # Ver shared.infrastructure.storage: `content` solo se usa con el backend "database"
+    content = models.BinaryField(null=True, blank=True)
+    storage_backend = models.CharField(max_length=16, default="database")
+    storage_key = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class ImageThumbnail(models.Model):
+    """Miniatura JPEG (lado mayor IMAGE_THUMBNAIL_SIDE) generada una vez; la usan reportes y preview."""
+
+    image = models.OneToOneField(Image, on_delete=models.CASCADE, related_name="thumbnail")
+    content = models.BinaryField(null=True, blank=True)
+    storage_backend = models.CharField(max_length=16, default="database")
+    storage_key = models.CharField(max_length=64, blank=True)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size_bytes = models.PositiveIntegerField()
+    checksum = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
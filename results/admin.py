@@ -8,3 +8,7 @@ class ReportAdmin(admin.ModelAdmin):
     list_display = ("report_id", "owner", "format", "status", "created_at")
     list_filter = ("format", "status")
     search_fields = ("report_id", "owner__email")
+    list_select_related = ("owner",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("content")
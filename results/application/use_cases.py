@@ -1,13 +1,23 @@
+import tempfile
+import time
+from itertools import chain
+
+from django.conf import settings
 from django.utils import timezone
 
 from analysis.models import AnalysisResult
 from iam.domain.value_objects import ROLE_PROFESSIONAL
+from results.domain.entities import ReportEntity
 from results.domain.repositories import ReportRepository, ResultsQueryRepository
 from results.models import Report
 from shared.application.use_case import UseCase, UseCaseResult
-from shared.domain.exceptions import NotFoundError, PermissionError
-from shared.utils.reporting import build_analysis_pdf, build_csv
-from ingestion.models import Image, ImageData
+from shared.domain.exceptions import NotFoundError, PermissionError, ValidationError
+from shared.infrastructure.notifications import Notifier, image_channel
+from shared.utils.http import build_etag
+from shared.utils.image import thumbnail_jpeg
+from shared.utils.reporting import BatchReportRow, build_analysis_pdf, build_csv, iter_csv, write_batch_pdf, write_csv
+from ingestion.infrastructure.thumbnails import read_thumbnail
+from ingestion.models import Image
 
 
 def _can_view_all(user) -> bool:
@@ -16,41 +26,155 @@ def _can_view_all(user) -> bool:
     return user.has_role(ROLE_PROFESSIONAL) or user.is_staff
 
 
+def _report_filename(image_id: str, report_format: str) -> str:
+    timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
+    return f"pixelcheck-{image_id}-{timestamp}.{report_format.lower()}"
+
+
+RESULT_CSV_HEADERS = ["imageId", "label", "confidence", "modelVersion", "conclusion"]
+BATCH_CSV_HEADERS = RESULT_CSV_HEADERS + ["status"]
+UNRESOLVED_CONCLUSIONS = {Image.Status.REJECTED: "Archivo no es una imagen válida"}
+# Reportes BATCH: se escriben por partes a un temporal (en memoria hasta este tamaño, luego a disco)
+REPORT_SPOOL_MAX_MEMORY = 4 * 1024 * 1024
+BATCH_THUMBNAIL_SIDE = 96
+
+
+def _csv_row(result) -> list[str]:
+    return [
+        result.image_id,
+        result.label,
+        f"{result.confidence:.2f}",
+        result.model_version,
+        (result.details or {}).get("conclusion", "N/A"),
+    ]
+
+
+def _batch_row(result) -> BatchReportRow:
+    return BatchReportRow(
+        image_id=result.image_id,
+        label=result.label,
+        confidence=result.confidence,
+        model_version=result.model_version,
+        conclusion=(result.details or {}).get("conclusion", "N/A"),
+    )
+
+
+def _unresolved_row(image_id: str, status: str) -> BatchReportRow:
+    return BatchReportRow(
+        image_id=image_id,
+        label="N/A",
+        confidence=None,
+        model_version="N/A",
+        conclusion=UNRESOLVED_CONCLUSIONS.get(status, "Sin resultado"),
+        status=status,
+    )
+
+
+def _batch_csv_row(row: BatchReportRow) -> list[str]:
+    confidence = "" if row.confidence is None else f"{row.confidence:.2f}"
+    return [row.image_id, row.label, confidence, row.model_version, row.conclusion, row.status]
+
+
+def _image_thumbnail(image_id: str, side: int | None = None) -> bytes | None:
+    """
+    Miniatura guardada de la imagen para embeber en reportes (nunca el original). Con `side` menor
+    que IMAGE_THUMBNAIL_SIDE se reduce a partir de esa miniatura, no del original.
+    """
+    data = read_thumbnail(image_id)
+    if data is None or side is None or side >= settings.IMAGE_THUMBNAIL_SIDE:
+        return data
+    return thumbnail_jpeg(data, side)
+
+
+EXPAND_MODEL = "model"
+
+
 class GetResultUseCase(UseCase):
-    def __init__(self, repository: ResultsQueryRepository):
+    def __init__(self, repository: ResultsQueryRepository, report_repo: ReportRepository):
         self.repository = repository
+        self.report_repo = report_repo
 
-    def execute(self, requester, image_id: str) -> UseCaseResult:
+    def execute(self, requester, image_id: str, expand: frozenset[str] = frozenset()) -> UseCaseResult:
         can_view = _can_view_all(requester)
         owner_id = str(requester.id) if getattr(requester, "is_authenticated", False) else None
         entity = self.repository.get_by_image(image_id=image_id, owner_id=owner_id, can_view_all=can_view)
         if not entity:
             raise NotFoundError("Resultado no disponible (en proceso o no existe)")
 
-        include_report = getattr(requester, "is_authenticated", False) and (
-            requester.has_role(ROLE_PROFESSIONAL) or requester.is_staff
-        )
+        include_report = can_view and getattr(requester, "is_authenticated", False)
+        report = None
+        if include_report:
+            report = self.report_repo.latest_for_image(image_id=entity.image_id, owner_id=str(requester.id))
+
+        # Un re-análisis actualiza el resultado en su lugar (`updated_at`); el reporte cambia de estado
+        report_version = (report.report_id, report.status) if report else (None, None)
+        modified = [entity.updated_at] + ([report.created_at, report.completed_at] if report else [])
+        payload = {
+            "imageId": entity.image_id,
+            "label": entity.label,
+            "confidence": entity.confidence,
+            "modelVersion": entity.model_version,
+            "details": entity.details,
+            "reportId": report.report_id if report else None,
+            "reportStatus": report.status if report else None,
+        }
+        # La metadata del modelo se guarda una vez por versión y solo se incluye con ?expand=model
+        if EXPAND_MODEL in expand:
+            payload["model"] = {
+                "version": entity.model_version,
+                "metadata": self.repository.get_model_metadata(entity.model_version) or {},
+            }
         return UseCaseResult(
             success=True,
             data={
-                "imageId": entity.image_id,
-                "label": entity.label,
-                "confidence": entity.confidence,
-                "modelVersion": entity.model_version,
-                "details": entity.details,
-                "reportId": self._find_report_for_image(entity.image_id, requester) if include_report else None,
+                "etag": build_etag(entity.result_id, entity.updated_at, *report_version, *sorted(expand)),
+                "last_modified": max(value for value in modified if value is not None),
+                "result": payload,
             },
         )
 
-    def _find_report_for_image(self, image_id: str, requester):
-        # Busca reportes ya generados para este image_id
-        report = Report.objects.filter(filename__contains=image_id, owner=requester).order_by("-created_at").first()
-        if report:
-            return str(report.report_id)
-        return None
+
+class WaitForResultUseCase(UseCase):
+    """
+    Long-poll del resultado: mantiene el request hasta que el análisis termina (evento publicado
+    por el worker) o vence `timeout`, en lugar de que el cliente consulte la base en bucle.
+    """
+
+    def __init__(self, repository: ResultsQueryRepository, report_repo: ReportRepository, notifier: Notifier):
+        self.repository = repository
+        self.report_repo = report_repo
+        self.notifier = notifier
+
+    def execute(
+        self, requester, image_id: str, timeout: float, expand: frozenset[str] = frozenset()
+    ) -> UseCaseResult:
+        can_view = _can_view_all(requester)
+        owner_id = str(requester.id) if getattr(requester, "is_authenticated", False) else None
+        deadline = time.monotonic() + min(max(timeout, 0.0), settings.RESULT_WAIT_MAX_TIMEOUT)
+
+        # Suscripción antes de leer el estado: un aviso entre la lectura y la espera no se pierde
+        with self.notifier.subscribe(image_channel(image_id)) as subscription:
+            while True:
+                status = self.repository.get_image_status(image_id, owner_id=owner_id, can_view_all=can_view)
+                if status is None:
+                    raise NotFoundError("Imagen no encontrada")
+                if status == Image.Status.REJECTED:
+                    raise ValidationError("La imagen fue rechazada: no es una imagen válida")
+                if status == Image.Status.DONE:
+                    use_case = GetResultUseCase(self.repository, self.report_repo)
+                    return use_case.execute(requester, image_id, expand=expand)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return UseCaseResult(success=False, data={"imageId": image_id, "status": status})
+                subscription.wait(remaining)
 
 
 class CreateReportUseCase(UseCase):
+    """
+    Reserva un reporte SINGLE en estado GENERATING. El render (PDF/CSV) lo hace
+    `GenerateReportUseCase` en la cola `reports`, fuera del camino crítico del análisis.
+    """
+
     def __init__(self, results_repo: ResultsQueryRepository, report_repo: ReportRepository):
         self.results_repo = results_repo
         self.report_repo = report_repo
@@ -69,28 +193,45 @@ class CreateReportUseCase(UseCase):
             scope=Report.Scope.SINGLE,
             format=report_format,
             status=Report.Status.GENERATING,
+            image_id=image_id,
+            filename=_report_filename(image_id, report_format),
         )
+        return UseCaseResult(success=True, data={"reportId": report.report_id})
+
+
+class GenerateReportUseCase(UseCase):
+    """Renderiza un reporte SINGLE reservado por `CreateReportUseCase` y lo deja READY (o FAILED)."""
+
+    def __init__(self, results_repo: ResultsQueryRepository, report_repo: ReportRepository):
+        self.results_repo = results_repo
+        self.report_repo = report_repo
+
+    def execute(self, report_id: str, image_id: str) -> UseCaseResult:
+        report = self.report_repo.get_report(report_id=report_id, owner_id=None, can_view_all=True)
+        if not report:
+            raise NotFoundError("Reporte no encontrado")
+        try:
+            result = self.results_repo.get_by_image(image_id=image_id, owner_id=None, can_view_all=True)
+            if not result:
+                raise NotFoundError("Resultado no encontrado")
+            content, mime = self._build_content(result, report.format, image_id)
+        except Exception:
+            self.report_repo.update_report(
+                report_id=report_id, status=Report.Status.FAILED, completed_at=timezone.now()
+            )
+            raise
 
-        content, mime, filename = self._build_content(result, report_format, image_id)
         self.report_repo.update_report(
-            report_id=report.report_id,
+            report_id=report_id,
             status=Report.Status.READY,
-            filename=filename,
+            filename=report.filename or _report_filename(image_id, report.format),
             content=content,
             content_mime=mime,
+            completed_at=timezone.now(),
         )
-        return UseCaseResult(success=True, data={"reportId": report.report_id})
+        return UseCaseResult(success=True, data={"reportId": report_id})
 
     def _build_content(self, result, report_format, image_id):
-        timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
-        # Try to fetch image bytes for embedding
-        image_bytes = None
-        try:
-            image_instance = Image.objects.select_related("data").get(image_id=image_id)
-            image_bytes = bytes(image_instance.data.content) if hasattr(image_instance, "data") else None
-        except Image.DoesNotExist:
-            pass
-
         conclusion = (result.details or {}).get("conclusion", "N/A")
         recommendation = (
             "La imagen parece auténtica. Continúa con inspección visual si es crítico."
@@ -113,42 +254,114 @@ class CreateReportUseCase(UseCase):
                 features=features,
                 observations=observations,
                 recommendation=recommendation,
-                image_bytes=image_bytes,
+                image_bytes=_image_thumbnail(image_id),
+            )
+            return content, "application/pdf"
+        content = build_csv(RESULT_CSV_HEADERS, [_csv_row(result)])
+        return content, "text/csv"
+
+
+class CreateBatchReportUseCase(UseCase):
+    """
+    Reporte BATCH con una fila por imagen de un upload múltiple (las que quedaron sin resultado,
+    p. ej. REJECTED, con su estado): CSV o PDF paginado con miniaturas. Los resultados se leen con
+    un cursor por partes y el archivo se escribe a un temporal antes de pasar al storage.
+    """
+
+    def __init__(self, results_repo: ResultsQueryRepository, report_repo: ReportRepository):
+        self.results_repo = results_repo
+        self.report_repo = report_repo
+
+    def execute(self, report_id: str, image_ids: list[str]) -> UseCaseResult:
+        report = self.report_repo.update_report(report_id=report_id, status=Report.Status.GENERATING)
+        timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_MEMORY) as spool:
+                results = self.results_repo.list_by_images(image_ids)
+                unresolved = self.results_repo.list_unresolved_images(image_ids)
+                rows = chain(
+                    (_batch_row(result) for result in results),
+                    (_unresolved_row(image_id, status) for image_id, status in unresolved),
+                )
+                if report.format == Report.Format.PDF:
+                    write_batch_pdf(
+                        spool,
+                        title=f"PixelCheck Batch Report {report_id}",
+                        rows=rows,
+                        thumbnail=lambda image_id: _image_thumbnail(image_id, BATCH_THUMBNAIL_SIDE),
+                    )
+                    mime = "application/pdf"
+                else:
+                    write_csv(spool, BATCH_CSV_HEADERS, (_batch_csv_row(row) for row in rows))
+                    mime = "text/csv"
+                spool.seek(0)
+                self.report_repo.update_report(
+                    report_id=report_id,
+                    status=Report.Status.READY,
+                    filename=f"pixelcheck-batch-{report_id}-{timestamp}.{report.format.lower()}",
+                    content=spool,
+                    content_mime=mime,
+                    completed_at=timezone.now(),
+                )
+        except Exception:
+            self.report_repo.update_report(
+                report_id=report_id, status=Report.Status.FAILED, completed_at=timezone.now()
             )
-            return content, "application/pdf", f"pixelcheck-{image_id}-{timestamp}.pdf"
-        headers = ["imageId", "label", "confidence", "modelVersion", "conclusion"]
-        rows = [
-            [
-                image_id,
-                result.label,
-                f"{result.confidence:.2f}",
-                result.model_version,
-                conclusion,
-            ]
-        ]
-        content = build_csv(headers, rows)
-        return content, "text/csv", f"pixelcheck-{image_id}-{timestamp}.csv"
+            raise
+        return UseCaseResult(success=True, data={"reportId": report_id})
 
 
 class GetReportFileUseCase(UseCase):
     def __init__(self, report_repo: ReportRepository):
         self.report_repo = report_repo
 
-    def execute(self, requester, report_id: str) -> UseCaseResult:
+    def describe(self, requester, report_id: str) -> UseCaseResult:
+        """Metadatos y validadores HTTP del reporte, sin cargar su binario."""
         can_view = _can_view_all(requester)
         report = self.report_repo.get_report(
             report_id=report_id, owner_id=str(requester.id), can_view_all=can_view
         )
         if not report:
             raise NotFoundError("Reporte no encontrado")
-        instance = Report.objects.get(report_id=report.report_id)
-        if instance.status != Report.Status.READY:
+        if report.status != Report.Status.READY:
             raise NotFoundError("Reporte aún no está listo")
         return UseCaseResult(
             success=True,
             data={
-                "filename": instance.filename,
-                "content": bytes(instance.content),
-                "content_type": instance.content_mime,
+                "report": report,
+                "etag": build_etag(report.checksum or f"{report.report_id}:{report.completed_at}"),
+                "last_modified": report.completed_at or report.created_at,
+            },
+        )
+
+    def execute(self, requester, report_id: str, report: ReportEntity | None = None) -> UseCaseResult:
+        """
+        Abre el reporte como stream; quien lo consume debe cerrarlo. `report` permite reutilizar
+        lo ya obtenido por `describe` (chequeo de permisos incluido) y evitar otra consulta.
+        """
+        report = report or self.describe(requester, report_id).data["report"]
+        return UseCaseResult(
+            success=True,
+            data={
+                "filename": report.filename,
+                "stream": self.report_repo.open_report(report),
+                "content_type": report.content_mime,
+            },
+        )
+
+
+class ExportResultsUseCase(UseCase):
+    """Exporta todos los resultados del solicitante como CSV generado por partes (streaming)."""
+
+    def __init__(self, results_repo: ResultsQueryRepository):
+        self.results_repo = results_repo
+
+    def execute(self, requester) -> UseCaseResult:
+        rows = (_csv_row(result) for result in self.results_repo.iter_by_owner(str(requester.id)))
+        return UseCaseResult(
+            success=True,
+            data={
+                "filename": f"pixelcheck-results-{timezone.now().strftime('%Y%m%d%H%M%S')}.csv",
+                "chunks": iter_csv(RESULT_CSV_HEADERS, rows),
             },
         )
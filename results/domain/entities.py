@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 
 @dataclass
@@ -8,6 +9,10 @@ class ResultEntity:
     confidence: float
     model_version: str
     details: dict | None = None
+    result_id: str | None = None
+    owner_id: str | None = None
+    processed_at: datetime | None = None
+    updated_at: datetime | None = None
 
 
 @dataclass
@@ -17,3 +22,9 @@ class ReportEntity:
     format: str
     status: str
     filename: str | None = None
+    checksum: str | None = None
+    created_at: datetime | None = None
+    completed_at: datetime | None = None
+    content_mime: str | None = None
+    storage_backend: str | None = None
+    storage_key: str | None = None
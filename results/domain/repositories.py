@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from typing import BinaryIO, Iterable, Iterator, Optional
 
 from .entities import ReportEntity, ResultEntity
 
@@ -8,6 +8,23 @@ class ResultsQueryRepository(ABC):
     @abstractmethod
     def get_by_image(self, image_id: str, owner_id: str, can_view_all: bool) -> Optional[ResultEntity]: ...
 
+    @abstractmethod
+    def list_by_images(self, image_ids: Iterable[str]) -> Iterable[ResultEntity]: ...
+
+    @abstractmethod
+    def iter_by_owner(self, owner_id: str | None) -> Iterator[ResultEntity]:
+        """Todos los resultados del owner (o de todos si es None), leídos por partes."""
+
+    @abstractmethod
+    def get_model_metadata(self, version: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    def get_image_status(self, image_id: str, owner_id: str, can_view_all: bool) -> Optional[str]: ...
+
+    @abstractmethod
+    def list_unresolved_images(self, image_ids: Iterable[str]) -> Iterable[tuple[str, str]]:
+        """(image_id, estado) de las imágenes sin resultado, p. ej. REJECTED por no decodificar."""
+
 
 class ReportRepository(ABC):
     @abstractmethod
@@ -18,3 +35,10 @@ class ReportRepository(ABC):
 
     @abstractmethod
     def get_report(self, report_id: str, owner_id: str, can_view_all: bool) -> Optional[ReportEntity]: ...
+
+    @abstractmethod
+    def latest_for_image(self, image_id: str, owner_id: str) -> Optional[ReportEntity]: ...
+
+    @abstractmethod
+    def open_report(self, report: ReportEntity) -> BinaryIO:
+        """Abre el binario del reporte como stream (sin copiarlo entero a memoria si el backend lo permite)."""
@@ -0,0 +1,101 @@
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from results.domain.entities import ResultEntity
+from results.domain.repositories import ResultsQueryRepository
+from results.infrastructure.repositories import DjangoResultsQueryRepository
+
+LOCAL_CACHE_ALIAS = "results_local"
+SHARED_CACHE_ALIAS = "results"
+
+
+def _key(image_id: str) -> str:
+    # v2: la entidad incluye `updated_at`; las entradas anteriores no se reutilizan
+    return f"pixelcheck:result:v2:{image_id}"
+
+
+def _model_key(version: str) -> str:
+    return f"pixelcheck:model:{version}"
+
+
+def _tiers():
+    """(cache, timeout) en orden de consulta: LRU en proceso y, si está configurado, Redis."""
+    tiers = [(caches[LOCAL_CACHE_ALIAS], settings.RESULT_CACHE_LOCAL_TIMEOUT)]
+    if SHARED_CACHE_ALIAS in settings.CACHES:
+        tiers.append((caches[SHARED_CACHE_ALIAS], settings.RESULT_CACHE_TIMEOUT))
+    return tiers
+
+
+def invalidate_result(image_id: str) -> None:
+    # El tier local de otros procesos no se entera: su TTL corto acota cuánto puede quedar obsoleto
+    for cache, _ in _tiers():
+        cache.delete(_key(image_id))
+
+
+class CachedResultsQueryRepository(ResultsQueryRepository):
+    """
+    Read-through sobre otro `ResultsQueryRepository` para `get_by_image`.
+
+    Los resultados no cambian una vez escritos (salvo re-análisis, que invalida la clave), así que
+    se cachea la entidad completa por image_id y el filtro por owner se aplica sobre la entidad.
+    Las ausencias no se cachean: la imagen puede estar todavía en proceso.
+    """
+
+    def __init__(self, inner: ResultsQueryRepository):
+        self.inner = inner
+
+    def get_by_image(self, image_id: str, owner_id: str, can_view_all: bool) -> Optional[ResultEntity]:
+        entity = self._cached(_key(image_id))
+        if entity is None:
+            entity = self.inner.get_by_image(image_id=image_id, owner_id=None, can_view_all=True)
+            if entity is None:
+                return None
+            self._store(_key(image_id), entity)
+        if not can_view_all and entity.owner_id != owner_id:
+            return None
+        return entity
+
+    def list_by_images(self, image_ids: Iterable[str]) -> Iterable[ResultEntity]:
+        return self.inner.list_by_images(image_ids)
+
+    def iter_by_owner(self, owner_id: str | None) -> Iterator[ResultEntity]:
+        return self.inner.iter_by_owner(owner_id)
+
+    def get_model_metadata(self, version: str) -> Optional[dict]:
+        # La metadata de una versión publicada no cambia
+        metadata = self._cached(_model_key(version))
+        if metadata is None:
+            metadata = self.inner.get_model_metadata(version)
+            if metadata is not None:
+                self._store(_model_key(version), metadata)
+        return metadata
+
+    def get_image_status(self, image_id: str, owner_id: str, can_view_all: bool) -> Optional[str]:
+        return self.inner.get_image_status(image_id=image_id, owner_id=owner_id, can_view_all=can_view_all)
+
+    def list_unresolved_images(self, image_ids: Iterable[str]) -> Iterable[tuple[str, str]]:
+        return self.inner.list_unresolved_images(image_ids)
+
+    @staticmethod
+    def _cached(key: str):
+        tiers = _tiers()
+        for index, (cache, _) in enumerate(tiers):
+            value = cache.get(key)
+            if value is not None:
+                # Promueve a los tiers más cercanos que no lo tenían
+                for upper, timeout in tiers[:index]:
+                    upper.set(key, value, timeout)
+                return value
+        return None
+
+    @staticmethod
+    def _store(key: str, value) -> None:
+        for cache, timeout in _tiers():
+            cache.set(key, value, timeout)
+
+
+def results_query_repository() -> ResultsQueryRepository:
+    repository = DjangoResultsQueryRepository()
+    return CachedResultsQueryRepository(repository) if settings.RESULT_CACHE_ENABLED else repository
@@ -1,10 +1,32 @@
-from typing import Optional
+from io import BytesIO
+from typing import BinaryIO, Iterable, Iterator, Optional
 
-from analysis.models import AnalysisResult
+from django.conf import settings
+
+from analysis.models import AnalysisResult, ModelVersion
 from ingestion.models import Image
 from results.domain.entities import ReportEntity, ResultEntity
 from results.domain.repositories import ReportRepository, ResultsQueryRepository
 from results.models import Report
+from shared.infrastructure.storage import STORAGE_DATABASE, open_blob, store_blob
+from shared.utils.image import calculate_checksum
+
+# Filas por viaje del cursor del servidor en exportaciones y reportes BATCH
+ITERATOR_CHUNK_SIZE = 2000
+
+
+# Columnas que usa `ResultEntity`: sin JOINs a imagen/usuario ni `threshold`
+RESULT_ENTITY_FIELDS = (
+    "result_id",
+    "image_id",
+    "owner_id",
+    "label",
+    "confidence",
+    "model_version",
+    "details",
+    "processed_at",
+    "updated_at",
+)
 
 
 def _result_entity(instance: AnalysisResult) -> ResultEntity:
@@ -14,6 +36,10 @@ def _result_entity(instance: AnalysisResult) -> ResultEntity:
         confidence=float(instance.confidence),
         model_version=instance.model_version,
         details=instance.details or {},
+        result_id=str(instance.result_id),
+        owner_id=str(instance.owner_id),
+        processed_at=instance.processed_at,
+        updated_at=instance.updated_at,
     )
 
 
@@ -24,12 +50,18 @@ def _report_entity(instance: Report) -> ReportEntity:
         format=instance.format,
         status=instance.status,
         filename=instance.filename,
+        checksum=instance.checksum,
+        created_at=instance.created_at,
+        completed_at=instance.completed_at,
+        content_mime=instance.content_mime,
+        storage_backend=instance.storage_backend,
+        storage_key=instance.storage_key,
     )
 
 
 class DjangoResultsQueryRepository(ResultsQueryRepository):
     def get_by_image(self, image_id: str, owner_id: str, can_view_all: bool) -> Optional[ResultEntity]:
-        qs = AnalysisResult.objects.select_related("image", "owner")
+        qs = AnalysisResult.objects.only(*RESULT_ENTITY_FIELDS)
         if not can_view_all:
             qs = qs.filter(owner_id=owner_id)
         try:
@@ -38,21 +70,66 @@ class DjangoResultsQueryRepository(ResultsQueryRepository):
             return None
         return _result_entity(result)
 
+    def list_by_images(self, image_ids: Iterable[str]) -> Iterable[ResultEntity]:
+        results = (
+            AnalysisResult.objects.filter(image_id__in=list(image_ids))
+            .only(*RESULT_ENTITY_FIELDS)
+            .order_by("processed_at")
+        )
+        for result in results.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            yield _result_entity(result)
+
+    def iter_by_owner(self, owner_id: str | None) -> Iterator[ResultEntity]:
+        results = AnalysisResult.objects.only(*RESULT_ENTITY_FIELDS).order_by("processed_at")
+        if owner_id is not None:
+            results = results.filter(owner_id=owner_id)
+        # Cursor del lado del servidor: nunca se materializa el queryset completo
+        for result in results.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            yield _result_entity(result)
+
+    def get_model_metadata(self, version: str) -> Optional[dict]:
+        return ModelVersion.objects.filter(version=version).values_list("metadata", flat=True).first()
+
+    def get_image_status(self, image_id: str, owner_id: str, can_view_all: bool) -> Optional[str]:
+        qs = Image.objects.filter(image_id=image_id)
+        if not can_view_all:
+            qs = qs.filter(uploader_id=owner_id)
+        return qs.values_list("status", flat=True).first()
+
+    def list_unresolved_images(self, image_ids: Iterable[str]) -> Iterable[tuple[str, str]]:
+        images = (
+            Image.objects.filter(image_id__in=list(image_ids), analysis_result__isnull=True)
+            .order_by("created_at")
+            .values_list("image_id", "status")
+        )
+        return [(str(image_id), status) for image_id, status in images]
+
 
 class DjangoReportRepository(ReportRepository):
     def create_report(self, **kwargs) -> ReportEntity:
+        image_ids = kwargs.pop("image_ids", None)
         report = Report.objects.create(**kwargs)
+        if image_ids:
+            report.images.add(*image_ids)
         return _report_entity(report)
 
     def update_report(self, report_id: str, **kwargs) -> ReportEntity:
-        report = Report.objects.get(report_id=report_id)
+        # El binario anterior no se lee: si hay contenido nuevo se reemplaza sin cargar el previo
+        report = Report.objects.defer("content").get(report_id=report_id)
+        # `content` admite bytes o un archivo binario (p. ej. un temporal escrito por partes)
+        content = kwargs.pop("content", None)
         for field, value in kwargs.items():
             setattr(report, field, value)
+        if content is not None:
+            stream = BytesIO(content) if isinstance(content, (bytes, bytearray, memoryview)) else content
+            report.checksum = calculate_checksum(stream)
+            store_blob(report, stream, backend=settings.REPORT_STORAGE, checksum=report.checksum)
         report.save()
         return _report_entity(report)
 
     def get_report(self, report_id: str, owner_id: str, can_view_all: bool) -> Optional[ReportEntity]:
-        qs = Report.objects.all()
+        # Sin el binario: alcanza para permisos, estado y validadores HTTP (ETag / Last-Modified)
+        qs = Report.objects.defer("content")
         if not can_view_all:
             qs = qs.filter(owner_id=owner_id)
         try:
@@ -60,3 +137,22 @@ class DjangoReportRepository(ReportRepository):
         except Report.DoesNotExist:
             return None
         return _report_entity(report)
+
+    def latest_for_image(self, image_id: str, owner_id: str) -> Optional[ReportEntity]:
+        # Usa el índice (image, owner, -created_at)
+        report = (
+            Report.objects.filter(image_id=image_id, owner_id=owner_id)
+            .defer("content")
+            .order_by("-created_at")
+            .first()
+        )
+        return _report_entity(report) if report else None
+
+    def open_report(self, report: ReportEntity) -> BinaryIO:
+        holder = Report(
+            report_id=report.report_id, storage_backend=report.storage_backend, storage_key=report.storage_key
+        )
+        if report.storage_backend == STORAGE_DATABASE:
+            # La columna diferida se lee solo acá, y solo si el binario vive en la base
+            holder.content = Report.objects.values_list("content", flat=True).get(report_id=report.report_id)
+        return open_blob(holder)
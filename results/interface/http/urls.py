@@ -1,7 +1,9 @@
 from django.urls import path
 
-from .views import ResultDetailView
+from .views import ResultDetailView, ResultExportView, ResultWaitView
 
 urlpatterns = [
+    path("export", ResultExportView.as_view(), name="results-export"),
     path("<uuid:image_id>", ResultDetailView.as_view(), name="result-detail"),
+    path("<uuid:image_id>/wait", ResultWaitView.as_view(), name="result-wait"),
 ]
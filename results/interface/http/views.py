@@ -1,11 +1,23 @@
-from drf_spectacular.utils import extend_schema
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from results.application.use_cases import GetResultUseCase
-from results.infrastructure.repositories import DjangoResultsQueryRepository
-from results.interface.serializers.result_serializers import ImageResultSerializer
+from results.application.use_cases import ExportResultsUseCase, GetResultUseCase, WaitForResultUseCase
+from results.infrastructure.cache import results_query_repository
+from results.infrastructure.repositories import DjangoReportRepository, DjangoResultsQueryRepository
+from results.interface.serializers.result_serializers import (
+    ImageResultSerializer,
+    PendingResultSerializer,
+    ResultQuerySerializer,
+    ResultWaitQuerySerializer,
+)
+from shared.infrastructure.notifications import get_notifier
+from shared.utils.http import REVALIDATE_CACHE_CONTROL, apply_validators, conditional_response
 
 
 class ResultDetailView(APIView):
@@ -14,10 +26,65 @@ class ResultDetailView(APIView):
     serializer_class = ImageResultSerializer
 
     @extend_schema(
-        responses={200: ImageResultSerializer},
+        parameters=[ResultQuerySerializer],
+        responses={200: ImageResultSerializer, 304: None},
         tags=["results"],
     )
     def get(self, request, image_id):
-        use_case = GetResultUseCase(DjangoResultsQueryRepository())
-        result = use_case.execute(requester=request.user, image_id=str(image_id))
-        return Response(result.data, status=status.HTTP_200_OK)
+        query = ResultQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        use_case = GetResultUseCase(results_query_repository(), DjangoReportRepository())
+        result = use_case.execute(
+            requester=request.user, image_id=str(image_id), expand=query.validated_data.get("expand", frozenset())
+        )
+        etag, last_modified = result.data["etag"], result.data["last_modified"]
+        # Clientes que hacen polling reciben 304 mientras nada cambie
+        not_modified = conditional_response(request, etag, last_modified, REVALIDATE_CACHE_CONTROL)
+        if not_modified is not None:
+            return not_modified
+        response = Response(result.data["result"], status=status.HTTP_200_OK)
+        return apply_validators(response, etag, last_modified, REVALIDATE_CACHE_CONTROL)
+
+
+class ResultWaitView(APIView):
+    """Long-poll: responde cuando el análisis termina o, al vencer el timeout, con 202 y el estado actual."""
+
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(
+        parameters=[ResultWaitQuerySerializer],
+        responses={200: ImageResultSerializer, 202: PendingResultSerializer},
+        tags=["results"],
+    )
+    def get(self, request, image_id):
+        query = ResultWaitQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        use_case = WaitForResultUseCase(results_query_repository(), DjangoReportRepository(), get_notifier())
+        result = use_case.execute(
+            requester=request.user,
+            image_id=str(image_id),
+            timeout=query.validated_data.get("timeout", settings.RESULT_WAIT_MAX_TIMEOUT),
+            expand=query.validated_data.get("expand", frozenset()),
+        )
+        if not result.success:
+            return Response(result.data, status=status.HTTP_202_ACCEPTED)
+        response = Response(result.data["result"], status=status.HTTP_200_OK)
+        etag, last_modified = result.data["etag"], result.data["last_modified"]
+        return apply_validators(response, etag, last_modified, REVALIDATE_CACHE_CONTROL)
+
+
+class ResultExportView(APIView):
+    """CSV con todos los resultados del usuario, generado y enviado por partes."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        responses={200: OpenApiResponse(response=OpenApiTypes.BINARY, description="CSV de resultados")},
+        tags=["results"],
+    )
+    def get(self, request):
+        # Sin caché de resultados: la exportación recorre la tabla con un cursor del servidor
+        payload = ExportResultsUseCase(DjangoResultsQueryRepository()).execute(requester=request.user).data
+        response = StreamingHttpResponse(payload["chunks"], content_type="text/csv")
+        response["Content-Disposition"] = content_disposition_header(True, payload["filename"])
+        return response
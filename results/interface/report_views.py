@@ -1,5 +1,3 @@
-from django.http import HttpResponse
-from django.http import HttpResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import permissions
@@ -7,19 +5,40 @@ from rest_framework.views import APIView
 
 from results.application.use_cases import GetReportFileUseCase
 from results.infrastructure.repositories import DjangoReportRepository
+from shared.utils.http import IMMUTABLE_CACHE_CONTROL, apply_validators, conditional_response, file_response
 
 
 class ReportDownloadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     @extend_schema(
-        responses={200: OpenApiResponse(response=OpenApiTypes.BINARY, description="Archivo de reporte")},
+        responses={
+            200: OpenApiResponse(response=OpenApiTypes.BINARY, description="Archivo de reporte"),
+            206: OpenApiResponse(response=OpenApiTypes.BINARY, description="Rango solicitado (header Range)"),
+            304: OpenApiResponse(description="El reporte no cambió (If-None-Match / If-Modified-Since)"),
+            416: OpenApiResponse(description="Rango fuera del archivo"),
+        },
         tags=["reports"],
     )
     def get(self, request, report_id):
         use_case = GetReportFileUseCase(DjangoReportRepository())
-        result = use_case.execute(requester=request.user, report_id=str(report_id))
-        payload = result.data
-        response = HttpResponse(payload["content"], content_type=payload["content_type"])
-        response["Content-Disposition"] = f'attachment; filename="{payload["filename"]}"'
-        return response
+        # Validadores primero: un 304 no carga el binario del reporte
+        described = use_case.describe(requester=request.user, report_id=str(report_id)).data
+        etag, last_modified = described["etag"], described["last_modified"]
+        not_modified = conditional_response(request, etag, last_modified, IMMUTABLE_CACHE_CONTROL)
+        if not_modified is not None:
+            return not_modified
+
+        # Una sola consulta (sin el binario) y el archivo se envía por partes desde el storage
+        payload = use_case.execute(
+            requester=request.user, report_id=str(report_id), report=described["report"]
+        ).data
+        response = file_response(
+            request,
+            payload["stream"],
+            content_type=payload["content_type"],
+            filename=payload["filename"],
+            etag=etag,
+            last_modified=last_modified,
+        )
+        return apply_validators(response, etag, last_modified, IMMUTABLE_CACHE_CONTROL)
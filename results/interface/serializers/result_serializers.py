@@ -1,11 +1,41 @@
 from rest_framework import serializers
 
 
+class ModelVersionSerializer(serializers.Serializer):
+    version = serializers.CharField()
+    metadata = serializers.JSONField()
+
+
 class ImageResultSerializer(serializers.Serializer):
     label = serializers.CharField()
     confidence = serializers.FloatField()
     modelVersion = serializers.CharField(source="model_version")
     details = serializers.JSONField(required=False)
+    reportId = serializers.UUIDField(required=False, allow_null=True)
+    reportStatus = serializers.ChoiceField(
+        choices=("REQUESTED", "GENERATING", "READY", "FAILED"), required=False, allow_null=True
+    )
+    model = ModelVersionSerializer(required=False)
+
+
+class ResultQuerySerializer(serializers.Serializer):
+    expand = serializers.CharField(required=False, help_text="Relaciones a incluir, separadas por coma: model")
+
+    def validate_expand(self, value):
+        expand = frozenset(part.strip() for part in value.split(",") if part.strip())
+        unknown = expand - {"model"}
+        if unknown:
+            raise serializers.ValidationError(f"Valores de expand no soportados: {', '.join(sorted(unknown))}")
+        return expand
+
+
+class ResultWaitQuerySerializer(ResultQuerySerializer):
+    timeout = serializers.FloatField(required=False, min_value=0)
+
+
+class PendingResultSerializer(serializers.Serializer):
+    imageId = serializers.UUIDField()
+    status = serializers.CharField()
 
 
 class ReportRequestSerializer(serializers.Serializer):
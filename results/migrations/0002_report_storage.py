@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='checksum',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='storage_backend',
+            field=models.CharField(default='database', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='storage_key',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
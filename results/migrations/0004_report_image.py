@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingestion', '0003_imagedata_storage'),
+        ('results', '0003_report_completed_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='image',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='ingestion.image'),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='images',
+            field=models.ManyToManyField(blank=True, related_name='batch_reports', to='ingestion.image'),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['image', 'owner', '-created_at'], name='report_image_owner_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+import csv
+import io
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.db import migrations
+
+# Nombres históricos: pixelcheck-<image_id>-<YYYYmmddHHMMSS>.<ext>
+SINGLE_FILENAME = re.compile(r"^pixelcheck-([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})-\d{14}\.")
+
+
+def _read_content(report) -> bytes:
+    # Copia congelada del layout de `FileSystemBlobStorage` a la fecha de esta migración: no se
+    # importa el código de storage actual, que puede cambiar después
+    if report.storage_backend == "filesystem":
+        key = report.storage_key
+        return (Path(settings.BLOB_STORAGE_ROOT) / key[:2] / key[2:4] / key).read_bytes()
+    return bytes(report.content or b"")
+
+
+def backfill_report_image(apps, schema_editor):
+    Report = apps.get_model("results", "Report")
+    Image = apps.get_model("ingestion", "Image")
+
+    singles = Report.objects.filter(scope="SINGLE", image__isnull=True).only("report_id", "filename")
+    for report in singles.iterator(chunk_size=500):
+        match = SINGLE_FILENAME.match(report.filename or "")
+        if match and Image.objects.filter(image_id=match.group(1)).exists():
+            Report.objects.filter(report_id=report.report_id).update(image_id=match.group(1))
+
+    # Los BATCH no llevan la imagen en el nombre: los miembros salen de la columna imageId del CSV
+    batches = Report.objects.filter(scope="BATCH", format="CSV", status="READY", images__isnull=True)
+    for report in batches.iterator(chunk_size=100):
+        rows = csv.DictReader(io.StringIO(_read_content(report).decode("utf-8")))
+        image_ids = {row["imageId"] for row in rows if row.get("imageId")}
+        existing = Image.objects.filter(image_id__in=image_ids).values_list("image_id", flat=True)
+        report.images.set(list(existing))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("results", "0004_report_image"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_report_image, migrations.RunPython.noop),
+    ]
@@ -23,13 +23,27 @@ class Report(models.Model):
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="reports"
     )
+    # SINGLE: imagen de origen. BATCH: imágenes del lote en `images`.
+    image = models.ForeignKey(
+        "ingestion.Image", null=True, blank=True, on_delete=models.SET_NULL, related_name="reports"
+    )
+    images = models.ManyToManyField("ingestion.Image", blank=True, related_name="batch_reports")
     scope = models.CharField(max_length=16, choices=Scope.choices, default=Scope.SINGLE)
     format = models.CharField(max_length=8, choices=Format.choices, default=Format.PDF)
     status = models.CharField(max_length=16, choices=Status.choices, default=Status.REQUESTED)
     created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
     filename = models.CharField(max_length=255, blank=True)
+    # Ver shared.infrastructure.storage: `content` solo se usa con el backend "database"
     content = models.BinaryField(null=True, blank=True)
     content_mime = models.CharField(max_length=64, blank=True)
+    checksum = models.CharField(max_length=64, blank=True)
+    storage_backend = models.CharField(max_length=16, default="database")
+    storage_key = models.CharField(max_length=64, blank=True)
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            # Último reporte de una imagen para un owner (GetResultUseCase)
+            models.Index(fields=["image", "owner", "-created_at"], name="report_image_owner_idx"),
+        ]
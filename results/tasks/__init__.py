@@ -0,0 +1,3 @@
+from .worker import generate_batch_report_task, generate_report_task
+
+__all__ = ["generate_report_task", "generate_batch_report_task"]
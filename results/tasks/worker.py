@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from results.application.use_cases import CreateBatchReportUseCase, GenerateReportUseCase
+from results.infrastructure.repositories import DjangoReportRepository, DjangoResultsQueryRepository
+
+
+@shared_task(name="results.generate_report")
+def generate_report_task(report_id: str, image_id: str) -> None:
+    use_case = GenerateReportUseCase(DjangoResultsQueryRepository(), DjangoReportRepository())
+    use_case.execute(report_id=report_id, image_id=image_id)
+
+
+@shared_task(name="results.generate_batch_report")
+def generate_batch_report_task(report_id: str, image_ids: list[str]) -> None:
+    use_case = CreateBatchReportUseCase(DjangoResultsQueryRepository(), DjangoReportRepository())
+    use_case.execute(report_id=report_id, image_ids=image_ids)
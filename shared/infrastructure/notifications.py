@@ -0,0 +1,146 @@
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATIONS_REDIS = "redis"
+NOTIFICATIONS_LOCAL = "local"
+
+
+def image_channel(image_id: str) -> str:
+    return f"pixelcheck:image:{image_id}"
+
+
+class Subscription(ABC):
+    @abstractmethod
+    def wait(self, timeout: float) -> dict | None:
+        """Bloquea hasta recibir un mensaje del canal o agotar `timeout` (segundos)."""
+
+
+class Notifier(ABC):
+    """
+    Pub/sub de eventos de procesamiento. El suscriptor se registra *antes* de consultar el
+    estado en la base, así un evento publicado entre la consulta y la espera no se pierde.
+    """
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict) -> None: ...
+
+    @abstractmethod
+    def subscribe(self, channel: str): ...
+
+
+class LocalNotifier(Notifier):
+    """
+    Stand-in en proceso (desarrollo, tests, Celery eager): una Condition por notificador. Como el
+    pub/sub de Redis, un mensaje solo llega a las suscripciones abiertas al publicarlo; cada una
+    tiene su cola y el canal se descarta al cerrarse la última, así no se acumulan mensajes.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._subscribers: dict[str, list[deque]] = {}
+
+    def publish(self, channel: str, message: dict) -> None:
+        with self._condition:
+            for queue in self._subscribers.get(channel, ()):
+                queue.append(message)
+            self._condition.notify_all()
+
+    @contextmanager
+    def subscribe(self, channel: str) -> Iterator[Subscription]:
+        queue: deque = deque()
+        with self._condition:
+            self._subscribers.setdefault(channel, []).append(queue)
+        try:
+            yield _LocalSubscription(self._condition, queue)
+        finally:
+            with self._condition:
+                queues = self._subscribers[channel]
+                queues.remove(queue)
+                if not queues:
+                    del self._subscribers[channel]
+
+
+class _LocalSubscription(Subscription):
+    def __init__(self, condition: threading.Condition, queue: deque):
+        self.condition = condition
+        self.queue = queue
+
+    def wait(self, timeout: float) -> dict | None:
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.queue, timeout=timeout):
+                return None
+            return self.queue.popleft()
+
+
+class RedisNotifier(Notifier):
+    """Pub/sub sobre Redis (`REDIS_URL`): entrega los eventos del worker Celery a los procesos web."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel: str, message: dict) -> None:
+        self.client.publish(channel, json.dumps(message))
+
+    @contextmanager
+    def subscribe(self, channel: str) -> Iterator[Subscription]:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(channel)
+        try:
+            yield _RedisSubscription(pubsub)
+        finally:
+            pubsub.close()
+
+
+class _RedisSubscription(Subscription):
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def wait(self, timeout: float) -> dict | None:
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = self.pubsub.get_message(timeout=remaining)
+            if message and message["type"] == "message":
+                return json.loads(message["data"])
+        return None
+
+
+_notifier: Notifier | None = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier() -> Notifier:
+    global _notifier
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                _notifier = _build_notifier(settings.RESULT_NOTIFICATIONS_BACKEND)
+    return _notifier
+
+
+def _build_notifier(name: str) -> Notifier:
+    if name == NOTIFICATIONS_REDIS:
+        return RedisNotifier(settings.REDIS_URL)
+    if name == NOTIFICATIONS_LOCAL:
+        return LocalNotifier()
+    raise ImproperlyConfigured(f"Backend de notificaciones desconocido: {name}")
+
+
+def publish_image_status(image_id: str, status: str) -> None:
+    """Best effort: si el broker de notificaciones falla, los clientes caen al timeout del long-poll."""
+    try:
+        get_notifier().publish(image_channel(image_id), {"imageId": image_id, "status": status})
+    except Exception:
+        logger.warning("No se pudo publicar el estado de la imagen %s", image_id, exc_info=True)
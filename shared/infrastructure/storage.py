@@ -0,0 +1,144 @@
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+STORAGE_DATABASE = "database"
+STORAGE_FILESYSTEM = "filesystem"
+
+_COPY_CHUNK_SIZE = 64 * 1024
+
+
+class BlobStorage(ABC):
+    """
+    Puerto de almacenamiento de binarios (imágenes, reportes).
+
+    Opera sobre un "holder": un modelo con los campos `content`, `storage_backend` y
+    `storage_key`. El backend solo actualiza esos campos; guardar el modelo es tarea del llamador.
+    """
+
+    name: str
+
+    @abstractmethod
+    def save(self, holder, stream: BinaryIO, checksum: str | None = None) -> None: ...
+
+    @abstractmethod
+    def open(self, holder) -> BinaryIO: ...
+
+    def read(self, holder) -> bytes:
+        with self.open(holder) as handle:
+            return handle.read()
+
+
+class DatabaseBlobStorage(BlobStorage):
+    """Backend histórico: el binario vive en el BinaryField `content` del propio modelo."""
+
+    name = STORAGE_DATABASE
+
+    def save(self, holder, stream: BinaryIO, checksum: str | None = None) -> None:
+        holder.content = stream.read()
+        holder.storage_backend = self.name
+        holder.storage_key = ""
+
+    def open(self, holder) -> BinaryIO:
+        return BytesIO(holder.content or b"")
+
+    def read(self, holder) -> bytes:
+        return holder.content or b""
+
+
+class FileSystemBlobStorage(BlobStorage):
+    """
+    Backend de disco local direccionado por contenido: la clave es el sha256 calculado al escribir
+    y los archivos se reparten en subdirectorios `ab/cd/<sha256>`. Contenidos idénticos se guardan
+    una sola vez; varias filas pueden compartir un archivo, así que nunca se borra al reemplazar o
+    eliminar una fila: los huérfanos los recoge `manage.py gc_blobs`.
+    """
+
+    name = STORAGE_FILESYSTEM
+    TEMP_PREFIX = ".upload-"
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / key
+
+    def save(self, holder, stream: BinaryIO, checksum: str | None = None) -> None:
+        # `checksum` no se usa como clave: la clave es siempre el hash de lo que realmente se leyó
+        holder.content = None
+        holder.storage_backend = self.name
+        holder.storage_key = self._write(stream)
+
+    def open(self, holder) -> BinaryIO:
+        return open(self.path(holder.storage_key), "rb")
+
+    def iter_files(self) -> Iterator[tuple[str, Path]]:
+        """(clave, ruta) de cada archivo bajo `root`; los temporales de escritura llevan clave ""."""
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                yield ("" if name.startswith(self.TEMP_PREFIX) else name), Path(directory) / name
+
+    def _write(self, stream: BinaryIO) -> str:
+        # Escritura por chunks a un temporal en el mismo volumen y rename atómico a su clave
+        self.root.mkdir(parents=True, exist_ok=True)
+        sha256 = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=self.TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in iter(lambda: stream.read(_COPY_CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    tmp.write(chunk)
+            key = sha256.hexdigest()
+            target = self.path(key)
+            if target.exists():
+                # Mismo contenido ya guardado: se reutiliza y se renueva su mtime para que
+                # `gc_blobs` no lo borre antes de que la fila nueva quede guardada
+                os.utime(target)
+                Path(tmp_path).unlink()
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return key
+
+
+def get_blob_storage(name: str) -> BlobStorage:
+    if name == STORAGE_DATABASE:
+        return DatabaseBlobStorage()
+    if name == STORAGE_FILESYSTEM:
+        return FileSystemBlobStorage(settings.BLOB_STORAGE_ROOT)
+    raise ImproperlyConfigured(f"Backend de almacenamiento desconocido: {name}")
+
+
+def store_blob(holder, stream: BinaryIO, backend: str, checksum: str | None = None) -> None:
+    get_blob_storage(backend).save(holder, stream, checksum=checksum)
+
+
+def open_blob(holder) -> BinaryIO:
+    """Abre el binario con el backend con que fue guardado (no el configurado actualmente)."""
+    return get_blob_storage(holder.storage_backend).open(holder)
+
+
+def read_blob(holder) -> bytes:
+    return get_blob_storage(holder.storage_backend).read(holder)
+
+
+def blob_view(holder) -> memoryview:
+    """
+    Binario del holder como memoryview. Pensado para holders cargados con `defer("content")`: la
+    columna se pide recién aquí, en una consulta de una sola columna, y solo si el binario vive en
+    la base (con "filesystem" nunca viaja por SQL). El memoryview envuelve lo que devuelve el
+    driver (`bytes` en SQLite, `chunk` en psycopg2) sin convertirlo a `bytes`; `ImagePayload` lo lee
+    a través de `BufferReader`.
+    """
+    content = read_blob(holder)
+    return content if isinstance(content, memoryview) else memoryview(content)
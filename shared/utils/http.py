@@ -0,0 +1,134 @@
+import hashlib
+import os
+import re
+from datetime import datetime
+from typing import BinaryIO, Iterator
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import content_disposition_header, http_date
+
+# Reportes READY: el contenido no cambia nunca para un report_id dado
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Recursos que pueden cambiar (p. ej. estado del reporte): el cliente revalida con ETag
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+STREAM_CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def build_etag(*parts) -> str:
+    """ETag fuerte (entre comillas) a partir de valores que identifican una versión del recurso."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def apply_validators(
+    response: HttpResponse, etag: str, last_modified: datetime | None, cache_control: str | None = None
+) -> HttpResponse:
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    if cache_control:
+        response["Cache-Control"] = cache_control
+    patch_vary_headers(response, ("Authorization",))
+    return response
+
+
+def conditional_response(
+    request, etag: str, last_modified: datetime | None, cache_control: str | None = None
+) -> HttpResponse | None:
+    """
+    Evalúa If-None-Match / If-Modified-Since (y If-Match) contra los validadores del recurso.
+    Devuelve la respuesta 304/412 lista para enviar, o None si hay que construir la respuesta completa.
+    """
+    template = apply_validators(HttpResponse(), etag, last_modified, cache_control)
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp, response=template)
+    return None if response is template else response
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Interpreta un único rango `bytes=a-b`, `bytes=a-` o `bytes=-n` y devuelve (inicio, fin)
+    inclusivos. None si no hay rango utilizable (multi-rango o sintaxis inválida: se responde
+    el archivo completo); `RangeNotSatisfiable` si el rango queda fuera del archivo.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _iter_range(stream: BinaryIO, start: int, length: int) -> Iterator[bytes]:
+    try:
+        stream.seek(start)
+        while length > 0:
+            chunk = stream.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        stream.close()
+
+
+def file_response(
+    request,
+    stream: BinaryIO,
+    content_type: str,
+    filename: str,
+    etag: str | None = None,
+    last_modified: datetime | None = None,
+    as_attachment: bool = True,
+) -> HttpResponse | StreamingHttpResponse:
+    """
+    Sirve un stream de archivo por partes (FileResponse) con soporte de `Range` de un solo rango
+    (206 / 416) e `If-Range` contra el ETag o Last-Modified. El stream se cierra al terminar.
+    Con `as_attachment=False` se sirve inline (previews en el navegador).
+    """
+    content_type = content_type or "application/octet-stream"
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(0)
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    validators = {etag, http_date(last_modified.timestamp()) if last_modified else None} - {None}
+    if request.method in ("GET", "HEAD") and (if_range is None or if_range in validators):
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            stream.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            response["Accept-Ranges"] = "bytes"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(stream, content_type=content_type, as_attachment=as_attachment, filename=filename)
+        response.block_size = STREAM_CHUNK_SIZE
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _iter_range(stream, start, end - start + 1), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    response["Accept-Ranges"] = "bytes"
+    return response
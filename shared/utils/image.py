@@ -1,7 +1,11 @@
 import hashlib
+import io
+import math
+from functools import cached_property
 from io import BytesIO
 from typing import BinaryIO
 
+import numpy as np
 from django.conf import settings
 from PIL import Image
 
@@ -10,27 +14,248 @@ from shared.domain.exceptions import ValidationError
 ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/webp"}
 MAX_DIMENSION = 4096
 
+VALIDATION_MODE_HEADER = "header"
+VALIDATION_MODE_FULL = "full"
 
-def ensure_valid_image(uploaded_file) -> Image.Image:
-    if uploaded_file.content_type not in ALLOWED_MIME_TYPES:
-        raise ValidationError("Formato de imagen no soportado")
-    if uploaded_file.size > settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
-        raise ValidationError("Imagen excede el tamaño permitido")
 
-    data = uploaded_file.read()
-    uploaded_file.seek(0)
+def sniff_mime_type(header: bytes) -> str | None:
+    """Detecta el tipo real a partir de los magic bytes del archivo."""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Lector seekable sobre un buffer (memoryview de un `bytes`, `bytearray` o el `chunk` que
+    devuelve psycopg2 para un bytea) que lee directo del buffer, sin copiarlo entero antes.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        end = min(self._pos + len(target), len(self._view))
+        size = max(0, end - self._pos)
+        target[:size] = self._view[self._pos : self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class ImagePayload:
+    """
+    Bytes de una imagen leídos una sola vez y decodificados como máximo una vez.
+
+    Validación, checksum, transformaciones del modelo y heurísticas comparten el mismo
+    buffer (`buffer` es un memoryview sin copia) y los mismos arreglos numpy (`rgb`, `alpha`).
+    `data` puede ser `bytes` o cualquier objeto con protocolo de buffer (p. ej. el memoryview de
+    `blob_view`): se lee con `stream()` sin materializarlo como `bytes`.
+
+    Con `max_side > 0` (default PIXELCHECK_FEATURE_MAX_SIDE) la imagen decodificada se acota a ese
+    lado mayor: los JPEG se decodifican ya escalados (draft, DCT 1/2-1/8) y el resto se reduce
+    con `Image.reduce` tras decodificar. `original_size` conserva las dimensiones reales.
+    """
+
+    def __init__(self, data, content_type: str | None = None, max_side: int | None = None):
+        self.data = data
+        self.buffer = memoryview(data).cast("B")
+        self.content_type = content_type
+        self.max_side = settings.PIXELCHECK_FEATURE_MAX_SIDE if max_side is None else max_side
+        self.original_size: tuple[int, int] | None = None
+
+    @classmethod
+    def from_upload(cls, uploaded_file) -> "ImagePayload":
+        uploaded_file.seek(0)
+        data = uploaded_file.read()
+        uploaded_file.seek(0)
+        return cls(data, content_type=uploaded_file.content_type)
+
+    @property
+    def size(self) -> int:
+        return len(self.buffer)
+
+    @cached_property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.buffer).hexdigest()
+
+    def stream(self) -> BinaryIO:
+        """Stream de lectura sobre los bytes, sin copiarlos (BytesIO comparte un `bytes` inmutable)."""
+        return BytesIO(self.data) if isinstance(self.data, bytes) else BufferReader(self.buffer)
+
+    def open(self) -> Image.Image:
+        """Apertura perezosa: solo lee la cabecera (formato y dimensiones)."""
+        return Image.open(self.stream())
+
+    def inspect(self) -> tuple[int, int]:
+        """Validación solo de cabecera: magic bytes, formato declarado y dimensiones."""
+        return inspect_image(self.stream(), self.content_type)
+
+    def verify(self) -> tuple[int, int]:
+        """Verifica la integridad del archivo sin decodificar píxeles y devuelve (width, height)."""
+        return verify_image(self.stream())
+
+    @cached_property
+    def image(self) -> Image.Image:
+        """
+        Imagen decodificada una única vez, normalizada a RGB o RGBA (si trae transparencia) y
+        acotada a `max_side`.
+        """
+        try:
+            image = self.open()
+            self.original_size = image.size
+            if self.max_side:
+                # Solo JPEG: elige la menor escala de decodificación que no baja de max_side
+                image.draft(None, (self.max_side, self.max_side))
+            image.load()
+        except Exception as exc:
+            raise ValidationError("Archivo no es una imagen válida") from exc
+        if image.has_transparency_data:
+            image = image if image.mode == "RGBA" else image.convert("RGBA")
+        else:
+            image = image if image.mode == "RGB" else image.convert("RGB")
+        if self.max_side and max(image.size) > self.max_side:
+            # Reducción por promedio de bloques enteros: mucho más barata que un resample
+            image = image.reduce(math.ceil(max(image.size) / self.max_side))
+        return image
+
+    @cached_property
+    def pixels(self) -> np.ndarray:
+        pixels = np.asarray(self.image)
+        if pixels.shape[-1] == 4:
+            # RGBA: misma disposición en memoria que el arreglo, así que `image` pasa a ser una vista
+            # sobre `pixels` y la copia decodificada se libera
+            self.__dict__["image"] = Image.frombuffer("RGBA", self.image.size, pixels, "raw", "RGBA", 0, 1)
+        return pixels
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """Vista uint8 (H, W, 3) sobre `pixels`."""
+        return self.pixels[..., :3]
 
+    @property
+    def alpha(self) -> np.ndarray | None:
+        """Vista uint8 (H, W) del canal alpha, o None si la imagen es opaca."""
+        return self.pixels[..., 3] if self.pixels.shape[-1] == 4 else None
+
+    @cached_property
+    def rgb_image(self) -> Image.Image:
+        """
+        Imagen sin alpha: la decodificada si es RGB; si es RGBA, una vista RGBX sobre `pixels` (el
+        cuarto byte se ignora) en lugar de una conversión que copie la imagen otra vez.
+        """
+        if self.image.mode == "RGB":
+            return self.image
+        return Image.frombuffer("RGBX", self.image.size, self.pixels, "raw", "RGBX", 0, 1)
+
+
+def thumbnail_jpeg(source, side: int, quality: int = 75) -> bytes | None:
+    """
+    Miniatura JPEG con lado mayor `side`. `source` son bytes (decodificación acotada vía
+    draft/reduce) o un `ImagePayload` ya decodificado, que se reutiliza sin volver a decodificar.
+    None si no es una imagen decodificable.
+    """
+    payload = source if isinstance(source, ImagePayload) else ImagePayload(source, max_side=side * 2)
     try:
-        image = Image.open(BytesIO(data))
+        # Copia: `thumbnail` escala en el lugar y la imagen del payload puede seguir en uso
+        image = payload.rgb_image.copy()
+    except ValidationError:
+        return None
+    image.thumbnail((side, side))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def inspect_image(stream: BinaryIO, content_type: str | None) -> tuple[int, int]:
+    """Lee solo la cabecera del stream (magic bytes + apertura perezosa de PIL)."""
+    try:
+        if sniff_mime_type(stream.read(12)) != content_type:
+            raise ValidationError("El contenido no coincide con el formato declarado")
+        stream.seek(0)
+        try:
+            return Image.open(stream).size
+        except Exception as exc:
+            raise ValidationError("Archivo no es una imagen válida") from exc
+    finally:
+        stream.seek(0)
+
+
+def verify_image(stream: BinaryIO) -> tuple[int, int]:
+    """PIL verify() recorriendo el stream, sin decodificar píxeles ni cargarlo entero en memoria."""
+    try:
+        image = Image.open(stream)
+        size = image.size
         image.verify()
     except Exception as exc:
         raise ValidationError("Archivo no es una imagen válida") from exc
+    finally:
+        stream.seek(0)
+    return size
+
+
+def _ensure_allowed(content_type: str | None, size: int) -> None:
+    if content_type not in ALLOWED_MIME_TYPES:
+        raise ValidationError("Formato de imagen no soportado")
+    if size > settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+        raise ValidationError("Imagen excede el tamaño permitido")
 
-    image = Image.open(BytesIO(data))
-    width, height = image.size
+
+def _ensure_valid(stream: BinaryIO, content_type: str | None, size: int, mode: str | None) -> tuple[int, int]:
+    """
+    Valida y devuelve (width, height).
+    En modo "header" no se decodifica la imagen: la verificación completa queda a cargo del
+    worker de análisis, que marca la imagen como REJECTED si no puede decodificarla.
+    """
+    _ensure_allowed(content_type, size)
+
+    mode = mode or settings.IMAGE_VALIDATION_MODE
+    width, height = inspect_image(stream, content_type)
+    if mode == VALIDATION_MODE_FULL:
+        width, height = verify_image(stream)
     if width > MAX_DIMENSION or height > MAX_DIMENSION:
         raise ValidationError("Dimensiones de imagen excedidas")
-    return image
+    return width, height
+
+
+def ensure_allowed_upload(uploaded_file) -> None:
+    """Chequeos baratos (tipo y tamaño declarados) antes de leer el cuerpo del upload."""
+    _ensure_allowed(uploaded_file.content_type, uploaded_file.size)
+
+
+def ensure_valid_upload(uploaded_file, mode: str | None = None) -> tuple[int, int]:
+    """Valida el upload leyendo desde su stream, sin copiarlo a memoria."""
+    return _ensure_valid(uploaded_file.file, uploaded_file.content_type, uploaded_file.size, mode)
+
+
+def ensure_valid_payload(payload: ImagePayload, mode: str | None = None) -> tuple[int, int]:
+    return _ensure_valid(payload.stream(), payload.content_type, payload.size, mode)
+
+
+def ensure_valid_image(uploaded_file) -> Image.Image:
+    ensure_allowed_upload(uploaded_file)
+    payload = ImagePayload.from_upload(uploaded_file)
+    ensure_valid_payload(payload, mode=VALIDATION_MODE_FULL)
+    return payload.open()
 
 
 def calculate_checksum(stream: BinaryIO) -> str:
@@ -39,3 +264,9 @@ def calculate_checksum(stream: BinaryIO) -> str:
         sha256.update(chunk)
     stream.seek(0)
     return sha256.hexdigest()
+
+
+def upload_checksum(uploaded_file) -> str:
+    """Usa el sha256 calculado por `HashingUploadHandler`; si no existe, recorre el stream."""
+    checksum = getattr(uploaded_file, "checksum", None)
+    return checksum or calculate_checksum(uploaded_file.file)
@@ -1,14 +1,53 @@
 import csv
 import io
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Iterable, Optional
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, Optional
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
-from reportlab.lib.utils import ImageReader
+from reportlab.lib.utils import ImageReader, simpleSplit
 from reportlab.pdfgen import canvas
 
+PAGE_TOP = 770
+PAGE_BOTTOM = 50
+PAGE_LEFT = 50
+TEXT_WIDTH = LETTER[0] - 2 * PAGE_LEFT
+CSV_CHUNK_ROWS = 500
+
+
+class _PageCursor:
+    """Posición vertical en el canvas: salta de página antes de dibujar fuera del margen."""
+
+    def __init__(self, pdf: canvas.Canvas, y: float = PAGE_TOP, on_new_page: Callable[[], None] | None = None):
+        self.pdf = pdf
+        self.y = y
+        self.on_new_page = on_new_page
+        self.font = ("Helvetica", 10)
+
+    def set_font(self, name: str, size: int) -> None:
+        self.font = (name, size)
+        self.pdf.setFont(name, size)
+
+    def ensure(self, height: float) -> None:
+        if self.y - height < PAGE_BOTTOM:
+            self.new_page()
+
+    def new_page(self) -> None:
+        self.pdf.showPage()
+        self.y = PAGE_TOP
+        if self.on_new_page:
+            self.on_new_page()
+        # showPage reinicia el estado gráfico
+        self.pdf.setFont(*self.font)
+
+    def text(self, value: str, x: float = PAGE_LEFT, leading: float = 14, width: float = TEXT_WIDTH) -> None:
+        for line in simpleSplit(value, self.font[0], self.font[1], width) or [""]:
+            self.ensure(leading)
+            self.pdf.drawString(x, self.y, line)
+            self.y -= leading
+
 
 def build_pdf(content: Dict[str, str]) -> bytes:
     buffer = io.BytesIO()
@@ -66,36 +105,39 @@ def build_analysis_pdf(
     for key, val in summary.items():
         pdf.drawString(300, offset, f"{key}: {val}")
         offset -= 14
+    # Sin miniatura las métricas empiezan debajo del resumen, no encima
+    y = min(y, offset)
 
     # Features (bars)
-    pdf.setFont("Helvetica-Bold", 12)
-    pdf.drawString(50, y - 20, "Métricas clave")
-    pdf.setFont("Helvetica", 10)
-    bar_y = y - 40
+    cursor = _PageCursor(pdf, y=y - 20)
+    cursor.set_font("Helvetica-Bold", 12)
+    cursor.text("Métricas clave", leading=20)
+    cursor.set_font("Helvetica", 10)
     bar_width = 200
     for name, val in features.items():
-        pdf.drawString(50, bar_y, f"{name.replace('_', ' ').title()}: {val:.2f}")
+        cursor.ensure(16)
+        pdf.drawString(50, cursor.y, f"{name.replace('_', ' ').title()}: {val:.2f}")
         pdf.setStrokeColor(colors.grey)
-        pdf.rect(180, bar_y - 8, bar_width, 8, stroke=1, fill=0)
+        pdf.rect(180, cursor.y - 8, bar_width, 8, stroke=1, fill=0)
         pdf.setFillColor(colors.HexColor("#3b82f6"))
-        pdf.rect(180, bar_y - 8, bar_width * min(max(val, 0), 1), 8, stroke=0, fill=1)
+        pdf.rect(180, cursor.y - 8, bar_width * min(max(val, 0), 1), 8, stroke=0, fill=1)
         pdf.setFillColor(colors.black)
-        bar_y -= 16
+        cursor.y -= 16
 
-    # Observations
-    pdf.setFont("Helvetica-Bold", 12)
-    pdf.drawString(50, bar_y - 10, "Observaciones")
-    pdf.setFont("Helvetica", 10)
-    obs_y = bar_y - 26
+    # Observations: con saltos de página y líneas largas partidas al ancho de la página
+    cursor.y -= 10
+    cursor.set_font("Helvetica-Bold", 12)
+    cursor.text("Observaciones", leading=16)
+    cursor.set_font("Helvetica", 10)
     for key, val in observations.items():
-        pdf.drawString(50, obs_y, f"- {val}")
-        obs_y -= 14
+        cursor.text(f"- {val}")
 
     # Recommendation
-    pdf.setFont("Helvetica-Bold", 12)
-    pdf.drawString(50, obs_y - 10, "Recomendación")
-    pdf.setFont("Helvetica", 10)
-    pdf.drawString(50, obs_y - 26, recommendation)
+    cursor.y -= 10
+    cursor.set_font("Helvetica-Bold", 12)
+    cursor.text("Recomendación", leading=16)
+    cursor.set_font("Helvetica", 10)
+    cursor.text(recommendation)
 
     pdf.showPage()
     pdf.save()
@@ -103,10 +145,115 @@ def build_analysis_pdf(
     return buffer.read()
 
 
-def build_csv(headers: Iterable[str], rows: Iterable[Iterable[str]]) -> bytes:
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(headers)
+@dataclass
+class BatchReportRow:
+    image_id: str
+    label: str
+    confidence: float | None
+    model_version: str
+    conclusion: str
+    # Las imágenes sin resultado (p. ej. REJECTED) también tienen fila, con su estado
+    status: str = "DONE"
+
+
+def write_batch_pdf(
+    stream: BinaryIO,
+    title: str,
+    rows: Iterable[BatchReportRow],
+    thumbnail: Callable[[str], Optional[bytes]] | None = None,
+    rows_per_page: int = 10,
+) -> None:
+    """
+    Reporte PDF multi-imagen: una fila por imagen (miniatura + resultado), `rows_per_page` por página.
+
+    Las filas se consumen de un iterador y cada miniatura se obtiene y dibuja dentro del loop de su
+    fila, sin cargar los resultados ni las imágenes originales. El `Canvas` de ReportLab sí conserva
+    todas las páginas (con sus miniaturas JPEG de 96 px) hasta `save()`, así que la memoria crece
+    con el tamaño del lote; lo acota `BATCH_UPLOAD_MAX_FILES`.
+    """
+    pdf = canvas.Canvas(stream, pagesize=LETTER)
+    pdf.setTitle(title)
+    row_height = (PAGE_TOP - 40 - PAGE_BOTTOM) / rows_per_page
+    thumb_side = row_height - 8
+    page = 0
+
+    def header():
+        nonlocal page
+        page += 1
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(PAGE_LEFT, PAGE_TOP, title)
+        pdf.setFont("Helvetica", 9)
+        pdf.drawRightString(LETTER[0] - PAGE_LEFT, PAGE_TOP, f"Página {page}")
+        pdf.drawString(PAGE_LEFT, PAGE_TOP - 15, f"Generated: {datetime.utcnow().isoformat()}Z")
+
+    header()
+    y = PAGE_TOP - 40
+    for index, row in enumerate(rows):
+        if index and index % rows_per_page == 0:
+            pdf.showPage()
+            header()
+            y = PAGE_TOP - 40
+        top = y - 4
+        text_x = PAGE_LEFT
+        image_bytes = thumbnail(row.image_id) if thumbnail else None
+        if image_bytes:
+            try:
+                pdf.drawImage(
+                    ImageReader(io.BytesIO(image_bytes)),
+                    PAGE_LEFT,
+                    top - thumb_side,
+                    width=thumb_side,
+                    height=thumb_side,
+                    preserveAspectRatio=True,
+                )
+            except Exception:
+                # Miniatura ilegible: la fila se dibuja igual, sin imagen
+                pass
+            text_x = PAGE_LEFT + thumb_side + 12
+        pdf.setFont("Helvetica-Bold", 10)
+        pdf.drawString(text_x, top - 12, row.image_id)
+        pdf.setFont("Helvetica", 9)
+        if row.confidence is None:
+            pdf.drawString(text_x, top - 26, f"Estado: {row.status}")
+            pdf.drawString(text_x, top - 40, f"Conclusión: {row.conclusion}")
+        else:
+            pdf.drawString(text_x, top - 26, f"Etiqueta: {row.label}   Confianza: {row.confidence:.2f}")
+            pdf.drawString(text_x, top - 40, f"Modelo: {row.model_version}   Conclusión: {row.conclusion}")
+        pdf.setStrokeColor(colors.lightgrey)
+        pdf.line(PAGE_LEFT, y - row_height, LETTER[0] - PAGE_LEFT, y - row_height)
+        pdf.setStrokeColor(colors.black)
+        y -= row_height
+
+    pdf.showPage()
+    pdf.save()
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: devuelve cada línea en lugar de acumularla."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(
+    headers: Iterable[str], rows: Iterable[Iterable[str]], chunk_rows: int = CSV_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """CSV por partes (`chunk_rows` filas por chunk) sin armar el archivo completo en memoria."""
+    writer = csv.writer(_Echo())
+    pending = [writer.writerow(headers)]
     for row in rows:
-        writer.writerow(row)
-    return buffer.getvalue().encode("utf-8")
+        pending.append(writer.writerow(row))
+        if len(pending) >= chunk_rows:
+            yield "".join(pending).encode("utf-8")
+            pending = []
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def write_csv(stream: BinaryIO, headers: Iterable[str], rows: Iterable[Iterable[str]]) -> None:
+    for chunk in iter_csv(headers, rows):
+        stream.write(chunk)
+
+
+def build_csv(headers: Iterable[str], rows: Iterable[Iterable[str]]) -> bytes:
+    return b"".join(iter_csv(headers, rows))
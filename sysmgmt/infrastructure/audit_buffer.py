@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from sysmgmt.domain.entities import AuditLogEntity
+from sysmgmt.domain.repositories import AuditLogRepository
+from sysmgmt.infrastructure.repositories import DjangoAuditLogRepository, _entity
+from sysmgmt.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_SINK_SYNC = "sync"
+AUDIT_SINK_BUFFERED = "buffered"
+
+
+def _bulk_write(logs: List[AuditLog]) -> None:
+    # Todo o nada: si falla, los eventos vuelven al buffer sin duplicar los ya insertados
+    with transaction.atomic():
+        AuditLog.objects.bulk_create(logs)
+
+
+class AuditLogBuffer:
+    """
+    Buffer en proceso de eventos de auditoría.
+
+    `submit` solo encola el `AuditLog` ya construido (id y fecha asignados en el momento del
+    evento). Un hilo dedicado lo escribe con un único `bulk_create` al juntar `max_batch` eventos
+    o al pasar `flush_interval` segundos desde el primero pendiente. `flush` escribe lo pendiente
+    en el hilo llamador y `close` (registrado con atexit) detiene el hilo y vacía el buffer.
+
+    Si la escritura falla los eventos vuelven al buffer y el hilo espera `flush_interval` antes de
+    reintentar, duplicando la espera en cada fallo consecutivo (hasta `MAX_BACKOFF`). Con
+    `max_pending` eventos encolados (p. ej. la base no responde) `submit` deja de encolar y
+    escribe de forma síncrona; lo mismo ocurre después de `close`.
+    """
+
+    MAX_BACKOFF = 60.0
+
+    _instance: "AuditLogBuffer | None" = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "AuditLogBuffer":
+        with cls._instance_lock:
+            if cls._instance is None:
+                buffer = cls(
+                    max_batch=settings.AUDIT_BUFFER_MAX_BATCH,
+                    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+                    max_pending=settings.AUDIT_BUFFER_MAX_PENDING,
+                )
+                atexit.register(buffer.close)
+                os.register_at_fork(after_in_child=buffer._after_fork)
+                cls._instance = buffer
+            return cls._instance
+
+    def __init__(
+        self,
+        max_batch: int = 200,
+        flush_interval: float = 2.0,
+        max_pending: int = 10000,
+        writer: Callable[[List[AuditLog]], None] = _bulk_write,
+    ):
+        self.max_batch = max(1, int(max_batch))
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.max_pending = max(self.max_batch, int(max_pending))
+        self.writer = writer
+        self._pending: Deque[AuditLog] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # Espera extra tras escrituras fallidas: flush_interval, luego el doble... hasta MAX_BACKOFF
+        self._failures = 0
+        self.flushes = 0
+        self.written = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def submit(self, log: AuditLog) -> None:
+        with self._cond:
+            buffered = not self._closed and len(self._pending) < self.max_pending
+            if buffered:
+                self._ensure_worker()
+                self._pending.append(log)
+                # El primero abre la ventana de `flush_interval`; el que completa el lote la cierra
+                if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                    self._cond.notify_all()
+        if not buffered:
+            self.writer([log])
+
+    def flush(self) -> int:
+        """Escribe todo lo pendiente en el hilo llamador. Devuelve cuántos eventos se escribieron."""
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+            try:
+                self.writer(batch)
+            except Exception:
+                logger.exception("No se pudieron escribir %s eventos de auditoría; se reintentará", len(batch))
+                with self._cond:
+                    self._pending.extendleft(reversed(batch))
+                    self._failures += 1
+                return 0
+            with self._cond:
+                self._failures = 0
+            self.flushes += 1
+            self.written += len(batch)
+            return len(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+        if self._pending:
+            logger.error("Se perdieron %s eventos de auditoría al cerrar el proceso", len(self._pending))
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="pixelcheck-audit-flush", daemon=True)
+            self._thread.start()
+
+    def _after_fork(self) -> None:
+        # El hijo no hereda el hilo y lo pendiente es del padre (que lo escribirá): se empieza vacío
+        self._pending.clear()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def _retry_delay(self) -> float:
+        if not self._failures:
+            return 0.0
+        return min(self.MAX_BACKOFF, max(self.flush_interval, 0.1) * 2 ** (self._failures - 1))
+
+    def _wait_for_batch(self) -> bool:
+        with self._cond:
+            # Tras un fallo no se reintenta de inmediato aunque el lote esté completo
+            backoff_until = time.monotonic() + self._retry_delay()
+            while not self._closed:
+                remaining = backoff_until - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return not self._closed
+
+    def _run(self) -> None:
+        # Al cerrar, el vaciado final lo hace `close` en el hilo que cierra
+        while self._wait_for_batch():
+            self.flush()
+            close_old_connections()
+
+
+class BufferedAuditLogRepository(DjangoAuditLogRepository):
+    """Escritura diferida a través de `AuditLogBuffer`; la lectura vacía antes el buffer local."""
+
+    def __init__(self, buffer: AuditLogBuffer | None = None):
+        self.buffer = buffer or AuditLogBuffer.instance()
+
+    def create(self, **kwargs) -> AuditLogEntity:
+        log = AuditLog(occurred_at=timezone.now(), **kwargs)
+        self.buffer.submit(log)
+        return _entity(log)
+
+    def list_recent(self, limit: int = 50) -> list[AuditLogEntity]:
+        # Lo encolado en este proceso es visible de inmediato; lo de otros procesos, tras su flush
+        self.buffer.flush()
+        return super().list_recent(limit=limit)
+
+
+def audit_log_repository() -> AuditLogRepository:
+    if settings.AUDIT_SINK == AUDIT_SINK_BUFFERED:
+        return BufferedAuditLogRepository()
+    return DjangoAuditLogRepository()
+
+
+def flush_audit_buffer() -> None:
+    """Vaciado explícito (p. ej. al terminar un proceso hijo de Celery, que no ejecuta atexit)."""
+    if AuditLogBuffer._instance is not None:
+        AuditLogBuffer._instance.close()
@@ -5,7 +5,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from sysmgmt.application.use_cases import ListAuditLogsUseCase, RecordAuditEventUseCase
-from sysmgmt.infrastructure.repositories import DjangoAuditLogRepository
+from sysmgmt.infrastructure.audit_buffer import audit_log_repository
 from sysmgmt.interface.serializers.audit import AuditLogEntrySerializer, AuditLogSerializer
 
 
@@ -20,7 +20,7 @@ class AuditLogView(APIView):
     def post(self, request):
         serializer = AuditLogSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        use_case = RecordAuditEventUseCase(DjangoAuditLogRepository())
+        use_case = RecordAuditEventUseCase(audit_log_repository())
         result = use_case.execute(
             actor=request.user,
             action=serializer.validated_data["action"],
@@ -36,6 +36,6 @@ class AuditLogView(APIView):
     def get(self, request):
         if not request.user.is_staff:
             raise PermissionDenied("Solo administradores pueden ver auditoría")
-        use_case = ListAuditLogsUseCase(DjangoAuditLogRepository())
+        use_case = ListAuditLogsUseCase(audit_log_repository())
         result = use_case.execute(limit=int(request.query_params.get("limit", 50)))
         return Response(result.data)
@@ -0,0 +1,243 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from functools import cache, partial
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+SIZES = (256, 1024, 2048)
+
+
+def _measure(fn, repeat: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 3),
+        "min_ms": round(samples[0], 3),
+        "max_ms": round(samples[-1], 3),
+        "stdev_ms": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks del pipeline (validación, checksum, inferencia, features, PDF y "
+        "upload → análisis → resultado) con salida JSON comparable entre commits"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=10, help="Mediciones por benchmark")
+        parser.add_argument("--only", help="Prefijos de benchmarks separados por coma (ej. 'features,e2e')")
+        parser.add_argument("--output", help="Archivo JSON de salida (default: stdout)")
+        parser.add_argument("--compare", help="JSON de una corrida anterior: agrega la razón contra esa base")
+        parser.add_argument(
+            "--real-model",
+            action="store_true",
+            help="Usa PIXELCHECK_MODEL_PATH en lugar del modelo mínimo (resultados no comparables entre máquinas)",
+        )
+
+    def handle(self, *args, **options):
+        import torch
+
+        from analysis.ml.inference import PixelCheckInference
+
+        repeat = max(1, options["repeat"])
+        prefixes = [prefix.strip() for prefix in (options["only"] or "").split(",") if prefix.strip()]
+
+        with ExitStack() as stack:
+            if not options["real_model"]:
+                from analysis.ml.stub import write_tiny_model
+
+                tmp = stack.enter_context(tempfile.TemporaryDirectory())
+                stack.enter_context(override_settings(PIXELCHECK_MODEL_PATH=str(write_tiny_model(tmp))))
+            # Mide el camino completo: sin reutilizar resultados por checksum
+            stack.enter_context(override_settings(PIXELCHECK_DEDUP_ENABLED=False))
+            stack.enter_context(self._fresh_inference_singleton(PixelCheckInference))
+
+            results = {}
+            for name, setup in self._cases():
+                if prefixes and not any(name.startswith(prefix) for prefix in prefixes):
+                    continue
+                self.stderr.write(f"{name} ...")
+                results[name] = _measure(setup(), repeat)
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "torch": torch.__version__,
+                "torchThreads": torch.get_num_threads(),
+                "model": "real" if options["real_model"] else "tiny",
+                "backend": settings.PIXELCHECK_INFERENCE_BACKEND,
+                "featureMaxSide": settings.PIXELCHECK_FEATURE_MAX_SIDE,
+                "repeat": repeat,
+            },
+            "benchmarks": results,
+        }
+        if options["compare"]:
+            self._compare(report, Path(options["compare"]))
+
+        payload = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(payload + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Resultados en {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+    @staticmethod
+    @contextmanager
+    def _fresh_inference_singleton(inference_cls):
+        # El singleton se crea con el modelo del benchmark y se restaura al terminar
+        previous = inference_cls._instance
+        inference_cls._instance = None
+        try:
+            yield
+        finally:
+            inference_cls._instance = previous
+
+    def _cases(self):
+        """
+        (nombre, setup): `setup()` arma los fixtures del caso y devuelve la función a medir. Solo
+        se llama para los casos elegidos con --only; las imágenes se generan una vez y se comparten.
+        """
+        from analysis.ml.inference import PixelCheckInference
+        from analysis.ml.stub import photo_bytes
+        from shared.utils.image import ImagePayload, calculate_checksum, ensure_valid_image
+        from shared.utils.reporting import build_analysis_pdf
+
+        @cache
+        def image(side: int, seed: int = 0) -> bytes:
+            return photo_bytes(side, side, seed=seed)
+
+        def validate(side: int):
+            data = image(side)
+            return lambda: ensure_valid_image(SimpleUploadedFile("bench.jpg", data, content_type="image/jpeg"))
+
+        def checksum(megabytes: int):
+            blob = BytesIO(os.urandom(megabytes * 1024 * 1024))
+            return lambda: calculate_checksum(blob)
+
+        def predict():
+            data = image(1024)
+            return lambda: PixelCheckInference.instance().predict(data)
+
+        def predict_many():
+            batch = [image(512, seed=seed) for seed in range(8)]
+            return lambda: PixelCheckInference.instance().predict_many(batch)
+
+        def features(side: int):
+            # Decodificación fuera de la medición: solo se miden las heurísticas
+            payload = ImagePayload(image(side), max_side=0)
+            payload.rgb
+            return lambda: PixelCheckInference._compute_simple_features(payload)
+
+        def analysis_pdf():
+            _, _, details = PixelCheckInference.instance().predict(image(1024))
+            return lambda: build_analysis_pdf(
+                title="PixelCheck Report bench",
+                summary={"Etiqueta": "AI", "Confianza": "0.90", "Modelo": settings.PIXELCHECK_MODEL_VERSION},
+                features=details["features"],
+                observations=details["observations"],
+                recommendation="Benchmark",
+                image_bytes=image(1024),
+            )
+
+        for side in SIZES:
+            yield f"ensure_valid_image[{side}]", partial(validate, side)
+        for megabytes in (1, 8):
+            yield f"calculate_checksum[{megabytes}MB]", partial(checksum, megabytes)
+        yield "predict[1024]", predict
+        yield "predict_many[8x512]", predict_many
+        for side in SIZES:
+            yield f"features[{side}]", partial(features, side)
+        yield "build_analysis_pdf", analysis_pdf
+        yield "e2e[upload->analysis->result]", lambda: self._end_to_end(image(1024))
+
+    def _end_to_end(self, data: bytes):
+        """Upload → AnalyzeImageUseCase (Celery eager) → GetResultUseCase, sin dejar datos: rollback."""
+        from analysis.application.dedup import AnalysisDeduplicator
+        from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+        from config.celery import app
+        from ingestion.application.use_cases import UploadImageUseCase
+        from ingestion.infrastructure.repositories import DjangoImageRepository
+        from results.application.use_cases import GetResultUseCase
+        from results.infrastructure.cache import results_query_repository
+        from results.infrastructure.repositories import DjangoReportRepository
+
+        def run():
+            eager = (app.conf.task_always_eager, app.conf.task_eager_propagates)
+            app.conf.task_always_eager = app.conf.task_eager_propagates = True
+            try:
+                with transaction.atomic():
+                    user = get_user_model().objects.create_user(
+                        email="bench@pixelcheck.local", username="bench", password=None
+                    )
+                    upload = UploadImageUseCase(
+                        DjangoImageRepository(), AnalysisDeduplicator(DjangoAnalysisResultRepository())
+                    ).execute(
+                        uploader=user,
+                        uploaded_file=SimpleUploadedFile("bench.jpg", data, content_type="image/jpeg"),
+                    )
+                    result = GetResultUseCase(results_query_repository(), DjangoReportRepository()).execute(
+                        user, upload.data["imageId"]
+                    )
+                    if not result.success:
+                        raise CommandError(f"El pipeline no produjo resultado: {result.error}")
+                    transaction.set_rollback(True)
+            finally:
+                app.conf.task_always_eager, app.conf.task_eager_propagates = eager
+
+        return run
+
+    def _compare(self, report: dict, baseline_path: Path) -> None:
+        try:
+            baseline = json.loads(baseline_path.read_text())["benchmarks"]
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"No se pudo leer la base {baseline_path}: {exc}") from exc
+        report["meta"]["baseline"] = str(baseline_path)
+        for name, stats in report["benchmarks"].items():
+            previous = baseline.get(name)
+            if not previous:
+                continue
+            stats["baseline_median_ms"] = previous["median_ms"]
+            stats["ratio"] = round(stats["median_ms"] / previous["median_ms"], 3) if previous["median_ms"] else None
+            self.stderr.write(
+                f"{name:34} {previous['median_ms']:>10.3f} -> {stats['median_ms']:>10.3f} ms  x{stats['ratio']}"
+            )
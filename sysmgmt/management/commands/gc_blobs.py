@@ -0,0 +1,54 @@
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ingestion.models import ImageData, ImageThumbnail
+from results.models import Report
+from shared.infrastructure.storage import STORAGE_FILESYSTEM, FileSystemBlobStorage
+
+# Modelos cuyas filas pueden referenciar un archivo del backend filesystem
+BLOB_MODELS = (ImageData, ImageThumbnail, Report)
+
+
+def _referenced(keys: list[str]) -> set[str]:
+    referenced = set()
+    for model in BLOB_MODELS:
+        rows = model.objects.filter(storage_backend=STORAGE_FILESYSTEM, storage_key__in=keys)
+        referenced.update(rows.values_list("storage_key", flat=True))
+    return referenced
+
+
+class Command(BaseCommand):
+    help = "Borra los archivos del backend filesystem que ya no referencia ninguna fila"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace",
+            type=int,
+            default=3600,
+            help="Segundos desde la última escritura antes de considerar huérfano un archivo",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Solo lista lo que se borraría")
+
+    def handle(self, *args, **options):
+        storage = FileSystemBlobStorage(settings.BLOB_STORAGE_ROOT)
+        # Un archivo recién escrito puede no tener aún su fila confirmada: se respeta un margen
+        cutoff = time.time() - options["grace"]
+        dry_run = options["dry_run"]
+        files = ((key, path) for key, path in storage.iter_files() if path.stat().st_mtime < cutoff)
+        removed = kept = 0
+        while batch := list(islice(files, options["batch_size"])):
+            # Temporales abandonados (clave "") se borran siempre
+            referenced = _referenced([key for key, _ in batch if key])
+            for key, path in batch:
+                if key and key in referenced:
+                    kept += 1
+                    continue
+                if not dry_run:
+                    path.unlink(missing_ok=True)
+                removed += 1
+        verb = "a borrar" if dry_run else "borrados"
+        self.stdout.write(self.style.SUCCESS(f"Archivos {verb}: {removed}; en uso: {kept}"))
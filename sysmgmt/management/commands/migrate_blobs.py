@@ -0,0 +1,68 @@
+import hashlib
+
+from django.core.management.base import BaseCommand
+
+from ingestion.models import ImageData, ImageThumbnail
+from results.models import Report
+from shared.infrastructure.storage import (
+    STORAGE_DATABASE,
+    STORAGE_FILESYSTEM,
+    open_blob,
+    read_blob,
+    store_blob,
+)
+
+
+class Command(BaseCommand):
+    help = "Mueve binarios de imágenes y reportes entre backends de almacenamiento"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--to", choices=(STORAGE_DATABASE, STORAGE_FILESYSTEM), required=True)
+        parser.add_argument("--only", choices=("images", "reports"), help="Limita la migración a un tipo")
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        target = options["to"]
+        batch_size = options["batch_size"]
+        if options["only"] in (None, "images"):
+            moved = self._migrate_images(target, batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Imágenes migradas a {target}: {moved}"))
+            moved = self._migrate_thumbnails(target, batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Miniaturas migradas a {target}: {moved}"))
+        if options["only"] in (None, "reports"):
+            moved = self._migrate_reports(target, batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Reportes migrados a {target}: {moved}"))
+        if target == STORAGE_DATABASE:
+            self.stdout.write("Los archivos que quedaron sin referencia se borran con `manage.py gc_blobs`")
+
+    def _migrate_images(self, target: str, batch_size: int) -> int:
+        moved = 0
+        pending = ImageData.objects.exclude(storage_backend=target).select_related("image")
+        for data in pending.iterator(chunk_size=batch_size):
+            with open_blob(data) as stream:
+                store_blob(data, stream, backend=target, checksum=data.image.checksum)
+            data.save(update_fields=["content", "storage_backend", "storage_key"])
+            moved += 1
+        return moved
+
+    def _migrate_thumbnails(self, target: str, batch_size: int) -> int:
+        moved = 0
+        pending = ImageThumbnail.objects.exclude(storage_backend=target)
+        for thumbnail in pending.iterator(chunk_size=batch_size):
+            with open_blob(thumbnail) as stream:
+                store_blob(thumbnail, stream, backend=target, checksum=thumbnail.checksum)
+            thumbnail.save(update_fields=["content", "storage_backend", "storage_key"])
+            moved += 1
+        return moved
+
+    def _migrate_reports(self, target: str, batch_size: int) -> int:
+        moved = 0
+        pending = Report.objects.exclude(storage_backend=target).filter(status=Report.Status.READY)
+        for report in pending.iterator(chunk_size=batch_size):
+            if not report.checksum:
+                report.checksum = hashlib.sha256(read_blob(report)).hexdigest()
+            with open_blob(report) as stream:
+                store_blob(report, stream, backend=target, checksum=report.checksum)
+            report.save(update_fields=["content", "checksum", "storage_backend", "storage_key"])
+            moved += 1
+        return moved
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sysmgmt", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditlog",
+            name="occurred_at",
+            field=models.DateTimeField(default=timezone.now),
+        ),
+    ]
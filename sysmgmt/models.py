@@ -2,6 +2,7 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class AuditLog(models.Model):
@@ -12,7 +13,8 @@ class AuditLog(models.Model):
     action = models.CharField(max_length=128)
     target = models.CharField(max_length=128, blank=True)
     payload = models.JSONField(default=dict, blank=True)
-    occurred_at = models.DateTimeField(auto_now_add=True)
+    # Momento del evento, no de la escritura: el buffer de auditoría inserta en diferido
+    occurred_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ("-occurred_at",)
@@ -0,0 +1,19 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from analysis.ml.stub import TinyModel, write_tiny_model  # noqa: F401
+
+
+def image_bytes(color="white", size=(16, 16), fmt="PNG") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def noise_image_bytes(size=(64, 64), fmt="PNG", seed=0) -> bytes:
+    rng = np.random.default_rng(seed)
+    buffer = io.BytesIO()
+    Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)).save(buffer, format=fmt)
+    return buffer.getvalue()
@@ -0,0 +1,137 @@
+import threading
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from iam.models import User
+from sysmgmt.infrastructure.audit_buffer import AuditLogBuffer
+from sysmgmt.models import AuditLog
+
+
+class _Recorder:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.written = threading.Event()
+
+    def __call__(self, logs):
+        if self.fail:
+            raise RuntimeError("base no disponible")
+        self.batches.append(list(logs))
+        self.written.set()
+
+
+class AuditLogBufferTests(SimpleTestCase):
+    def _buffer(self, recorder, **kwargs) -> AuditLogBuffer:
+        buffer = AuditLogBuffer(writer=recorder, **kwargs)
+        self.addCleanup(buffer.close)
+        return buffer
+
+    def test_flushes_on_size_and_time_thresholds(self):
+        recorder = _Recorder()
+        buffer = self._buffer(recorder, max_batch=3, flush_interval=60)
+        for index in range(3):
+            buffer.submit(AuditLog(action=f"size-{index}"))
+        self.assertTrue(recorder.written.wait(5))
+        actions = [[log.action for log in batch] for batch in recorder.batches]
+        self.assertEqual(actions, [["size-0", "size-1", "size-2"]])
+
+        recorder.written.clear()
+        started = time.monotonic()
+        buffer.flush_interval = 0.05
+        buffer.submit(AuditLog(action="timed"))
+        self.assertTrue(recorder.written.wait(5))
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(recorder.batches[-1][0].action, "timed")
+        print("[Audit] Flush por tamaño y por tiempo en un hilo dedicado -> OK")
+
+    def test_close_flushes_pending_and_later_events_are_written_synchronously(self):
+        recorder = _Recorder()
+        buffer = self._buffer(recorder, max_batch=100, flush_interval=60)
+        buffer.submit(AuditLog(action="pending"))
+        buffer.close()
+        self.assertEqual(buffer.depth, 0)
+        self.assertEqual(recorder.batches, [[mock.ANY]])
+
+        buffer.submit(AuditLog(action="after-close"))
+        self.assertEqual(recorder.batches[-1][0].action, "after-close")
+        print("[Audit] close vacía el buffer; después escribe síncrono -> OK")
+
+    def test_failed_write_requeues_and_full_buffer_falls_back_to_sync(self):
+        recorder = _Recorder(fail=True)
+        buffer = self._buffer(recorder, max_batch=2, flush_interval=60, max_pending=2)
+        # Sin hilo de fondo: los flush ocurren solo donde el test los pide
+        mock.patch.object(buffer, "_ensure_worker").start()
+        self.addCleanup(mock.patch.stopall)
+        with self.assertLogs("sysmgmt.infrastructure.audit_buffer", "ERROR"):
+            buffer.submit(AuditLog(action="a"))
+            buffer.flush()
+        self.assertEqual(buffer.depth, 1)
+
+        recorder.fail = False
+        buffer.submit(AuditLog(action="b"))
+        buffer.submit(AuditLog(action="overflow"))
+        self.assertIn(["overflow"], [[log.action for log in batch] for batch in recorder.batches])
+        buffer.flush()
+        self.assertEqual(buffer.depth, 0)
+        print("[Audit] Reintento tras fallo y fallback síncrono con buffer lleno -> OK")
+
+    def test_failing_writer_backs_off_instead_of_spinning(self):
+        recorder = _Recorder(fail=True)
+        calls = []
+        writer = lambda logs: (calls.append(time.monotonic()), recorder(logs))  # noqa: E731
+        buffer = self._buffer(writer, max_batch=3, flush_interval=0.2)
+        with self.assertLogs("sysmgmt.infrastructure.audit_buffer", "ERROR"):
+            for index in range(3):
+                buffer.submit(AuditLog(action=f"down-{index}"))
+            time.sleep(0.7)
+            recorder.fail = False
+            buffer.close()
+        failed = len(calls) - 1
+        # Lote completo: intento inmediato, reintentos a los 0.2 s y 0.4 s después (0.6 s acumulados)
+        self.assertLessEqual(failed, 3)
+        self.assertGreaterEqual(calls[1] - calls[0], 0.19)
+        self.assertEqual(buffer.depth, 0)
+        print(f"[Audit] Escritor caído: {failed} intentos en 0.7 s (backoff exponencial) -> OK")
+
+
+@override_settings(AUDIT_SINK="buffered")
+class AuditEndpointTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="audited", password="demo12345", is_staff=True)
+        self.client.force_authenticate(self.user)
+        # Sin flush por tiempo: el test controla cuándo se escribe (en este hilo)
+        buffer = AuditLogBuffer(max_batch=100, flush_interval=3600)
+        self.addCleanup(buffer.close)
+        patcher = mock.patch.object(AuditLogBuffer, "_instance", buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_events_are_buffered_and_written_in_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            for index in range(3):
+                response = self.client.post(reverse("audit-log"), {"action": f"upload-{index}"}, format="json")
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse([q for q in queries.captured_queries if q["sql"].startswith("INSERT")])
+        self.assertEqual(AuditLog.objects.count(), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("audit-log"))
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual({entry["action"] for entry in response.data}, {"upload-0", "upload-1", "upload-2"})
+        self.assertEqual(str(AuditLog.objects.get(action="upload-0").log_id), str(response.data[-1]["log_id"]))
+        print("[Audit] Eventos en buffer y un único INSERT al vaciar -> OK")
+
+    @override_settings(AUDIT_SINK="sync")
+    def test_sync_sink_writes_within_request(self):
+        response = self.client.post(reverse("audit-log"), {"action": "sync"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(AuditLog.objects.filter(log_id=response.data["logId"]).exists())
+        print("[Audit] AUDIT_SINK=sync escribe en la request -> OK")
@@ -0,0 +1,152 @@
+import io
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.ml.inference import PixelCheckInference
+from analysis.models import AnalysisResult
+from analysis.tasks import run_analysis_batch_task
+from iam.models import Role, User
+from ingestion.models import Image
+from results.models import Report
+from results.tasks import generate_batch_report_task
+from shared.infrastructure.storage import read_blob
+from tests.helpers import noise_image_bytes, write_tiny_model
+
+
+def _png(seed: int) -> SimpleUploadedFile:
+    return SimpleUploadedFile(f"img-{seed}.png", noise_image_bytes(seed=seed), content_type="image/png")
+
+
+class BatchUploadTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="newsroom", password="demo12345")
+        self.user.roles.add(Role.objects.create(name=Role.RoleName.PROFESSIONAL))
+        self.client.force_authenticate(self.user)
+
+    @mock.patch("ingestion.application.use_cases.run_analysis_batch_task")
+    def test_batch_upload_enqueues_single_task(self, mock_task):
+        broken = SimpleUploadedFile("broken.png", b"not an image", content_type="image/png")
+        response = self.client.post(
+            reverse("upload-image-batch"),
+            {"images": [_png(1), _png(2), broken]},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(response.data["images"]), 2)
+        self.assertEqual(response.data["rejected"][0]["filename"], "broken.png")
+        self.assertEqual(Image.objects.count(), 2)
+
+        report = Report.objects.get(report_id=response.data["reportId"])
+        self.assertEqual((report.scope, report.status), (Report.Scope.BATCH, Report.Status.REQUESTED))
+        self.assertEqual(report.images.count(), 2)
+        mock_task.delay.assert_called_once()
+        image_ids, report_id = mock_task.delay.call_args.args
+        self.assertEqual(len(image_ids), 2)
+        self.assertEqual(report_id, str(report.report_id))
+        print("[Ingestion] Upload múltiple -> una sola tarea batch -> OK")
+
+    @mock.patch("ingestion.application.use_cases.run_analysis_batch_task")
+    def test_batch_upload_without_professional_role_creates_no_report(self, mock_task):
+        plain = User.objects.create_user(username="reader", password="demo12345")
+        self.client.force_authenticate(plain)
+        response = self.client.post(reverse("upload-image-batch"), {"images": [_png(3)]}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIsNone(response.data["reportId"])
+        self.assertFalse(Report.objects.filter(owner=plain).exists())
+        image_ids, report_id = mock_task.delay.call_args.args
+        self.assertEqual((len(image_ids), report_id), (1, None))
+        print("[Ingestion] Upload múltiple sin ROLE_PROFESSIONAL no genera reporte BATCH -> OK")
+
+    @mock.patch("ingestion.application.use_cases.run_analysis_batch_task")
+    def test_batch_upload_accepts_zip_archive(self, mock_task):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as bundle:
+            bundle.writestr("gallery/a.png", noise_image_bytes(seed=5))
+            bundle.writestr("gallery/b.png", noise_image_bytes(seed=6))
+            bundle.writestr("__MACOSX/gallery/._a.png", b"junk")
+        archive = SimpleUploadedFile("gallery.zip", buffer.getvalue(), content_type="application/zip")
+        response = self.client.post(
+            reverse("upload-image-batch"), {"archive": archive, "reportFormat": "PDF"}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(sorted(item["filename"] for item in response.data["images"]), ["a.png", "b.png"])
+        self.assertEqual(response.data["rejected"], [])
+        self.assertEqual(Report.objects.get(report_id=response.data["reportId"]).format, Report.Format.PDF)
+        print("[Ingestion] Upload de galería en ZIP -> OK")
+
+    def test_batch_task_analyzes_and_builds_batch_report(self):
+        with mock.patch("ingestion.application.use_cases.run_analysis_batch_task") as mock_task:
+            response = self.client.post(
+                reverse("upload-image-batch"), {"images": [_png(7), _png(8), _png(9)]}, format="multipart"
+            )
+        image_ids, report_id = mock_task.delay.call_args.args
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        with override_settings(PIXELCHECK_MODEL_PATH=str(write_tiny_model(tmp.name)), PIXELCHECK_BATCH_MAX_SIZE=2):
+            inference = PixelCheckInference()
+            with mock.patch.object(inference, "predict_many", wraps=inference.predict_many) as predict_many:
+                with mock.patch("analysis.application.use_cases.PixelCheckInference.instance", return_value=inference):
+                    with mock.patch("analysis.tasks.worker.generate_batch_report_task") as report_task:
+                        run_analysis_batch_task(image_ids, report_id)
+        report_task.delay.assert_called_once_with(report_id, image_ids)
+        generate_batch_report_task(*report_task.delay.call_args.args)
+        self.assertEqual([len(call.args[0]) for call in predict_many.call_args_list], [2, 1])
+
+        self.assertEqual(AnalysisResult.objects.filter(image_id__in=image_ids).count(), 3)
+        self.assertFalse(Image.objects.exclude(status=Image.Status.DONE).exists())
+        report = Report.objects.get(report_id=response.data["reportId"])
+        self.assertEqual(report.status, Report.Status.READY)
+        lines = read_blob(report).decode("utf-8").strip().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0].split(","), ["imageId", "label", "confidence", "modelVersion", "conclusion", "status"])
+        print("[Analysis] Tarea batch + reporte BATCH -> OK")
+
+    def test_batch_task_failure_marks_report_failed(self):
+        with mock.patch("ingestion.application.use_cases.run_analysis_batch_task") as mock_task:
+            self.client.post(reverse("upload-image-batch"), {"images": [_png(10), _png(11)]}, format="multipart")
+        image_ids, report_id = mock_task.delay.call_args.args
+
+        with mock.patch("analysis.tasks.worker.AnalyzeImageUseCase") as use_case_cls:
+            use_case_cls.return_value.execute_many.side_effect = RuntimeError("worker caído")
+            with self.assertRaises(RuntimeError):
+                run_analysis_batch_task(image_ids, report_id)
+        report = Report.objects.get(report_id=report_id)
+        self.assertEqual(report.status, Report.Status.FAILED)
+        self.assertIsNotNone(report.completed_at)
+        print("[Analysis] Falla de la tarea batch deja el reporte FAILED -> OK")
+
+    def test_batch_report_lists_rejected_images(self):
+        for fmt in (Report.Format.CSV, Report.Format.PDF):
+            with mock.patch("ingestion.application.use_cases.run_analysis_batch_task") as mock_task:
+                self.client.post(
+                    reverse("upload-image-batch"),
+                    {"images": [_png(12), _png(13)], "reportFormat": fmt},
+                    format="multipart",
+                )
+            image_ids, report_id = mock_task.delay.call_args.args
+            # El worker no pudo decodificar la segunda imagen
+            Image.objects.filter(image_id=image_ids[1]).update(status=Image.Status.REJECTED)
+            AnalysisResult.objects.create(
+                image_id=image_ids[0], owner=self.user, label=AnalysisResult.Label.REAL, confidence="0.8000"
+            )
+            Image.objects.filter(image_id=image_ids[0]).update(status=Image.Status.DONE)
+            generate_batch_report_task(report_id, image_ids)
+
+            report = Report.objects.get(report_id=report_id)
+            self.assertEqual(report.status, Report.Status.READY)
+            if fmt == Report.Format.CSV:
+                lines = read_blob(report).decode("utf-8").strip().splitlines()
+                self.assertEqual(len(lines), 3)
+                self.assertTrue(lines[2].startswith(image_ids[1]))
+                self.assertTrue(lines[2].endswith(",REJECTED"))
+            else:
+                self.assertTrue(read_blob(report).startswith(b"%PDF"))
+        print("[Results] Reporte BATCH incluye imágenes REJECTED con su estado -> OK")
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from analysis.ml.inference import PixelCheckInference
+from analysis.ml.stub import photo_bytes
+from ingestion.models import Image
+
+
+class BenchCommandTests(TestCase):
+    def setUp(self):
+        # El modo eager instancia el result backend de Celery (la variable de entorno tiene
+        # prioridad sobre settings): en pruebas no hay Redis
+        patcher = mock.patch.dict(os.environ, {"CELERY_RESULT_BACKEND": "cache+memory://"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bench_emits_comparable_json(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        baseline = Path(tmp.name) / "baseline.json"
+        call_command("bench", repeat=1, only="features[256],e2e", output=str(baseline), stderr=StringIO())
+
+        report = json.loads(baseline.read_text())
+        self.assertEqual(set(report["benchmarks"]), {"features[256]", "e2e[upload->analysis->result]"})
+        self.assertEqual(report["meta"]["model"], "tiny")
+        for stats in report["benchmarks"].values():
+            self.assertEqual(stats["runs"], 1)
+            self.assertGreater(stats["median_ms"], 0)
+        # El end-to-end corre en una transacción revertida: no deja usuarios ni imágenes
+        self.assertFalse(get_user_model().objects.filter(username="bench").exists())
+        self.assertEqual(Image.objects.count(), 0)
+
+        out = StringIO()
+        call_command("bench", repeat=1, only="features[256]", compare=str(baseline), stdout=out, stderr=StringIO())
+        stats = json.loads(out.getvalue())["benchmarks"]["features[256]"]
+        self.assertIn("ratio", stats)
+        print("[System] manage.py bench -> JSON comparable entre commits -> OK")
+
+    def test_only_builds_fixtures_of_selected_cases(self):
+        with mock.patch("analysis.ml.stub.photo_bytes", wraps=photo_bytes) as generated:
+            with mock.patch.object(PixelCheckInference, "instance") as instance:
+                call_command("bench", repeat=1, only="features[256]", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual([call.args for call in generated.call_args_list], [(256, 256)])
+        instance.assert_not_called()
+        print("[System] bench --only arma solo los fixtures de los casos elegidos -> OK")
@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import parse_http_date
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from analysis.models import AnalysisResult
+from iam.models import User
+from ingestion.models import Image
+from results.infrastructure.repositories import DjangoReportRepository
+from results.models import Report
+
+
+class HttpCachingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="poller", password="demo12345", is_staff=True)
+        self.client.force_authenticate(self.user)
+        self.image = Image.objects.create(
+            uploader=self.user,
+            filename="test.png",
+            mime_type="image/png",
+            size_bytes=10,
+            width=1,
+            height=1,
+            checksum="abc123",
+            status=Image.Status.DONE,
+        )
+        AnalysisResult.objects.create(
+            image=self.image,
+            owner=self.user,
+            label=AnalysisResult.Label.AI,
+            confidence=Decimal("0.9000"),
+            model_version="v1",
+        )
+        self.report = Report.objects.create(
+            owner=self.user, image=self.image, status=Report.Status.GENERATING, format=Report.Format.CSV
+        )
+
+    def test_result_revalidation_until_report_changes(self):
+        url = reverse("result-detail", args=[self.image.image_id])
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", first)
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], first["ETag"])
+
+        DjangoReportRepository().update_report(
+            report_id=str(self.report.report_id),
+            status=Report.Status.READY,
+            content=b"imageId\n",
+            content_mime="text/csv",
+            completed_at=timezone.now(),
+        )
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data["reportStatus"], Report.Status.READY)
+        print("[Results] ETag del resultado -> 304 hasta que cambia el reporte -> OK")
+
+    def test_result_reanalysis_invalidates_etag(self):
+        url = reverse("result-detail", args=[self.image.image_id])
+        first = self.client.get(url)
+        # Re-análisis: misma fila (mismo result_id y processed_at), otro veredicto
+        DjangoAnalysisResultRepository().save_result(
+            image=self.image,
+            owner=self.user,
+            label=AnalysisResult.Label.REAL,
+            confidence=Decimal("0.8000"),
+            model_version="v2",
+        )
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data["label"], "REAL")
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+        self.assertGreaterEqual(parse_http_date(changed["Last-Modified"]), parse_http_date(first["Last-Modified"]))
+        print("[Results] Re-análisis cambia ETag del resultado (200, no 304) -> OK")
+
+    def test_report_not_modified_without_loading_blob(self):
+        DjangoReportRepository().update_report(
+            report_id=str(self.report.report_id),
+            status=Report.Status.READY,
+            filename="batch.csv",
+            content=b"imageId,label\n",
+            content_mime="text/csv",
+            completed_at=timezone.now(),
+        )
+        url = reverse("download-report", args=[self.report.report_id])
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("immutable", first["Cache-Control"])
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse([q for q in queries.captured_queries if '"results_report"."content"' in q["sql"]])
+
+        cached = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        print("[Results] Reporte READY -> 304 sin leer el binario -> OK")
@@ -0,0 +1,74 @@
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image as PILImage
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.application.use_cases import AnalyzeImageUseCase
+from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from iam.models import User
+from ingestion.models import Image, ImageData, ImageThumbnail
+from results.application.use_cases import BATCH_THUMBNAIL_SIDE, _image_thumbnail
+from shared.utils.image import ImagePayload
+from tests.helpers import noise_image_bytes
+
+
+@mock.patch("ingestion.application.use_cases.run_analysis_task")
+class ImageThumbnailTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="previewer", password="demo12345")
+        self.client.force_authenticate(self.user)
+
+    def _upload(self, size=(1600, 1200)) -> str:
+        file = SimpleUploadedFile("big.jpg", noise_image_bytes(size=size, fmt="JPEG"), content_type="image/jpeg")
+        response = self.client.post(reverse("upload-image"), {"image": file}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        return str(response.data["imageId"])
+
+    def test_analysis_stores_thumbnail_from_single_decode(self, mock_task):
+        image_id = self._upload()
+        with mock.patch("analysis.application.use_cases.PixelCheckInference") as inference_cls:
+            inference = inference_cls.instance.return_value
+            inference.predict.return_value, inference.metadata = ("AI", 0.9, {"conclusion": "IA"}), {}
+            with mock.patch.object(ImagePayload, "open", autospec=True, side_effect=ImagePayload.open) as opened:
+                AnalyzeImageUseCase(DjangoAnalysisResultRepository()).execute(image_id=image_id)
+
+        self.assertEqual(opened.call_count, 1)
+        thumbnail = ImageThumbnail.objects.get(image_id=image_id)
+        self.assertEqual((thumbnail.width, thumbnail.height), (512, 384))
+        self.assertEqual(PILImage.open(BytesIO(bytes(thumbnail.content))).format, "JPEG")
+        print("[Ingestion] Miniatura generada en el análisis sin segunda decodificación -> OK")
+
+    def test_preview_endpoint_serves_thumbnail_with_validators(self, mock_task):
+        image_id = self._upload()
+        url = reverse("image-thumbnail", args=[image_id])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertTrue(response["Content-Disposition"].startswith("inline"))
+        self.assertEqual(max(PILImage.open(BytesIO(b"".join(response.streaming_content))).size), 512)
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = User.objects.create_user(username="stranger", password="demo12345")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        print("[Ingestion] Preview de miniatura con ETag y permisos -> OK")
+
+    def test_reports_reuse_stored_thumbnail(self, mock_task):
+        image_id = self._upload()
+        # Imagen sin miniatura (anterior a la función): se genera una vez y luego no se lee el original
+        self.assertFalse(ImageThumbnail.objects.filter(image_id=image_id).exists())
+        self.assertEqual(max(PILImage.open(BytesIO(_image_thumbnail(image_id))).size), 512)
+        ImageData.objects.filter(image_id=image_id).delete()
+
+        small = _image_thumbnail(image_id, BATCH_THUMBNAIL_SIDE)
+        self.assertEqual(max(PILImage.open(BytesIO(small)).size), BATCH_THUMBNAIL_SIDE)
+        self.assertEqual(ImageThumbnail.objects.filter(image_id=image_id).count(), 1)
+        self.assertEqual(Image.objects.get(image_id=image_id).status, Image.Status.QUEUED)
+        print("[Results] Reportes reutilizan la miniatura guardada -> OK")
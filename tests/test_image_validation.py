@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.application.use_cases import AnalyzeImageUseCase
+from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from iam.models import User
+from ingestion.models import Image
+from tests.helpers import image_bytes, noise_image_bytes
+
+
+def _truncated_png() -> bytes:
+    data = noise_image_bytes(size=(128, 128))
+    return data[: len(data) // 2]
+
+
+@mock.patch("ingestion.application.use_cases.run_analysis_task")
+class ImageValidationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="validator", password="demo12345")
+        self.client.force_authenticate(self.user)
+
+    def _upload(self, data: bytes, content_type: str = "image/png"):
+        file = SimpleUploadedFile("sample.png", data, content_type=content_type)
+        return self.client.post(reverse("upload-image"), {"image": file}, format="multipart")
+
+    def test_magic_bytes_must_match_declared_type(self, mock_task):
+        response = self._upload(image_bytes(fmt="JPEG"), content_type="image/png")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_task.delay.assert_not_called()
+        print("[Ingestion] Magic bytes vs MIME declarado -> OK")
+
+    @override_settings(IMAGE_VALIDATION_MODE="full")
+    def test_full_mode_rejects_corrupt_image_synchronously(self, mock_task):
+        response = self._upload(_truncated_png())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_task.delay.assert_not_called()
+        print("[Ingestion] Validación completa rechaza imagen corrupta -> OK")
+
+    @override_settings(IMAGE_VALIDATION_MODE="header")
+    def test_header_mode_defers_decode_to_worker(self, mock_task):
+        response = self._upload(_truncated_png())
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        mock_task.delay.assert_called_once()
+
+        with mock.patch("analysis.application.use_cases.PixelCheckInference") as inference_cls:
+            use_case = AnalyzeImageUseCase(DjangoAnalysisResultRepository())
+            result = use_case.execute(image_id=str(response.data["imageId"]))
+            inference_cls.instance.return_value.predict.assert_not_called()
+
+        self.assertFalse(result.success)
+        image = Image.objects.get(image_id=response.data["imageId"])
+        self.assertEqual(image.status, Image.Status.REJECTED)
+        print("[Analysis] Worker marca REJECTED si no decodifica -> OK")
@@ -0,0 +1,59 @@
+import importlib.util
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from analysis.ml.backends import BACKEND_ONNX, BACKEND_ONNX_INT8, load_backend, onnx_model_path
+from analysis.ml.inference import PixelCheckInference
+from tests.helpers import image_bytes, write_tiny_model
+
+HAS_ONNX = all(importlib.util.find_spec(name) for name in ("onnx", "onnxruntime"))
+
+
+class InferenceBackendTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.model_path = write_tiny_model(tmp.name)
+        override = override_settings(PIXELCHECK_MODEL_PATH=str(self.model_path))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_torchscript_is_default_backend(self):
+        label, _, details = PixelCheckInference().predict(image_bytes("red"))
+        self.assertIn(label, ("AI", "REAL"))
+        self.assertEqual(details["backend"], "torchscript")
+        print("[Analysis] Backend TorchScript por defecto -> OK")
+
+    def test_unknown_or_unavailable_backend_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            load_backend("tensorrt", self.model_path)
+        with mock.patch.dict(sys.modules, {"onnxruntime": None}):
+            with self.assertRaises(ImproperlyConfigured):
+                load_backend(BACKEND_ONNX, self.model_path)
+        self.assertEqual(
+            onnx_model_path(self.model_path, quantized=True), Path(self.model_path).with_suffix(".int8.onnx")
+        )
+        print("[Analysis] Backend desconocido u onnxruntime ausente -> ImproperlyConfigured -> OK")
+
+    @skipUnless(HAS_ONNX, "requiere onnx y onnxruntime")
+    def test_export_and_int8_parity(self):
+        out = StringIO()
+        call_command("export_onnx", model_path=str(self.model_path), stdout=out)
+        self.assertIn(BACKEND_ONNX_INT8, out.getvalue())
+
+        images = [image_bytes(color, size=(40, 30)) for color in ("red", "green", "blue")]
+        reference = PixelCheckInference().predict_many(images)
+        for backend in (BACKEND_ONNX, BACKEND_ONNX_INT8):
+            with override_settings(PIXELCHECK_INFERENCE_BACKEND=backend):
+                predictions = PixelCheckInference().predict_many(images)
+            for (_, conf_o, details_o), (_, conf_r, _) in zip(predictions, reference):
+                self.assertEqual(details_o["backend"], backend)
+                self.assertAlmostEqual(conf_o, conf_r, delta=0.05)
+        print("[Analysis] Export ONNX/int8 con paridad contra TorchScript -> OK")
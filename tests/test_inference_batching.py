@@ -0,0 +1,70 @@
+import tempfile
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from analysis.ml.batching import BatchingInferenceEngine
+from analysis.ml.inference import PixelCheckInference
+from tests.helpers import image_bytes, write_tiny_model
+
+
+class _CountingInference:
+    def __init__(self, inner):
+        self.inner = inner
+        self.batch_sizes = []
+
+    def predict_many(self, images):
+        self.batch_sizes.append(len(images))
+        return self.inner.predict_many(images)
+
+
+class InferenceBatchingTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(PIXELCHECK_MODEL_PATH=str(write_tiny_model(tmp.name)))
+        override.enable()
+        self.addCleanup(override.disable)
+        self.inference = PixelCheckInference()
+        self.images = [image_bytes(color, size=(32, 24)) for color in ("red", "green", "blue", "white")]
+
+    def test_predict_many_matches_single_predictions(self):
+        batched = self.inference.predict_many(self.images)
+        single = [self.inference.predict(image) for image in self.images]
+        self.assertEqual(len(batched), len(self.images))
+        for (label_b, conf_b, details_b), (label_s, conf_s, details_s) in zip(batched, single):
+            self.assertEqual(label_b, label_s)
+            self.assertAlmostEqual(conf_b, conf_s, places=5)
+            self.assertEqual(details_b["features"], details_s["features"])
+        print("[Analysis] predict_many == predict -> OK")
+
+    def test_engine_groups_concurrent_requests(self):
+        counting = _CountingInference(self.inference)
+        engine = BatchingInferenceEngine(counting, max_batch_size=4, window_ms=200)
+        results = [None] * len(self.images)
+        start = threading.Barrier(len(self.images))
+
+        def call(index):
+            start.wait()
+            results[index] = engine.predict(self.images[index])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(self.images))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(sum(counting.batch_sizes), len(self.images))
+        self.assertLess(len(counting.batch_sizes), len(self.images))
+        expected = self.inference.predict_many(self.images)
+        self.assertEqual([r[0] for r in results], [e[0] for e in expected])
+        print("[Analysis] Micro-batching agrupa peticiones concurrentes -> OK")
+
+    def test_engine_isolates_invalid_images(self):
+        engine = BatchingInferenceEngine(self.inference, max_batch_size=4, window_ms=50)
+        good = engine.submit(self.images[0])
+        bad = engine.submit(b"no es una imagen")
+        self.assertIn(good.result(timeout=10)[0], ("AI", "REAL"))
+        with self.assertRaises(Exception):
+            bad.result(timeout=10)
+        print("[Analysis] Imagen inválida no rompe el batch -> OK")
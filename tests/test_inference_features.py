@@ -0,0 +1,105 @@
+import io
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from analysis.ml.features import count_unique_colors
+from analysis.ml.inference import PixelCheckInference, build_transform
+from analysis.ml.stub import photo_bytes
+from shared.utils.image import ImagePayload
+
+
+def _legacy_features(img: Image.Image) -> dict:
+    """Implementación original (np.unique sobre float32) usada como referencia de regresión."""
+    rgb_img = img.convert("RGB")
+    arr = np.asarray(rgb_img, dtype=np.float32) / 255.0
+    h, w, _ = arr.shape
+    uniq_colors = len(np.unique(arr.reshape(-1, 3), axis=0))
+    color_score = float(min(1.0, uniq_colors / max(1, (h * w / 10_000))))
+    if img.mode == "RGBA":
+        alpha = np.asarray(img.getchannel("A"), dtype=np.float32) / 255.0
+        transparency_score = float(max(0.0, 1.0 - alpha.mean()))
+    else:
+        transparency_score = 0.0
+    gray = np.dot(arr[..., :3], [0.299, 0.587, 0.114])
+    noise_score = float(min(1.0, float(np.std(gray)) * 2.5))
+    high_freq = np.abs(np.diff(gray, axis=0)).mean() + np.abs(np.diff(gray, axis=1)).mean()
+    watermark_score = float(min(1.0, high_freq * 2.0))
+    mid = w // 2
+    sym_diff = float(np.mean(np.abs(arr[:, :mid, :] - np.fliplr(arr[:, -mid:, :]))))
+    symmetry_score = float(max(0.0, 1.0 - sym_diff * 2.0))
+    return {
+        "color_score": round(color_score, 2),
+        "transparency_score": round(transparency_score, 2),
+        "noise_score": round(noise_score, 2),
+        "watermark_score": round(watermark_score, 2),
+        "symmetry_score": round(symmetry_score, 2),
+    }
+
+
+def _encode(arr: np.ndarray, fmt: str = "PNG", **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(arr).save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def _corpus():
+    rng = np.random.default_rng(42)
+    noise = rng.integers(0, 256, (300, 400, 3), dtype=np.uint8)
+    yield _encode(noise)
+    gradient = np.zeros((256, 512, 3), dtype=np.uint8)
+    gradient[..., 0] = np.arange(512, dtype=np.uint16)[None, :] // 2
+    gradient[..., 1] = np.arange(256, dtype=np.uint8)[:, None]
+    yield _encode(gradient)
+    palette = rng.integers(0, 4, (700, 700, 3), dtype=np.uint8) * 60
+    yield _encode(palette)
+    yield _encode(rng.integers(0, 256, (120, 90, 4), dtype=np.uint8))
+    yield _encode(noise, "JPEG", quality=80)
+    yield _encode(noise[..., 0])
+
+
+class SimpleFeaturesRegressionTests(SimpleTestCase):
+    def test_unique_color_count_matches_np_unique(self):
+        rng = np.random.default_rng(7)
+        for shape in ((10, 10, 3), (600, 500, 3)):
+            arr = rng.integers(0, 256, shape, dtype=np.uint8)
+            expected = len(np.unique(arr.reshape(-1, 3), axis=0))
+            self.assertEqual(count_unique_colors(arr), expected)
+        print("[Analysis] Conteo de colores por claves de 24 bits -> OK")
+
+    def test_features_identical_to_legacy_implementation(self):
+        for data in _corpus():
+            legacy = _legacy_features(Image.open(io.BytesIO(data)).convert("RGBA"))
+            self.assertEqual(PixelCheckInference._compute_simple_features(ImagePayload(data)), legacy)
+        print("[Analysis] Features heurísticas sin regresión -> OK")
+
+    def test_rgba_rgb_image_is_view_over_pixels(self):
+        data = _encode(np.random.default_rng(3).integers(0, 256, (300, 260, 4), dtype=np.uint8))
+        payload = ImagePayload(data)
+        rgb_image = payload.rgb_image
+        self.assertEqual(rgb_image.mode, "RGBX")
+        # Mapeadas sobre el buffer de `pixels` (solo lectura), sin copias propias
+        self.assertTrue(rgb_image.readonly and payload.image.readonly)
+        np.testing.assert_array_equal(np.asarray(rgb_image)[..., :3], payload.rgb)
+
+        transform = build_transform()
+        legacy = transform(Image.open(io.BytesIO(data)).convert("RGB"))
+        self.assertTrue(transform(rgb_image).equal(legacy))
+        print("[Analysis] RGBA: rgb_image como vista de pixels, mismo tensor de entrada -> OK")
+
+    @override_settings(PIXELCHECK_FEATURE_MAX_SIDE=1024)
+    def test_large_images_are_decoded_bounded(self):
+        jpeg = photo_bytes(3000, 2000, quality=90)
+        payload = ImagePayload(jpeg)
+        self.assertLessEqual(max(payload.image.size), 1024)
+        self.assertEqual(payload.original_size, (3000, 2000))
+        png = ImagePayload(photo_bytes(2100, 700, fmt="PNG", seed=1))
+        self.assertEqual(png.image.size, (700, 234))
+
+        # Tolerancia documentada frente a la decodificación a resolución nativa
+        full = PixelCheckInference._compute_simple_features(ImagePayload(jpeg, max_side=0))
+        bounded = PixelCheckInference._compute_simple_features(payload)
+        for key, value in full.items():
+            self.assertAlmostEqual(bounded[key], value, delta=0.05, msg=key)
+        print("[Analysis] Decodificación acotada (draft/reduce) dentro de tolerancia -> OK")
@@ -0,0 +1,93 @@
+import tempfile
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from analysis.ml.batching import InferenceBusyError
+from analysis.ml.client import InferenceClient
+from analysis.ml.inference import PixelCheckInference
+from analysis.ml.server import InferenceServer
+from tests.helpers import image_bytes, write_tiny_model
+
+
+class _GatedInference:
+    """Bloquea el forward hasta que el test abre la compuerta."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.metadata = inner.metadata
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def predict_many(self, images):
+        self.started.set()
+        self.gate.wait(timeout=10)
+        return self.inner.predict_many(images)
+
+
+class InferenceServerTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(PIXELCHECK_MODEL_PATH=str(write_tiny_model(tmp.name)))
+        override.enable()
+        self.addCleanup(override.disable)
+        self.inference = PixelCheckInference()
+        self.images = [image_bytes(color, size=(32, 24)) for color in ("red", "green", "blue")]
+
+    def _start(self, inference, **kwargs) -> tuple[InferenceServer, InferenceClient]:
+        server = InferenceServer(inference, ("127.0.0.1", 0), **kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(server.shutdown)
+        host, port = server.address
+        return server, InferenceClient(url=f"http://{host}:{port}", timeout=10)
+
+    def test_client_matches_inline_inference(self):
+        _, client = self._start(self.inference)
+        remote = client.predict_many(self.images)
+        local = self.inference.predict_many(self.images)
+        self.assertEqual([r[0] for r in remote], [l[0] for l in local])
+        for (_, conf_r, details_r), (_, conf_l, details_l) in zip(remote, local):
+            self.assertAlmostEqual(conf_r, conf_l, places=5)
+            self.assertEqual(details_r["features"], details_l["features"])
+        self.assertEqual(client.metadata, self.inference.metadata)
+
+        metrics = client._request("GET", "/metrics")
+        self.assertEqual(metrics["images"], len(self.images))
+        self.assertEqual(metrics["queueDepth"], 0)
+        print("[Analysis] Servidor de inferencia == inferencia inline -> OK")
+
+    def test_full_queue_returns_busy(self):
+        gated = _GatedInference(self.inference)
+        server, client = self._start(gated, queue_size=1, window_ms=0)
+        url = client.url.geturl()
+        result = {}
+
+        def call(key, image):
+            result[key] = InferenceClient(url=url, timeout=10).predict(image)
+
+        # El primer batch bloquea al worker y la segunda petición ocupa el único lugar de la cola
+        first = threading.Thread(target=call, args=("first", self.images[0]))
+        first.start()
+        self.assertTrue(gated.started.wait(timeout=10))
+        second = threading.Thread(target=call, args=("second", self.images[1]))
+        second.start()
+        for _ in range(500):
+            if server.engine.queue_depth == 1:
+                break
+            time.sleep(0.01)
+        self.assertEqual(server.engine.queue_depth, 1)
+
+        with self.assertRaises(InferenceBusyError):
+            client.predict(self.images[2])
+        gated.gate.set()
+        first.join(timeout=10)
+        second.join(timeout=10)
+
+        self.assertIn(result["first"][0], ("AI", "REAL"))
+        self.assertIn(result["second"][0], ("AI", "REAL"))
+        self.assertGreaterEqual(client._request("GET", "/metrics")["rejected"], 1)
+        print("[Analysis] Cola llena responde 503 (InferenceBusyError) -> OK")
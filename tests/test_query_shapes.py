@@ -0,0 +1,140 @@
+import re
+from contextlib import contextmanager
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.application.use_cases import AnalyzeImageUseCase
+from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from analysis.models import AnalysisResult
+from iam.models import User
+from ingestion.infrastructure.thumbnails import store_thumbnail
+from ingestion.models import Image, ImageData, ImageThumbnail
+from results.infrastructure.repositories import DjangoReportRepository
+from results.models import Report
+from tests.helpers import noise_image_bytes
+
+BLOB_COLUMNS = {
+    "ingestion_imagedata": "image",
+    "ingestion_imagethumbnail": "thumbnail",
+    "results_report": "report",
+}
+_SELECT_RE = re.compile(r"^SELECT (.*?) FROM ", re.S)
+
+
+@contextmanager
+def _capture():
+    with CaptureQueriesContext(connection) as queries:
+        yield queries
+
+
+def _blob_reads(queries) -> list[str]:
+    """Binarios (columnas `content`) que aparecen en el SELECT de cada consulta, en orden."""
+    reads = []
+    for query in queries.captured_queries:
+        match = _SELECT_RE.match(query["sql"])
+        if match:
+            reads.extend(name for table, name in BLOB_COLUMNS.items() if f'"{table}"."content"' in match.group(1))
+    return reads
+
+
+@override_settings(RESULT_CACHE_ENABLED=False, IMAGE_STORAGE="database", REPORT_STORAGE="database")
+class QueryShapeTests(APITestCase):
+    """Cada endpoint trae solo los binarios que sirve: el resto de las consultas son de metadatos."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="auditor", password="demo12345")
+        self.client.force_authenticate(self.user)
+        self.data = noise_image_bytes(size=(256, 256))
+        self.image = Image.objects.create(
+            uploader=self.user,
+            filename="audit.png",
+            mime_type="image/png",
+            size_bytes=len(self.data),
+            width=256,
+            height=256,
+            checksum="audit",
+        )
+        ImageData.objects.create(image=self.image, content=self.data)
+        self.image_id = str(self.image.image_id)
+
+    def _analyzed(self):
+        AnalysisResult.objects.create(
+            image=self.image,
+            owner=self.user,
+            label=AnalysisResult.Label.AI,
+            confidence=Decimal("0.9000"),
+            model_version="v1",
+        )
+        Image.objects.filter(image_id=self.image_id).update(status=Image.Status.DONE)
+
+    def test_analysis_reads_image_blob_once_outside_join(self):
+        with mock.patch("analysis.application.use_cases.PixelCheckInference") as inference_cls:
+            inference = inference_cls.instance.return_value
+            inference.predict.return_value, inference.metadata = ("AI", 0.9, {"conclusion": "IA"}), {}
+            use_case = AnalyzeImageUseCase(DjangoAnalysisResultRepository())
+            with _capture() as queries:
+                use_case.execute(image_id=self.image_id)
+
+        self.assertEqual(_blob_reads(queries), ["image"])
+        blob_query = next(q["sql"] for q in queries.captured_queries if '"ingestion_imagedata"."content"' in q["sql"])
+        self.assertNotIn('"ingestion_image"."filename"', blob_query)
+        print(f"[Analysis] Worker: {len(queries)} consultas, binario leído una vez ({len(self.data)} bytes) -> OK")
+
+    def test_result_detail_reads_no_blobs(self):
+        self._analyzed()
+        with self.assertNumQueries(2), _capture() as queries:
+            response = self.client.get(reverse("result-detail", args=[self.image_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(_blob_reads(queries), [])
+        result_query = next(q["sql"] for q in queries.captured_queries if '"analysis_analysisresult"' in q["sql"])
+        self.assertNotIn("JOIN", result_query)
+        print("[Results] Detalle: 2 consultas, 0 bytes de binarios -> OK")
+
+    def test_export_reads_no_blobs(self):
+        self._analyzed()
+        with self.assertNumQueries(1), _capture() as queries:
+            response = self.client.get(reverse("results-export"))
+            b"".join(response.streaming_content)
+        self.assertEqual(_blob_reads(queries), [])
+        print("[Results] Export CSV: 1 consulta, 0 bytes de binarios -> OK")
+
+    def test_thumbnail_preview_reads_only_thumbnail(self):
+        thumbnail = store_thumbnail(self.image_id, self.data)
+        with self.assertNumQueries(4), _capture() as queries:
+            response = self.client.get(reverse("image-thumbnail", args=[self.image_id]))
+            body = b"".join(response.streaming_content)
+        self.assertEqual(_blob_reads(queries), ["thumbnail"])
+        self.assertEqual(len(body), thumbnail.size_bytes)
+
+        url = reverse("image-thumbnail", args=[self.image_id])
+        # Los roles del usuario ya quedaron cacheados por la primera request
+        with self.assertNumQueries(2), _capture() as queries:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(_blob_reads(queries), [])
+        self.assertEqual(ImageThumbnail.objects.count(), 1)
+        print(f"[Ingestion] Preview: 4 consultas y {thumbnail.size_bytes} bytes (304: 0 bytes) -> OK")
+
+    def test_report_download_reads_report_blob_once(self):
+        report = Report.objects.create(owner=self.user, status=Report.Status.GENERATING, format=Report.Format.PDF)
+        DjangoReportRepository().update_report(
+            report_id=str(report.report_id),
+            status=Report.Status.READY,
+            filename="audit.pdf",
+            content=b"%PDF-audit",
+            content_mime="application/pdf",
+            completed_at=timezone.now(),
+        )
+        with self.assertNumQueries(3), _capture() as queries:
+            response = self.client.get(reverse("download-report", args=[report.report_id]))
+            b"".join(response.streaming_content)
+        self.assertEqual(_blob_reads(queries), ["report"])
+        print("[Results] Descarga de reporte: 3 consultas, binario leído una vez -> OK")
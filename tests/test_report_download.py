@@ -0,0 +1,82 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.http import FileResponse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from iam.models import User
+from results.infrastructure.repositories import DjangoReportRepository
+from results.models import Report
+
+CONTENT = os.urandom(200 * 1024)
+
+
+class ReportDownloadTests(APITestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(BLOB_STORAGE_ROOT=tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user(username="downloader", password="demo12345")
+        self.client.force_authenticate(self.user)
+
+    def _ready_report(self, storage: str) -> str:
+        report = Report.objects.create(owner=self.user, status=Report.Status.GENERATING, format=Report.Format.PDF)
+        with override_settings(REPORT_STORAGE=storage):
+            DjangoReportRepository().update_report(
+                report_id=str(report.report_id),
+                status=Report.Status.READY,
+                filename="batch.pdf",
+                content=CONTENT,
+                content_mime="application/pdf",
+                completed_at=timezone.now(),
+            )
+        return reverse("download-report", args=[report.report_id])
+
+    def test_streams_from_filesystem_with_single_query(self):
+        url = self._ready_report("filesystem")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            body = b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(body, CONTENT)
+        self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn('filename="batch.pdf"', response["Content-Disposition"])
+        report_queries = [q["sql"] for q in queries.captured_queries if '"results_report"' in q["sql"]]
+        self.assertEqual(len(report_queries), 1)
+        self.assertNotIn('"results_report"."content"', report_queries[0])
+        print("[Results] Descarga por streaming desde filesystem con una consulta -> OK")
+
+    def test_range_requests(self):
+        for storage in ("filesystem", "database"):
+            url = self._ready_report(storage)
+            partial = self.client.get(url, HTTP_RANGE="bytes=100-199")
+            self.assertEqual(partial.status_code, status.HTTP_206_PARTIAL_CONTENT)
+            self.assertEqual(b"".join(partial.streaming_content), CONTENT[100:200])
+            self.assertEqual(partial["Content-Range"], f"bytes 100-199/{len(CONTENT)}")
+            self.assertEqual(partial["Content-Length"], "100")
+
+            suffix = self.client.get(url, HTTP_RANGE="bytes=-10")
+            self.assertEqual(b"".join(suffix.streaming_content), CONTENT[-10:])
+
+            outside = self.client.get(url, HTTP_RANGE=f"bytes={len(CONTENT)}-")
+            self.assertEqual(outside.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.assertEqual(outside["Content-Range"], f"bytes */{len(CONTENT)}")
+
+            # Reanudación con If-Range: si el ETag no coincide se envía el archivo completo
+            etag = partial["ETag"]
+            resumed = self.client.get(url, HTTP_RANGE="bytes=10-", HTTP_IF_RANGE=etag)
+            self.assertEqual(b"".join(resumed.streaming_content), CONTENT[10:])
+            stale = self.client.get(url, HTTP_RANGE="bytes=10-", HTTP_IF_RANGE='"otro"')
+            self.assertEqual(stale.status_code, status.HTTP_200_OK)
+            self.assertEqual(b"".join(stale.streaming_content), CONTENT)
+        print("[Results] Descarga con Range/If-Range (206/416) -> OK")
@@ -0,0 +1,104 @@
+import csv
+import io
+import re
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.models import AnalysisResult
+from iam.models import User
+from ingestion.models import Image, ImageData
+from results.application.use_cases import CreateBatchReportUseCase
+from results.infrastructure.repositories import DjangoReportRepository, DjangoResultsQueryRepository
+from results.models import Report
+from shared.infrastructure.storage import read_blob
+from shared.utils.reporting import build_analysis_pdf, build_csv, iter_csv
+from tests.helpers import noise_image_bytes
+
+
+def _page_count(pdf: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b(?!s)", pdf))
+
+
+class ReportEngineTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter", password="demo12345")
+        self.client.force_authenticate(self.user)
+
+    def _analyzed_images(self, owner, count: int) -> list[str]:
+        image_ids = []
+        for index in range(count):
+            image = Image.objects.create(
+                uploader=owner,
+                filename=f"img-{index}.png",
+                mime_type="image/png",
+                size_bytes=10,
+                width=640,
+                height=480,
+                checksum=f"{owner.username}-{index}",
+                status=Image.Status.DONE,
+            )
+            ImageData.objects.create(image=image, content=noise_image_bytes(size=(640, 480), seed=index))
+            AnalysisResult.objects.create(
+                image=image,
+                owner=owner,
+                label=AnalysisResult.Label.AI if index % 2 else AnalysisResult.Label.REAL,
+                confidence=Decimal("0.8000"),
+                model_version="v1",
+            )
+            image_ids.append(str(image.image_id))
+        return image_ids
+
+    def test_csv_is_written_in_chunks(self):
+        rows = [[str(index), "AI"] for index in range(1200)]
+        chunks = list(iter_csv(["id", "label"], rows, chunk_rows=500))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b"".join(chunks), build_csv(["id", "label"], rows))
+        print("[Results] CSV por partes == CSV completo -> OK")
+
+    def test_analysis_pdf_paginates_long_content(self):
+        observations = {f"obs{index}": f"Observación número {index} " * 8 for index in range(80)}
+        pdf = build_analysis_pdf(
+            title="Paginación",
+            summary={"Etiqueta": "AI"},
+            features={"noise_score": 0.5},
+            observations=observations,
+            recommendation="Recomendación " * 40,
+        )
+        self.assertGreater(_page_count(pdf), 1)
+        print("[Results] PDF de análisis pagina observaciones largas -> OK")
+
+    def test_batch_pdf_report_is_paginated_with_thumbnails(self):
+        image_ids = self._analyzed_images(self.user, 23)
+        report = Report.objects.create(
+            owner=self.user, scope=Report.Scope.BATCH, format=Report.Format.PDF, status=Report.Status.REQUESTED
+        )
+        CreateBatchReportUseCase(DjangoResultsQueryRepository(), DjangoReportRepository()).execute(
+            report_id=str(report.report_id), image_ids=image_ids
+        )
+        report.refresh_from_db()
+        self.assertEqual(report.status, Report.Status.READY)
+        self.assertEqual(report.content_mime, "application/pdf")
+        self.assertTrue(report.filename.endswith(".pdf"))
+        pdf = read_blob(report)
+        self.assertEqual(_page_count(pdf), 3)
+        # Miniaturas JPEG reducidas, no los PNG originales (~900 KB cada uno)
+        self.assertEqual(len(re.findall(rb"/Subtype /Image", pdf)), 23)
+        self.assertLess(len(pdf), 23 * 20 * 1024)
+        print("[Results] Reporte BATCH PDF paginado con miniaturas -> OK")
+
+    def test_export_streams_only_own_results(self):
+        own = self._analyzed_images(self.user, 3)
+        other = User.objects.create_user(username="other", password="demo12345")
+        self._analyzed_images(other, 2)
+
+        response = self.client.get(reverse("results-export"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment", response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8"))))
+        self.assertEqual(rows[0], ["imageId", "label", "confidence", "modelVersion", "conclusion"])
+        self.assertEqual(sorted(row[0] for row in rows[1:]), sorted(own))
+        print("[Results] Exportación CSV por streaming -> OK")
@@ -0,0 +1,129 @@
+import importlib
+import tempfile
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from analysis.application.use_cases import AnalyzeImageUseCase, request_single_report
+from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from analysis.models import AnalysisResult
+from config.celery import app
+from iam.models import User
+from ingestion.models import Image, ImageData
+from results.models import Report
+from results.tasks import generate_report_task
+from shared.infrastructure.storage import read_blob, store_blob
+from tests.helpers import image_bytes
+
+
+class ReportQueueTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="editor", password="demo12345", is_staff=True)
+        data = image_bytes("red", size=(32, 32))
+        self.image = Image.objects.create(
+            uploader=self.user,
+            filename="red.png",
+            mime_type="image/png",
+            size_bytes=len(data),
+            width=32,
+            height=32,
+            checksum="0" * 64,
+            status=Image.Status.DONE,
+        )
+        ImageData.objects.create(image=self.image, content=data)
+        AnalysisResult.objects.create(
+            image=self.image,
+            owner=self.user,
+            label=AnalysisResult.Label.REAL,
+            confidence=Decimal("0.1200"),
+            model_version="v1",
+            threshold=Decimal("0.5"),
+            details={"conclusion": "REAL"},
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_report_tasks_are_routed_to_reports_queue(self):
+        self.assertEqual(app.amqp.router.route({}, generate_report_task.name)["queue"].name, "reports")
+        self.assertNotEqual(app.amqp.router.route({}, "analysis.run_analysis")["queue"].name, "reports")
+        print("[Results] Tareas de reporte en cola 'reports' -> OK")
+
+    def test_redelivered_analysis_of_resolved_image_is_a_noop(self):
+        rejected = Image.objects.create(
+            uploader=self.user,
+            filename="broken.png",
+            mime_type="image/png",
+            size_bytes=1,
+            width=1,
+            height=1,
+            checksum="1" * 64,
+            status=Image.Status.REJECTED,
+        )
+        with mock.patch("analysis.application.use_cases.PixelCheckInference") as inference_cls:
+            with mock.patch("analysis.application.use_cases.generate_report_task") as task:
+                use_case = AnalyzeImageUseCase(DjangoAnalysisResultRepository())
+                done = use_case.execute(image_id=str(self.image.image_id))
+                again = use_case.execute(image_id=str(rejected.image_id))
+        inference_cls.instance.return_value.predict.assert_not_called()
+        task.delay.assert_not_called()
+        self.assertTrue(done.success)
+        self.assertEqual(done.data.label, AnalysisResult.Label.REAL)
+        self.assertFalse(again.success)
+        self.assertFalse(Report.objects.exists())
+        print("[Analysis] Tarea reentregada sobre imagen DONE/REJECTED no re-analiza -> OK")
+
+    def test_report_stays_generating_until_task_runs(self):
+        image_id = str(self.image.image_id)
+        with mock.patch("analysis.application.use_cases.generate_report_task") as task:
+            request_single_report(self.user, image_id)
+        report = Report.objects.get(owner=self.user)
+        task.delay.assert_called_once_with(str(report.report_id), image_id)
+        self.assertEqual(report.status, Report.Status.GENERATING)
+        self.assertEqual(report.image_id, self.image.image_id)
+
+        response = self.client.get(reverse("result-detail", args=[image_id]))
+        self.assertEqual(response.data["reportStatus"], Report.Status.GENERATING)
+
+        generate_report_task(*task.delay.call_args.args)
+        report.refresh_from_db()
+        self.assertEqual(report.status, Report.Status.READY)
+        self.assertIsNotNone(report.completed_at)
+        self.assertTrue(read_blob(report).startswith(b"%PDF"))
+        response = self.client.get(reverse("result-detail", args=[image_id]))
+        self.assertEqual(response.data["reportStatus"], Report.Status.READY)
+        print("[Results] Reporte GENERATING -> READY en la cola de reportes -> OK")
+
+    def test_result_lookup_uses_image_column_and_backfill(self):
+        legacy = Report.objects.create(
+            owner=self.user,
+            status=Report.Status.READY,
+            filename=f"pixelcheck-{self.image.image_id}-20250101120000.pdf",
+        )
+        batch = Report.objects.create(
+            owner=self.user, status=Report.Status.READY, scope=Report.Scope.BATCH, format=Report.Format.CSV
+        )
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        with override_settings(BLOB_STORAGE_ROOT=tmp.name):
+            csv_content = f"imageId,label\n{self.image.image_id},AI\n".encode()
+            store_blob(batch, BytesIO(csv_content), backend="filesystem")
+            batch.save()
+            migration = importlib.import_module("results.migrations.0005_backfill_report_image")
+            migration.backfill_report_image(apps, None)
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.image_id, self.image.image_id)
+        self.assertEqual(list(batch.images.values_list("image_id", flat=True)), [self.image.image_id])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("result-detail", args=[self.image.image_id]))
+        self.assertEqual(response.data["reportId"], str(legacy.report_id))
+        report_queries = [q["sql"] for q in queries.captured_queries if "results_report" in q["sql"]]
+        self.assertEqual(len(report_queries), 1)
+        self.assertNotIn("LIKE", report_queries[0])
+        print("[Results] Reporte por imagen vía columna indexada + backfill -> OK")
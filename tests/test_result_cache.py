@@ -0,0 +1,113 @@
+import importlib
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.infrastructure.repositories import DjangoAnalysisResultRepository
+from analysis.models import AnalysisResult, ModelVersion
+from iam.models import User
+from ingestion.models import Image
+
+
+class ResultCacheTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="demo12345")
+        self.client.force_authenticate(self.owner)
+        self.image = Image.objects.create(
+            uploader=self.owner,
+            filename="hot.png",
+            mime_type="image/png",
+            size_bytes=10,
+            width=1,
+            height=1,
+            checksum="abc123",
+            status=Image.Status.DONE,
+        )
+        DjangoAnalysisResultRepository().save_result(
+            image=self.image,
+            owner=self.owner,
+            label=AnalysisResult.Label.AI,
+            confidence=Decimal("0.9000"),
+            model_version="v1",
+            details={"metadata": {"arch": "tiny"}},
+        )
+        self.url = reverse("result-detail", args=[self.image.image_id])
+
+    def test_hot_result_served_without_result_query(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["label"], "AI")
+        self.assertFalse([q for q in queries.captured_queries if "analysis_analysisresult" in q["sql"]])
+
+        other = User.objects.create_user(username="other", password="demo12345")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        print("[Results] Resultado caliente servido desde cache (con filtro de owner) -> OK")
+
+    def test_save_result_invalidates_cache(self):
+        self.client.get(self.url)
+        DjangoAnalysisResultRepository().save_result(
+            image=self.image,
+            owner=self.owner,
+            label=AnalysisResult.Label.REAL,
+            confidence=Decimal("0.1000"),
+            model_version="v2",
+            details={},
+        )
+        response = self.client.get(self.url)
+        self.assertEqual((response.data["label"], response.data["modelVersion"]), ("REAL", "v2"))
+        print("[Results] save_result invalida el cache del resultado -> OK")
+
+
+class ModelVersionExpandTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="expander", password="demo12345")
+        self.client.force_authenticate(self.owner)
+        self.image = Image.objects.create(
+            uploader=self.owner,
+            filename="expand.png",
+            mime_type="image/png",
+            size_bytes=10,
+            width=1,
+            height=1,
+            checksum="abc123",
+            status=Image.Status.DONE,
+        )
+        repository = DjangoAnalysisResultRepository()
+        repository.register_model_version("v9", {"arch": "tiny", "ai_class_index": 0})
+        repository.save_result(
+            image=self.image,
+            owner=self.owner,
+            label=AnalysisResult.Label.AI,
+            confidence=Decimal("0.9000"),
+            model_version="v9",
+            details={"prob_ai": 0.9},
+        )
+        self.url = reverse("result-detail", args=[self.image.image_id])
+
+    def test_model_metadata_only_on_expand(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn("model", plain.data)
+        self.assertNotIn("metadata", plain.data["details"])
+
+        expanded = self.client.get(self.url, {"expand": "model"})
+        self.assertEqual(expanded.data["model"], {"version": "v9", "metadata": {"arch": "tiny", "ai_class_index": 0}})
+        self.assertNotEqual(expanded["ETag"], plain["ETag"])
+        self.assertEqual(self.client.get(self.url, {"expand": "owner"}).status_code, status.HTTP_400_BAD_REQUEST)
+        print("[Results] Metadata del modelo vía ModelVersion con ?expand=model -> OK")
+
+    def test_migration_moves_embedded_metadata(self):
+        AnalysisResult.objects.filter(image=self.image).update(
+            model_version="legacy", details={"prob_ai": 0.9, "metadata": {"arch": "legacy"}}
+        )
+        migration = importlib.import_module("analysis.migrations.0006_move_model_metadata")
+        migration.move_metadata_to_model_version(apps, None)
+        self.assertEqual(AnalysisResult.objects.get(image=self.image).details, {"prob_ai": 0.9})
+        self.assertEqual(ModelVersion.objects.get(version="legacy").metadata, {"arch": "legacy"})
+        print("[Analysis] Migración mueve metadata de details a ModelVersion -> OK")
@@ -0,0 +1,79 @@
+import threading
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from analysis.models import AnalysisResult
+from iam.models import User
+from ingestion.models import Image
+from shared.infrastructure.notifications import LocalNotifier, publish_image_status
+
+
+class ResultWaitTests(APITransactionTestCase):
+    def setUp(self):
+        self.notifier = LocalNotifier()
+        patcher = mock.patch("shared.infrastructure.notifications._notifier", self.notifier)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(username="waiter", password="demo12345")
+        self.client.force_authenticate(self.user)
+        self.image = Image.objects.create(
+            uploader=self.user,
+            filename="pending.png",
+            mime_type="image/png",
+            size_bytes=10,
+            width=1,
+            height=1,
+            checksum="abc123",
+            status=Image.Status.QUEUED,
+        )
+        self.url = reverse("result-wait", args=[self.image.image_id])
+
+    def test_wait_times_out_with_current_status(self):
+        started = time.monotonic()
+        response = self.client.get(self.url, {"timeout": 0.2})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], Image.Status.QUEUED)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        print("[Results] Long-poll sin resultado -> 202 al vencer el timeout -> OK")
+
+    def test_wait_returns_when_analysis_publishes(self):
+        def finish_analysis():
+            time.sleep(0.2)
+            AnalysisResult.objects.create(
+                image=self.image,
+                owner=self.user,
+                label=AnalysisResult.Label.REAL,
+                confidence=Decimal("0.2000"),
+                model_version="v1",
+            )
+            Image.objects.filter(pk=self.image.pk).update(status=Image.Status.DONE)
+            publish_image_status(str(self.image.image_id), Image.Status.DONE)
+
+        worker = threading.Thread(target=finish_analysis)
+        started = time.monotonic()
+        worker.start()
+        response = self.client.get(self.url, {"timeout": 10})
+        worker.join()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["label"], "REAL")
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(self.notifier._subscribers, {})
+        print("[Results] Long-poll despierta con el aviso del worker -> OK")
+
+    def test_local_notifier_keeps_no_messages_without_subscribers(self):
+        channel = f"pixelcheck:image:{self.image.image_id}"
+        for _ in range(3):
+            publish_image_status(str(self.image.image_id), Image.Status.QUEUED)
+        self.assertEqual(self.notifier._subscribers, {})
+
+        with self.notifier.subscribe(channel) as subscription:
+            self.assertIsNone(subscription.wait(0.01))
+            publish_image_status(str(self.image.image_id), Image.Status.DONE)
+            self.assertEqual(subscription.wait(1)["status"], Image.Status.DONE)
+        self.assertEqual(self.notifier._subscribers, {})
+        print("[Results] Notificador local no acumula mensajes por canal -> OK")
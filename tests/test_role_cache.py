@@ -0,0 +1,56 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.models import AnalysisResult
+from iam.models import Role, User
+from ingestion.models import Image
+
+
+class RoleCacheTests(APITestCase):
+    def setUp(self):
+        self.professional = Role.objects.create(name=Role.RoleName.PROFESSIONAL)
+        self.user = User.objects.create_user(username="analyst", password="demo12345")
+        self.user.roles.add(self.professional)
+        self.image = Image.objects.create(
+            uploader=self.user,
+            filename="test.png",
+            mime_type="image/png",
+            size_bytes=10,
+            width=1,
+            height=1,
+            checksum="abc123",
+            status=Image.Status.DONE,
+        )
+        AnalysisResult.objects.create(
+            image=self.image, owner=self.user, label=AnalysisResult.Label.REAL, confidence=0.85, model_version="v1"
+        )
+
+    def test_jwt_roles_claim_avoids_role_queries(self):
+        signin = self.client.post(reverse("sign-in"), {"username": "analyst", "password": "demo12345"})
+        self.assertEqual(signin.data["user"]["roles"], [Role.RoleName.PROFESSIONAL])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {signin.data['access']}")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("result-detail", args=[self.image.image_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("reportStatus", response.data)
+        self.assertFalse([q["sql"] for q in queries.captured_queries if "iam_role" in q["sql"]])
+        print("[Auth] Roles desde el claim JWT, sin consultas de roles -> OK")
+
+    def test_role_cache_is_per_instance_and_invalidated(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.has_role(Role.RoleName.PROFESSIONAL))
+            self.assertFalse(user.has_role(Role.RoleName.USER))
+
+        user.roles.remove(self.professional)
+        with self.assertNumQueries(1):
+            self.assertFalse(user.has_role(Role.RoleName.PROFESSIONAL))
+
+        prefetched = User.objects.prefetch_related("roles").get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(prefetched.has_role(Role.RoleName.PROFESSIONAL))
+        print("[Auth] Cache de roles por instancia + invalidación m2m -> OK")
@@ -0,0 +1,69 @@
+import hashlib
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from iam.models import User
+from ingestion.infrastructure.upload_handlers import HashingUploadHandler
+from ingestion.models import Image, ImageData
+from tests.helpers import noise_image_bytes
+
+
+def _feed(handler: HashingUploadHandler, data: bytes, chunk_size: int = 1024):
+    handler.new_file("field", "sample.png", "image/png", len(data))
+    for start in range(0, len(data), chunk_size):
+        handler.receive_data_chunk(data[start : start + chunk_size], start)
+    return handler.file_complete(len(data))
+
+
+class HashingUploadHandlerTests(SimpleTestCase):
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=4096)
+    def test_hashes_incrementally_and_spools_to_disk(self):
+        data = noise_image_bytes(size=(96, 96))
+        uploaded = _feed(HashingUploadHandler(), data)
+        self.assertEqual(uploaded.checksum, hashlib.sha256(data).hexdigest())
+        self.assertEqual(uploaded.size, len(data))
+        self.assertTrue(uploaded.file._rolled)
+        self.assertEqual(uploaded.read(), data)
+        print("[Ingestion] Upload por chunks con sha256 incremental -> OK")
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=2048)
+    def test_stops_buffering_past_the_limit(self):
+        data = noise_image_bytes(size=(96, 96))
+        uploaded = _feed(HashingUploadHandler(), data)
+        self.assertEqual(uploaded.size, len(data))
+        self.assertLessEqual(len(uploaded.read()), 2048)
+        print("[Ingestion] Upload excedido no se sigue bufferizando -> OK")
+
+
+@mock.patch("ingestion.application.use_cases.run_analysis_task")
+class StreamingUploadEndpointTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="streamer", password="demo12345")
+        self.client.force_authenticate(self.user)
+
+    def _upload(self, data: bytes):
+        file = SimpleUploadedFile("sample.png", data, content_type="image/png")
+        return self.client.post(reverse("upload-image"), {"image": file}, format="multipart")
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_spooled_upload_is_stored_with_streamed_checksum(self, mock_task):
+        data = noise_image_bytes(size=(96, 96))
+        response = self._upload(data)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        image = Image.objects.get(image_id=response.data["imageId"])
+        self.assertEqual(image.checksum, hashlib.sha256(data).hexdigest())
+        self.assertEqual(bytes(ImageData.objects.get(image=image).content), data)
+        print("[Ingestion] Upload volcado a disco se persiste completo -> OK")
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_oversized_upload_is_rejected(self, mock_task):
+        response = self._upload(noise_image_bytes(size=(96, 96)))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Image.objects.exists())
+        mock_task.delay.assert_not_called()
+        print("[Ingestion] Upload que excede el límite -> 400")
@@ -0,0 +1,110 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analysis.application.dedup import MISSES, STATS_CACHE_ALIAS, AnalysisDeduplicator, _incr
+from analysis.ml.backends import effective_model_version
+from analysis.models import AnalysisResult
+from iam.models import User
+from ingestion.models import Image
+from shared.utils.image import ImagePayload
+from tests.helpers import noise_image_bytes
+
+# Store de contadores en memoria en lugar del Redis de PIXELCHECK_DEDUP_STATS_URL
+STATS_CACHES = {
+    **settings.CACHES,
+    STATS_CACHE_ALIAS: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "dedup-stats-tests"},
+}
+
+
+@mock.patch("ingestion.application.use_cases.run_analysis_task")
+class UploadDedupTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.data = noise_image_bytes(seed=3)
+        self.first_owner = User.objects.create_user(username="first", password="demo12345")
+        self.user = User.objects.create_user(username="second", password="demo12345")
+        image = Image.objects.create(
+            uploader=self.first_owner,
+            filename="viral.png",
+            mime_type="image/png",
+            size_bytes=len(self.data),
+            width=64,
+            height=64,
+            checksum=ImagePayload(self.data).checksum,
+            status=Image.Status.DONE,
+        )
+        AnalysisResult.objects.create(
+            image=image,
+            owner=self.first_owner,
+            label=AnalysisResult.Label.AI,
+            confidence=Decimal("0.9100"),
+            model_version="v1",
+            threshold=Decimal("0.5"),
+            details={"prob_ai": 0.91},
+        )
+        self.client.force_authenticate(self.user)
+
+    def _upload(self, data: bytes):
+        file = SimpleUploadedFile("viral.png", data, content_type="image/png")
+        return self.client.post(reverse("upload-image"), {"image": file}, format="multipart")
+
+    @override_settings(CACHES=STATS_CACHES)
+    def test_repeated_upload_reuses_result(self, mock_task):
+        caches[STATS_CACHE_ALIAS].clear()
+        response = self._upload(self.data)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], Image.Status.DONE)
+        mock_task.delay.assert_not_called()
+
+        cloned = AnalysisResult.objects.get(image_id=response.data["imageId"])
+        self.assertEqual(cloned.owner, self.user)
+        self.assertEqual(cloned.label, AnalysisResult.Label.AI)
+        self.assertEqual(cloned.details, {"prob_ai": 0.91})
+
+        health = self.client.get(reverse("model-health"))
+        self.assertEqual(health.data["dedup"], {"hits": 1, "misses": 0})
+        print("[Ingestion] Dedup por checksum reutiliza resultado -> OK")
+
+    @override_settings(CACHES=STATS_CACHES)
+    def test_new_image_is_enqueued(self, mock_task):
+        caches[STATS_CACHE_ALIAS].clear()
+        response = self._upload(noise_image_bytes(seed=4))
+        self.assertEqual(response.data["status"], Image.Status.QUEUED)
+        mock_task.delay.assert_called_once()
+        self.assertEqual(AnalysisDeduplicator.stats(), {"hits": 0, "misses": 1})
+        print("[Ingestion] Imagen nueva se encola -> OK")
+
+    def test_counters_are_off_without_stats_store(self, mock_task):
+        # Sin PIXELCHECK_DEDUP_STATS_URL el upload no escribe contadores en ningún lado
+        with self.assertNumQueries(0):
+            _incr(MISSES)
+        response = self._upload(self.data)
+        self.assertEqual(response.data["status"], Image.Status.DONE)
+        self.assertIsNone(AnalysisDeduplicator.stats())
+        health = self.client.get(reverse("model-health"))
+        self.assertIsNone(health.data["dedup"])
+        print("[Ingestion] Contadores de dedup apagados sin store -> OK")
+
+    @override_settings(PIXELCHECK_INFERENCE_BACKEND="onnx-int8")
+    def test_other_backend_does_not_reuse_result(self, mock_task):
+        self.assertEqual(effective_model_version(), "v1+onnx-int8")
+        response = self._upload(self.data)
+        self.assertEqual(response.data["status"], Image.Status.QUEUED)
+        mock_task.delay.assert_called_once()
+        self.assertEqual(self.client.get(reverse("model-health")).data["modelVersion"], "v1+onnx-int8")
+        print("[Ingestion] Dedup separa resultados por backend de inferencia -> OK")
+
+    def test_failed_clone_leaves_no_done_image(self, mock_task):
+        with mock.patch.object(AnalysisDeduplicator, "clone", side_effect=RuntimeError("clone")):
+            with self.assertRaises(RuntimeError):
+                self._upload(self.data)
+        self.assertFalse(Image.objects.filter(uploader=self.user).exists())
+        print("[Ingestion] Dedup: imagen y resultado clonado en una transacción -> OK")
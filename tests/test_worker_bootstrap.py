@@ -0,0 +1,58 @@
+import gc
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from analysis.ml import bootstrap
+from analysis.ml.inference import PixelCheckInference
+from tests.helpers import write_tiny_model
+
+
+def _worker(queues, pool="prefork"):
+    app = SimpleNamespace(
+        conf=SimpleNamespace(task_default_queue="celery"),
+        amqp=SimpleNamespace(queues=SimpleNamespace(consume_from={name: None for name in queues})),
+    )
+    return SimpleNamespace(app=app, pool_cls=pool)
+
+
+class WorkerBootstrapTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.ready_file = Path(tmp.name) / "ready"
+        override = override_settings(
+            PIXELCHECK_MODEL_PATH=str(write_tiny_model(tmp.name)),
+            PIXELCHECK_READY_FILE=str(self.ready_file),
+            PIXELCHECK_PRELOAD_MODEL=True,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        for patcher in (
+            mock.patch.object(PixelCheckInference, "_instance", None),
+            mock.patch.object(bootstrap, "_warm_up_children", False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(gc.unfreeze)
+
+    def test_prefork_preloads_in_parent_and_warms_children(self):
+        bootstrap.on_worker_init(_worker(["celery"]))
+        self.assertIsNotNone(PixelCheckInference._instance)
+        self.assertFalse(self.ready_file.exists())
+
+        bootstrap.on_worker_process_init()
+        self.assertTrue(self.ready_file.exists())
+        bootstrap.clear_ready()
+        self.assertFalse(self.ready_file.exists())
+        print("[Analysis] Modelo precargado en el padre y calentado en el hijo -> OK")
+
+    def test_reports_worker_skips_model(self):
+        bootstrap.on_worker_init(_worker(["reports"]))
+        bootstrap.on_worker_process_init()
+        self.assertIsNone(PixelCheckInference._instance)
+        self.assertFalse(self.ready_file.exists())
+        print("[Analysis] Worker de reportes no carga el modelo -> OK")